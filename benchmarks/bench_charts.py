@@ -0,0 +1,100 @@
+# benchmarks/bench_charts.py
+# Usage: python -m benchmarks.bench_charts [--charts N] [--backend matplotlib|svg]
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+
+def render_charts(backend_name: str, charts: int, directory: str) -> Dict[str, float]:
+    # Import cost is part of what the backend costs a short-lived CLI run, so it is measured too
+    started = time.perf_counter()
+    from utils import chart_utils
+    chart_utils.set_backend(backend_name)
+    backend = chart_utils.get_backend()
+    imported = time.perf_counter()
+
+    rng = random.Random(0)
+    bars = [(f"repo-{i}", rng.randint(0, 500)) for i in range(10)]
+    languages = ['Python', 'JavaScript', 'Go', 'Rust', 'Shell']
+    shares = [rng.randint(1, 20) for _ in languages]
+    sizes = [rng.randint(0, 50000) for _ in range(200)]
+
+    def render(i: int) -> None:
+        kind = i % 3
+        path = os.path.join(directory, f"chart{i}{backend.FILE_EXTENSION}")
+        if kind == 0:
+            chart_utils.create_bar_chart(bars, "Top Starred Repositories", "Repository", "Stars", path)
+        elif kind == 1:
+            chart_utils.create_pie_chart(languages, shares, "Repository Language Breakdown", path)
+        else:
+            chart_utils.create_histogram(sizes, 20, "Distribution of Repository Sizes", "Size (KB)",
+                                         "Number of Repositories", path)
+
+    render_started = time.perf_counter()
+    for i in range(charts):
+        render(i)
+    elapsed = time.perf_counter() - render_started
+
+    # Tracing slows rendering down a lot, so peak memory is taken from a separate pass over each chart type
+    tracemalloc.start()
+    for i in range(3):
+        render(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'backend': backend_name,
+        'import_seconds': imported - started,
+        'charts_per_second': charts / elapsed,
+        'traced_peak': peak,
+        # ru_maxrss is reported in kilobytes on Linux
+        'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+
+
+def run(charts: int, backends: List[str]) -> List[Dict[str, float]]:
+    # Each backend runs in a fresh interpreter so import cost and RSS aren't shared between them
+    results = []
+    for backend_name in backends:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_charts', '--backend', backend_name,
+             '--charts', str(charts), '--json'],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare chart rendering throughput and memory per backend")
+    parser.add_argument('--charts', type=int, default=60, help="Charts to render per backend")
+    parser.add_argument('--backend', default=None, help="Benchmark only this backend in the current process")
+    parser.add_argument('--json', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        with tempfile.TemporaryDirectory() as directory:
+            result = render_charts(args.backend, args.charts, directory)
+        if args.json:
+            print(json.dumps(result))
+            return
+        results = [result]
+    else:
+        results = run(args.charts, ['matplotlib', 'svg'])
+
+    print(f"{'Backend':<12}{'Import s':>10}{'Charts/s':>10}{'Traced peak MB':>16}{'Max RSS MB':>12}")
+    for row in results:
+        print(f"{row['backend']:<12}{row['import_seconds']:>10.3f}{row['charts_per_second']:>10.1f}"
+              f"{row['traced_peak'] / 2**20:>16.2f}{row['max_rss'] / 2**20:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
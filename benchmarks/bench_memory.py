@@ -0,0 +1,174 @@
+# benchmarks/bench_memory.py
+# Usage: python -m benchmarks.bench_memory [--update]
+# Regression check: python -m pytest benchmarks
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import tempfile
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from benchmarks.synthetic import commit_pages, pull_request_pages, repo_pages
+from controllers.commit_controller import CommitController
+from controllers.pr_controller import PRController
+from controllers.repo_controller import RepoController
+from models.commit import Commit
+from models.pull_request import PullRequest
+from models.repo import Repo
+from multidict import CIMultiDict, CIMultiDictProxy
+from services.github_service import ApiResponse, GitHubService
+from services.projections import FIELD_PROJECTIONS, project
+from utils import chart_utils
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'memory.json')
+SIZES = (1000, 5000)  # Items per stage
+TOLERANCE = 0.10  # Relative growth over the baseline that fails the check
+SLACK_BYTES = 64 * 1024  # Absolute growth always tolerated, so tiny stages don't fail on noise
+SLACK_BLOCKS = 64
+METRICS = ('peak_bytes', 'retained_bytes', 'retained_blocks')
+
+
+class PagedGitHubService(GitHubService):
+    # Serves pre-encoded pages instead of the network; decoding stays inside the measured stage
+    def __init__(self, encoded_pages: List[str]):
+        super().__init__("benchmark")
+        self.encoded_pages = encoded_pages
+
+    async def _send(self, url: str, params: Optional[Dict[str, Any]] = None) -> ApiResponse:
+        page = (params or {}).get('page', 1)
+        body = json.loads(self.encoded_pages[page - 1]) if page <= len(self.encoded_pages) else []
+        return ApiResponse(200, CIMultiDictProxy(CIMultiDict()), body)
+
+
+def measure(stage: Callable[[], Any]) -> Dict[str, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = stage()
+    current, peak = tracemalloc.get_traced_memory()
+    # Memory blocks still allocated once the stage is done, i.e. held by its result
+    retained_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    del result
+    return {'peak_bytes': peak, 'retained_bytes': current, 'retained_blocks': retained_blocks}
+
+
+def _projected(pages: List[List[Dict[str, Any]]], endpoint: str) -> List[Dict[str, Any]]:
+    return [project(item, FIELD_PROJECTIONS[endpoint]) for page in pages for item in page]
+
+
+def _accumulate_commits(size: int) -> Callable[[], Any]:
+    encoded_pages = [json.dumps(page) for page in commit_pages(size // 100)]
+    loop = asyncio.new_event_loop()
+
+    def stage() -> List[Dict[str, Any]]:
+        service = PagedGitHubService(encoded_pages)
+        return loop.run_until_complete(service.get_repo_commits('octocat', 'benchmark'))
+    return stage
+
+
+def _from_dict(model: Any, pages: Callable[[int], List[List[Dict[str, Any]]]], endpoint: str):
+    def prepare(size: int) -> Callable[[], Any]:
+        items = _projected(pages(size // 100), endpoint)
+        return lambda: [model.from_dict(item) for item in items]
+    return prepare
+
+
+def _analyze_commits(size: int) -> Callable[[], Any]:
+    commits = [Commit.from_dict(item) for item in _projected(commit_pages(size // 100), 'commits')]
+    return lambda: CommitController('octocat', None).analyze_commits(commits, lambda steps, phase: None)
+
+
+def _analyze_pull_requests(size: int) -> Callable[[], Any]:
+    pull_requests = [PullRequest.from_dict(item) for item in _projected(pull_request_pages(size // 100), 'pulls')]
+    return lambda: PRController('octocat', None).analyze_pull_requests(pull_requests, lambda steps, phase: None)
+
+
+def _analyze_repos(size: int) -> Callable[[], Any]:
+    repos = [Repo.from_dict(item) for item in _projected(repo_pages(size // 100), 'repos')]
+    chart_dir = tempfile.mkdtemp(prefix='bench_memory_')
+
+    def stage() -> Dict[str, Any]:
+        # SVG charts keep matplotlib's caches out of the measurement
+        backend = chart_utils.get_backend_name()
+        chart_utils.set_backend('svg')
+        try:
+            return RepoController('octocat', None, chart_dir=chart_dir).analyze_repos(repos, lambda steps, phase: None)
+        finally:
+            chart_utils.set_backend(backend)
+    return stage
+
+
+STAGES: Dict[str, Callable[[int], Callable[[], Any]]] = {
+    'accumulate_commits': _accumulate_commits,
+    'commit_from_dict': _from_dict(Commit, commit_pages, 'commits'),
+    'pull_request_from_dict': _from_dict(PullRequest, pull_request_pages, 'pulls'),
+    'repo_from_dict': _from_dict(Repo, repo_pages, 'repos'),
+    'analyze_commits': _analyze_commits,
+    'analyze_pull_requests': _analyze_pull_requests,
+    'analyze_repos': _analyze_repos,
+}
+
+
+def run_stage(name: str, size: int) -> Dict[str, int]:
+    stage = STAGES[name](size)
+    stage()  # Warm up imports and lazily built caches so only the stage's own memory is counted
+    return measure(stage)
+
+
+def case_key(name: str, size: int) -> str:
+    return f"{name}[{size}]"
+
+
+def python_version() -> str:
+    # Object sizes differ between interpreters, so baselines only hold for the version that wrote them
+    return f"{platform.python_implementation()} {platform.python_version_tuple()[0]}.{platform.python_version_tuple()[1]}"
+
+
+def load_baselines(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {'python': python_version(), 'results': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results: Dict[str, Dict[str, int]], path: str = BASELINE_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'python': python_version(), 'results': results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions(measured: Dict[str, int], baseline: Dict[str, int]) -> List[Tuple[str, int, int]]:
+    failed = []
+    for metric in METRICS:
+        slack = SLACK_BLOCKS if metric == 'retained_blocks' else SLACK_BYTES
+        if measured[metric] > baseline[metric] * (1 + TOLERANCE) + slack:
+            failed.append((metric, baseline[metric], measured[metric]))
+    return failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure peak and retained memory of each pipeline stage")
+    parser.add_argument('--update', action='store_true', help=f"Store the results as the new baselines in {BASELINE_PATH}")
+    args = parser.parse_args()
+
+    baselines = load_baselines()['results']
+    results = {}
+    print(f"{'Stage':<34}{'Peak MB':>10}{'Retained MB':>13}{'Blocks':>10}{'vs. baseline':>14}")
+    for name in STAGES:
+        for size in SIZES:
+            key = case_key(name, size)
+            results[key] = run_stage(name, size)
+            baseline = baselines.get(key)
+            change = f"{results[key]['peak_bytes'] / baseline['peak_bytes'] - 1:+.1%}" if baseline else "new"
+            print(f"{key:<34}{results[key]['peak_bytes'] / 2**20:>10.2f}{results[key]['retained_bytes'] / 2**20:>13.2f}"
+                  f"{results[key]['retained_blocks']:>10}{change:>14}")
+    if args.update:
+        save_baselines(results)
+        print(f"\nBaselines written to {BASELINE_PATH}")
+
+
+if __name__ == '__main__':
+    main()
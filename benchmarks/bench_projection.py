@@ -0,0 +1,59 @@
+# benchmarks/bench_projection.py
+# Usage: python -m benchmarks.bench_projection [--pages N]
+import argparse
+import json
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from benchmarks.synthetic import commit_pages, pull_request_pages, repo_pages
+from services.projections import FIELD_PROJECTIONS, Projection, project
+
+
+def measure_retained(encoded_pages: List[str], projection: Optional[Projection]) -> Dict[str, int]:
+    # Mirrors GitHubService._iter_pages: decode a page, project it, keep only the result
+    tracemalloc.start()
+    retained = []
+    for encoded_page in encoded_pages:
+        retained.extend(project(item, projection) for item in json.loads(encoded_page))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'retained': current, 'peak': peak, 'items': len(retained)}
+
+
+def run(pages: int) -> List[Dict[str, object]]:
+    generators: Dict[str, Callable[[int], list]] = {
+        'commits': commit_pages,
+        'pulls': pull_request_pages,
+        'repos': repo_pages,
+    }
+    results = []
+    for endpoint, generate in generators.items():
+        encoded_pages = [json.dumps(page) for page in generate(pages)]
+        raw = measure_retained(encoded_pages, None)
+        projected = measure_retained(encoded_pages, FIELD_PROJECTIONS[endpoint])
+        results.append({
+            'endpoint': endpoint,
+            'items': raw['items'],
+            'raw_retained': raw['retained'],
+            'projected_retained': projected['retained'],
+            'raw_peak': raw['peak'],
+            'projected_peak': projected['peak'],
+            'reduction': 1 - projected['retained'] / raw['retained'],
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure memory retained by raw vs projected API pages")
+    parser.add_argument('--pages', type=int, default=20, help="Synthetic pages of 100 items per endpoint")
+    args = parser.parse_args()
+
+    print(f"{'Endpoint':<10}{'Items':>8}{'Raw MB':>10}{'Projected MB':>14}{'Peak raw MB':>13}{'Peak proj. MB':>15}{'Saved':>8}")
+    for row in run(args.pages):
+        print(f"{row['endpoint']:<10}{row['items']:>8}"
+              f"{row['raw_retained'] / 2**20:>10.2f}{row['projected_retained'] / 2**20:>14.2f}"
+              f"{row['raw_peak'] / 2**20:>13.2f}{row['projected_peak'] / 2**20:>15.2f}"
+              f"{row['reduction']:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_replay.py
+# Usage: python -m benchmarks.bench_replay [--archive PATH --username NAME] [--repos N] [--commit-pages N]
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from typing import Dict, List
+from benchmarks.synthetic import API, commit_payload, pull_request_payload, repo_payload
+from controllers.commit_controller import CommitController
+from controllers.pr_controller import PRController
+from controllers.repo_controller import RepoController
+from services.github_service import GitHubService
+from services.traffic_archive import TrafficRecorder, TrafficReplay
+
+
+def write_synthetic_archive(path: str, owner: str, repos: int, commit_pages: int, seed: int = 0) -> None:
+    # Shaped like a --record archive of a full run against an account with `repos` repositories
+    rng = random.Random(seed)
+    recorder = TrafficRecorder(path)
+
+    def record_pages(url: str, pages: List[list], params: Dict[str, str] = None) -> None:
+        for page, items in enumerate(pages + [[]], start=1):
+            recorder.record(url, {**(params or {}), 'page': page, 'per_page': GitHubService.PER_PAGE}, 200, {}, items)
+
+    repo_list = [repo_payload(owner, i, rng) for i in range(repos)]
+    recorder.record(f"{API}/users/{owner}", None, 200, {}, {'login': owner, 'public_repos': repos})
+    record_pages(f"{API}/users/{owner}/repos", [repo_list[i:i + 100] for i in range(0, repos, 100)])
+    for repo in repo_list:
+        name = repo['name']
+        record_pages(f"{API}/repos/{owner}/{name}/commits",
+                     [[commit_payload(owner, name, page * 100 + i, rng) for i in range(100)] for page in range(commit_pages)])
+        record_pages(f"{API}/repos/{owner}/{name}/pulls",
+                     [[pull_request_payload(owner, name, i + 1, rng) for i in range(rng.randrange(1, 40))]],
+                     params={'state': 'all'})
+        record_pages(f"{API}/repos/{owner}/{name}/contributors",
+                     [[{'login': f"author{i}", 'contributions': rng.randrange(1, 100)} for i in range(rng.randrange(1, 30))]])
+    recorder.close()
+
+
+async def run(archive: str, username: str, chart_dir: str) -> List[Dict[str, float]]:
+    # Controllers run one after another so each timing covers only its own work
+    results = []
+    service = GitHubService('replay', traffic_replay=TrafficReplay(archive))
+    controllers = [
+        CommitController(username, service),
+        PRController(username, service),
+        RepoController(username, service, chart_dir=chart_dir),
+    ]
+    try:
+        for controller in controllers:
+            started, cpu_started = time.perf_counter(), time.process_time()
+            await controller.run_analysis()
+            results.append({
+                'controller': controller.__class__.__name__,
+                'wall': time.perf_counter() - started,
+                'cpu': time.process_time() - cpu_started,
+            })
+    finally:
+        await service.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the analysis pipeline offline against a recorded API archive")
+    parser.add_argument('--archive', default=None, help="Archive recorded with main.py --record (default: synthetic)")
+    parser.add_argument('--username', default='octocat', help="Account the archive was recorded for")
+    parser.add_argument('--repos', type=int, default=50, help="Repositories in the synthetic archive")
+    parser.add_argument('--commit-pages', type=int, default=3, help="Pages of 100 commits per synthetic repository")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = args.archive
+        if archive is None:
+            archive = f"{directory}/traffic.jsonl.gz"
+            write_synthetic_archive(archive, args.username, args.repos, args.commit_pages)
+        results = asyncio.run(run(archive, args.username, f"{directory}/charts"))
+
+    print(f"{'Controller':<18}{'Wall s':>10}{'CPU s':>10}")
+    for row in results:
+        print(f"{row['controller']:<18}{row['wall']:>10.3f}{row['cpu']:>10.3f}")
+    print(f"{'Total':<18}{sum(row['wall'] for row in results):>10.3f}{sum(row['cpu'] for row in results):>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
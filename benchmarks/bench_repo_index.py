@@ -0,0 +1,57 @@
+# benchmarks/bench_repo_index.py
+# Usage: python -m benchmarks.bench_repo_index [--repos N] [--queries N]
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+from models.repo import Repo
+from models.repo_index import METRICS, RepoIndex
+
+LANGUAGES = ['Python', 'JavaScript', 'Go', 'Rust', 'Java', 'Unknown']
+
+
+def synthetic_repos(count: int, seed: int = 0) -> List[Repo]:
+    rng = random.Random(seed)
+    return [Repo(f"repo{i}", int(rng.paretovariate(1.2)), int(rng.paretovariate(1.5)), rng.choice(LANGUAGES),
+                 rng.randrange(10, 100000), datetime(2015, 1, 1) + timedelta(seconds=rng.randrange(10 * 365 * 86400)))
+            for i in range(count)]
+
+
+def time_queries(queries: int, query: Callable[[str, str], list]) -> float:
+    metrics, start = list(METRICS), time.perf_counter()
+    for i in range(queries):
+        query(metrics[i % len(metrics)], LANGUAGES[i % len(LANGUAGES)])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sorting per top-N query with a RepoIndex")
+    parser.add_argument('--repos', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=50, help="Top-10 queries, alternating metric and language")
+    args = parser.parse_args()
+
+    repos = synthetic_repos(args.repos)
+    sort_time = time_queries(args.queries, lambda metric, language: sorted(
+        (repo for repo in repos if repo.language == language), key=METRICS[metric], reverse=True)[:10])
+
+    start = time.perf_counter()
+    index = RepoIndex(repos)
+    build_time = time.perf_counter() - start
+    index_time = time_queries(args.queries, lambda metric, language: index.top(metric, 10, language=language))
+
+    start = time.perf_counter()
+    for repo in repos[:1000]:
+        repo.stars += 1
+        index.update(repo)
+    update_time = time.perf_counter() - start
+
+    print(f"{args.repos} repos, {args.queries} filtered top-10 queries")
+    print(f"Sort per query:   {sort_time:8.3f}s")
+    print(f"RepoIndex build:  {build_time:8.3f}s")
+    print(f"RepoIndex query:  {index_time:8.3f}s")
+    print(f"1000 updates:     {update_time:8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
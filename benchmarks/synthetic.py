@@ -0,0 +1,149 @@
+# benchmarks/synthetic.py
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+API = "https://api.github.com"
+BASE_DATE = datetime(2020, 1, 1)
+
+
+def _user(login: str) -> Dict[str, Any]:
+    user_url = f"{API}/users/{login}"
+    return {
+        'login': login,
+        'id': abs(hash(login)) % 10_000_000,
+        'node_id': f"MDQ6VXNlcj{login}",
+        'avatar_url': f"https://avatars.githubusercontent.com/u/{login}?v=4",
+        'gravatar_id': '',
+        'url': user_url,
+        'html_url': f"https://github.com/{login}",
+        'followers_url': f"{user_url}/followers",
+        'following_url': f"{user_url}/following{{/other_user}}",
+        'gists_url': f"{user_url}/gists{{/gist_id}}",
+        'starred_url': f"{user_url}/starred{{/owner}}{{/repo}}",
+        'subscriptions_url': f"{user_url}/subscriptions",
+        'organizations_url': f"{user_url}/orgs",
+        'repos_url': f"{user_url}/repos",
+        'events_url': f"{user_url}/events{{/privacy}}",
+        'received_events_url': f"{user_url}/received_events",
+        'type': 'User',
+        'site_admin': False,
+    }
+
+
+def _timestamp(rng: random.Random) -> str:
+    return (BASE_DATE + timedelta(seconds=rng.randrange(3 * 365 * 86400))).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def commit_payload(owner: str, repo: str, index: int, rng: random.Random) -> Dict[str, Any]:
+    sha = f"{rng.getrandbits(160):040x}"
+    login = f"author{rng.randrange(50)}"
+    date = _timestamp(rng)
+    repo_url = f"{API}/repos/{owner}/{repo}"
+    signature = {'name': login, 'email': f"{login}@example.com", 'date': date}
+    return {
+        'sha': sha,
+        'node_id': f"C_kwDO{sha[:24]}",
+        'commit': {
+            'author': dict(signature),
+            'committer': dict(signature),
+            'message': f"Commit {index}: " + "update module " * rng.randrange(1, 8),
+            'tree': {'sha': f"{rng.getrandbits(160):040x}", 'url': f"{repo_url}/git/trees/{sha}"},
+            'url': f"{repo_url}/git/commits/{sha}",
+            'comment_count': 0,
+            'verification': {
+                'verified': True,
+                'reason': 'valid',
+                'signature': "-----BEGIN PGP SIGNATURE-----\n" + "A" * 800 + "\n-----END PGP SIGNATURE-----\n",
+                'payload': f"tree {sha}\nparent {sha}\nauthor {login} <{login}@example.com>\n\nCommit {index}\n",
+            },
+        },
+        'url': f"{repo_url}/commits/{sha}",
+        'html_url': f"https://github.com/{owner}/{repo}/commit/{sha}",
+        'comments_url': f"{repo_url}/commits/{sha}/comments",
+        'author': _user(login),
+        'committer': _user('web-flow'),
+        'parents': [
+            {'sha': parent, 'url': f"{repo_url}/commits/{parent}", 'html_url': f"https://github.com/{owner}/{repo}/commit/{parent}"}
+            for parent in (f"{rng.getrandbits(160):040x}",)
+        ],
+    }
+
+
+def repo_payload(owner: str, index: int, rng: random.Random) -> Dict[str, Any]:
+    name = f"repo{index}"
+    repo_url = f"{API}/repos/{owner}/{name}"
+    payload: Dict[str, Any] = {
+        'id': index,
+        'node_id': f"R_kgDO{index:08d}",
+        'name': name,
+        'full_name': f"{owner}/{name}",
+        'private': False,
+        'owner': _user(owner),
+        'html_url': f"https://github.com/{owner}/{name}",
+        'description': "A synthetic repository " * 3,
+        'fork': rng.random() < 0.2,
+        'url': repo_url,
+        'created_at': _timestamp(rng),
+        'updated_at': _timestamp(rng),
+        'pushed_at': _timestamp(rng),
+        'homepage': None,
+        'size': rng.randrange(10, 100000),
+        'stargazers_count': rng.randrange(1000),
+        'watchers_count': rng.randrange(1000),
+        'language': rng.choice(['Python', 'JavaScript', 'Go', 'Rust', None]),
+        'forks_count': rng.randrange(200),
+        'open_issues_count': rng.randrange(50),
+        'default_branch': 'main',
+        'topics': ['analytics', 'github'],
+        'visibility': 'public',
+    }
+    for suffix in ('forks', 'keys', 'collaborators', 'teams', 'hooks', 'issue_events', 'events', 'assignees',
+                   'branches', 'tags', 'blobs', 'git_tags', 'git_refs', 'trees', 'statuses', 'languages',
+                   'stargazers', 'contributors', 'subscribers', 'subscription', 'commits', 'git_commits',
+                   'comments', 'issue_comment', 'contents', 'compare', 'merges', 'archive', 'downloads',
+                   'issues', 'pulls', 'milestones', 'notifications', 'labels', 'releases', 'deployments'):
+        payload[f"{suffix}_url"] = f"{repo_url}/{suffix}"
+    return payload
+
+
+def pull_request_payload(owner: str, repo: str, number: int, rng: random.Random) -> Dict[str, Any]:
+    created_at = BASE_DATE + timedelta(seconds=rng.randrange(3 * 365 * 86400))
+    closed = rng.random() < 0.8
+    closed_at = created_at + timedelta(hours=rng.expovariate(1 / 48)) if closed else None
+    repo_url = f"{API}/repos/{owner}/{repo}"
+    base_repo = repo_payload(owner, number % 7, rng)
+    return {
+        'url': f"{repo_url}/pulls/{number}",
+        'id': number,
+        'number': number,
+        'state': 'closed' if closed else 'open',
+        'title': f"Pull request {number}",
+        'user': _user(f"author{rng.randrange(50)}"),
+        'body': "Synthetic pull request body. " * rng.randrange(1, 20),
+        'created_at': created_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'updated_at': created_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'closed_at': closed_at.strftime('%Y-%m-%dT%H:%M:%SZ') if closed_at else None,
+        'merged_at': None,
+        'labels': [],
+        'head': {'label': f"{owner}:feature-{number}", 'ref': f"feature-{number}", 'repo': base_repo, 'user': _user(owner)},
+        'base': {'label': f"{owner}:main", 'ref': 'main', 'repo': base_repo, 'user': _user(owner)},
+    }
+
+
+def commit_pages(pages: int, per_page: int = 100, seed: int = 0, owner: str = 'octocat',
+                 repo: str = 'benchmark') -> List[List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    return [[commit_payload(owner, repo, page * per_page + i, rng) for i in range(per_page)] for page in range(pages)]
+
+
+def repo_pages(pages: int, per_page: int = 100, seed: int = 0, owner: str = 'octocat') -> List[List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    return [[repo_payload(owner, page * per_page + i, rng) for i in range(per_page)] for page in range(pages)]
+
+
+def pull_request_pages(pages: int, per_page: int = 100, seed: int = 0, owner: str = 'octocat',
+                       repo: str = 'benchmark') -> List[List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+    return [[pull_request_payload(owner, repo, page * per_page + i + 1, rng) for i in range(per_page)]
+            for page in range(pages)]
@@ -0,0 +1,29 @@
+# benchmarks/test_memory_regression.py
+# Not part of the default test run; use: python -m pytest benchmarks
+import pytest
+from benchmarks.bench_memory import (SIZES, STAGES, TOLERANCE, case_key, load_baselines, python_version, regressions,
+                                     run_stage)
+
+BASELINES = load_baselines()
+
+
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('stage', list(STAGES))
+def test_memory_does_not_regress(stage, size):
+    if BASELINES['python'] != python_version():
+        pytest.skip(f"Baselines were recorded on {BASELINES['python']}; "
+                    f"rerun python -m benchmarks.bench_memory --update on {python_version()}")
+    baseline = BASELINES['results'].get(case_key(stage, size))
+    if baseline is None:
+        pytest.skip("No baseline yet; run python -m benchmarks.bench_memory --update")
+
+    failed = regressions(run_stage(stage, size), baseline)
+
+    assert not failed, "; ".join(f"{metric} grew from {old} to {new} (more than {TOLERANCE:.0%})"
+                                 for metric, old, new in failed)
+
+
+def test_regressions_flags_growth_past_tolerance():
+    baseline = {'peak_bytes': 10_000_000, 'retained_bytes': 5_000_000, 'retained_blocks': 100_000}
+    assert regressions(dict(baseline), baseline) == []
+    assert regressions({**baseline, 'peak_bytes': 12_000_000}, baseline) == [('peak_bytes', 10_000_000, 12_000_000)]
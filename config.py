@@ -9,15 +9,66 @@ GITHUB_API_BASE_URL = "https://api.github.com"
 GITHUB_API_VERSION = "v3"
 
 # Cache configuration
-CACHE_MAX_SIZE = 100
+CACHE_MAX_SIZE = 1000  # Repo lists plus per-repo commits, PRs and contributors
 CACHE_TTL = 300  # Time-to-live in seconds (5 minutes)
+CACHE_STALE_TTL = 3600  # Expired entries are still served for this long while they refresh
+
+# Background cache refresh (server mode)
+REFRESH_INTERVAL = 60  # Seconds between scheduler passes
+REFRESH_LEAD_TIME = 90  # Refresh entries that expire within this many seconds
+REFRESH_TOP_KEYS = 50  # Most-read cache entries considered on each pass
+REFRESH_RATE_LIMIT_RESERVE = 500  # Never spend the last requests of the hourly budget on refreshes
+
+# HTTP configuration
+HTTP_CONNECTION_LIMIT = 20  # Concurrent connections in the shared pool
+TOKEN_MIN_REMAINING = 10  # Wait for the rate-limit reset once the best token has this few requests left
+
+# Repository statistics endpoints
+STATS_MAX_ATTEMPTS = 5  # Polls of a /stats endpoint while GitHub answers 202 Accepted
+STATS_RETRY_DELAY = 1.0  # Seconds before the first re-poll; doubled after each attempt
+
+# Crawl checkpoints
+CHECKPOINT_PATH = ".checkpoints/crawl.db"  # SQLite file recording finished fetches and fetched pages
+
+# Worker mode
+JOB_QUEUE_PATH = ".checkpoints/jobs.db"  # SQLite job queue shared by the coordinator and its workers
+JOB_POLL_INTERVAL = 0.5  # Seconds between checks for finished or newly queued jobs
+JOB_TIMEOUT = 600  # Jobs claimed longer ago than this are assumed lost and handed out again
+WORKER_CONCURRENCY = 4  # Jobs each worker process fetches at once
+
+# Profiling
+PROFILE_STALL_THRESHOLD = 0.1  # Seconds the event loop must be blocked to count as a stall
+
+# Analytics server
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
 
 # Rate limiting
 RATE_LIMIT_THRESHOLD = 10  # Number of remaining requests before waiting
 
+# Analytics configuration
+PR_LATENCY_SKETCH_ACCURACY = 0.01  # Relative error of PR time-to-close quantiles
+CONTRIBUTOR_COUNT_APPROXIMATE = False  # Merge HyperLogLog sketches instead of unioning login sets
+CONTRIBUTOR_COUNT_ERROR_RATE = 0.02  # Standard error of approximate distinct contributor counts
+CONTRIBUTOR_EXACT_THRESHOLD = 1000  # Sketches stay exact until they hold this many logins
+AUTHOR_SKETCH_CAPACITY = 100  # Authors tracked by each heavy-hitters sketch
+TOP_AUTHORS_COUNT = 5
+COMMIT_DEDUP_CAPACITY = 10_000_000  # Commit SHAs the deduplication filter is sized for
+COMMIT_DEDUP_ERROR_RATE = 0.001  # False-positive rate once the filter stops being exact
+COMMIT_DEDUP_EXACT_THRESHOLD = 1_000_000  # SHAs kept exactly before switching to a Bloom filter
+COMMIT_SAMPLE_PAGES = 10  # Pages of commits fetched per repo in sampling mode, spread from newest to oldest
+COMMIT_SAMPLE_CONFIDENCE_Z = 1.96  # z-score of the confidence intervals on sampled estimates (95%)
+ACTIVITY_TIMEZONE = os.getenv('ACTIVITY_TIMEZONE', 'UTC')  # IANA zone for activity heatmaps, or 'author' for each commit's own offset
+
+# Chart configuration
+CHART_BACKEND = os.getenv('CHART_BACKEND', 'matplotlib')  # 'matplotlib' (PNG) or 'svg' (dependency-free)
+
 # Logging configuration
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+# Comma-separated tokens whose rate limits are pooled; falls back to GITHUB_TOKEN
+GITHUB_TOKENS = [token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()] or \
+    ([GITHUB_TOKEN] if GITHUB_TOKEN else [])
 GITHUB_USERNAME = os.getenv('GITHUB_USERNAME')
@@ -1,46 +1,366 @@
 # controllers/commit_controller.py
+import asyncio
 import logging
-from typing import List, Dict, Any, Callable
-from models.commit import Commit
-from services.github_service import GitHubService
+import aiohttp
+import math
+import os
+from typing import List, Dict, Any, Callable, Optional, Tuple
+from models.commit import WEEKDAYS, Commit, CommitActivity, CommitSample
+from services.github_service import GitHubService, IncompleteFetch
+from utils import chart_utils
+from utils.bloom_filter import BloomFilter
+from utils.heavy_hitters import SpaceSaving
+from utils.memo_store import MemoStore
+from utils.sampling import confidence_interval, spread_pages
+from utils.deadline import Deadline, DeadlineExceeded, COMPLETE, TRUNCATED, SKIPPED, SHARED_HISTORY
+from config import (ACTIVITY_TIMEZONE, AUTHOR_SKETCH_CAPACITY, COMMIT_DEDUP_CAPACITY, COMMIT_DEDUP_ERROR_RATE,
+                    COMMIT_DEDUP_EXACT_THRESHOLD, COMMIT_SAMPLE_CONFIDENCE_Z, TOP_AUTHORS_COUNT)
 
 
 class CommitController:
-    def __init__(self, username: str, github_service: GitHubService):
+    def __init__(self, username: str, github_service: GitHubService,
+                 use_stats_endpoints: bool = False, exact_history: bool = False,
+                 memo_store: Optional[MemoStore] = None, timezone: str = ACTIVITY_TIMEZONE,
+                 chart_dir: Optional[str] = None,
+                 row_writer: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+                 sample_pages: Optional[int] = None):
         self.username = username
         self.github_service = github_service
+        self.memo_store = memo_store
+        # Heatmaps are bucketed in this IANA timezone, or in each commit's own offset with 'author'
+        self.timezone = timezone
+        # The activity heatmap is only drawn when there is somewhere to put it
+        self.chart_dir = chart_dir
+        # Receives each repo's parsed commits as ('commits', rows) as soon as they are fetched
+        self.row_writer = row_writer
+        # Stats mode reads GitHub's precomputed /stats endpoints instead of crawling every commit.
+        # Their daily activity covers the last 52 weeks only; with exact_history, repos with older
+        # commits are crawled so frequency and streaks stay exact.
+        self.use_stats_endpoints = use_stats_endpoints
+        self.exact_history = exact_history
+        # Sampling mode reads this many pages spread across each larger repo's history and estimates the rest
+        self.sample_pages = sample_pages
+        self.samples: Dict[str, CommitSample] = {}
+        self.data_sources: Dict[str, str] = {}
         self.logger = logging.getLogger(__name__)
+        self.author_sketches: Dict[str, SpaceSaving] = {}
+        self.coverage: Dict[str, str] = {}
+        self.duplicate_commits = 0
 
-    async def get_commits(self, progress_callback: Callable[[int], None]) -> List[Commit]:
-        repos = await self.github_service.get_user_repos(self.username)
-        progress_callback(1)  # Step 1: Fetched user repositories
+    async def get_commits(self, progress_callback: Callable[[int, str], None],
+                          deadline: Optional[Deadline] = None) -> List[Commit]:
+        self.author_sketches = {}
+        self.coverage = {}
+        self.samples = {}
+        try:
+            repos = await self.github_service.get_user_repos(self.username, deadline=deadline)
+        except DeadlineExceeded as e:
+            repos = e.partial
+        progress_callback(1, 'fetch repositories')  # Step 1: Fetched user repositories
+
+        # Forks go last, so the history they share with their parents is known before they are crawled
+        repos = sorted(repos, key=lambda repo: bool(repo.get('fork')))
+        seen = BloomFilter(COMMIT_DEDUP_CAPACITY, COMMIT_DEDUP_ERROR_RATE, COMMIT_DEDUP_EXACT_THRESHOLD)
+        self.duplicate_commits = 0
 
         all_commits = []
-        for i, repo in enumerate(repos):
-            repo_commits = await self.github_service.get_repo_commits(self.username, repo['name'])
-            if repo_commits:
-                all_commits.extend([Commit.from_dict(commit) for commit in repo_commits])
+        for repo in repos:
+            if deadline is not None and deadline.expired:
+                self.coverage[repo['name']] = SKIPPED
+                progress_callback(1, 'fetch commits')
+                continue
+            try:
+                stopped = False
+                if self.sample_pages and await self._sample_repo_commits(repo['name'], seen, deadline):
+                    repo_commits = []  # Kept apart in self.samples
+                elif repo.get('fork'):
+                    # A fork lists its own commits first; a page of nothing but known commits is taken to mean the
+                    # rest is shared. Its own commits further down would be missed, so coverage says where it stopped.
+                    repo_commits, stopped = await self.github_service.get_repo_commits_until(
+                        self.username, repo['name'], lambda page: all(commit['sha'] in seen for commit in page),
+                        deadline=deadline)
+                else:
+                    repo_commits = await self.github_service.get_repo_commits(self.username, repo['name'], deadline=deadline)
+                self.coverage[repo['name']] = SHARED_HISTORY if stopped else COMPLETE
+            except (DeadlineExceeded, IncompleteFetch) as e:
+                repo_commits = e.partial
+                self.coverage[repo['name']] = TRUNCATED
+            # Mirrors and forks share commits; each SHA is counted once
+            commits = [Commit.from_dict(commit) for commit in repo_commits if seen.add(commit['sha'])]
+            self.duplicate_commits += len(repo_commits) - len(commits)
+            self._write_rows(repo['name'], commits)
+            if commits:
+                all_commits.extend(commits)
+                self.author_sketches[repo['name']] = Commit.get_author_sketch(commits)
             # Update progress after processing each repository
-            progress_callback(1)
+            progress_callback(1, 'fetch commits')
 
         return all_commits
 
-    def analyze_commits(self, commits: List[Commit], progress_callback: Callable[[int], None]) -> Dict[str, Any]:
+    async def _sample_repo_commits(self, repo_name: str, seen: BloomFilter, deadline: Optional[Deadline]) -> bool:
+        # The Link header gives the exact total; repos that fit in the sample are crawled exactly instead
+        try:
+            total = await self.github_service.get_repo_commit_count(self.username, repo_name, deadline=deadline)
+        except aiohttp.ClientError as e:
+            self.logger.warning(f"Could not count commits for {repo_name}, crawling it instead: {str(e)}")
+            return False
+        page_count = math.ceil(total / GitHubService.PER_PAGE)
+        if page_count <= self.sample_pages:
+            return False
+        pages = spread_pages(page_count, self.sample_pages)
+        try:
+            sampled = await self.github_service.get_repo_commit_pages(self.username, repo_name, pages, deadline=deadline)
+        except DeadlineExceeded as e:
+            self._add_sample(repo_name, total, page_count, e.partial, seen)
+            raise DeadlineExceeded(str(e), [])
+        self._add_sample(repo_name, total, page_count, sampled, seen)
+        return True
+
+    def _add_sample(self, repo_name: str, total: int, page_count: int, sampled: List[List[Any]],
+                    seen: BloomFilter) -> None:
+        # Sampled commits can't be deduplicated against the unseen rest, but forks crawled later still stop at them
+        sample = CommitSample(total, page_count, [[Commit.from_dict(commit) for commit in page_commits]
+                                                  for _, page_commits in sampled if page_commits])
+        commits = sample.commits
+        for commit in commits:
+            seen.add(commit.sha)
+        self._write_rows(repo_name, commits)
+        if commits:
+            self.samples[repo_name] = sample
+            self.author_sketches[repo_name] = Commit.get_scaled_author_sketch(commits, sample.weight)
+
+    async def get_commit_activity(self, progress_callback: Callable[[int, str], None],
+                                  deadline: Optional[Deadline] = None) -> CommitActivity:
+        self.author_sketches = {}
+        self.coverage = {}
+        self.data_sources = {}
+        try:
+            repos = await self.github_service.get_user_repos(self.username, deadline=deadline)
+        except DeadlineExceeded as e:
+            repos = e.partial
+        progress_callback(1, 'fetch repositories')  # Step 1: Fetched user repositories
+
+        activity = CommitActivity(timezone=self.timezone)
+        for repo in repos:
+            if deadline is not None and deadline.expired:
+                self.coverage[repo['name']] = SKIPPED
+                progress_callback(1, 'fetch commit statistics')
+                continue
+            try:
+                stats = await self._get_repo_stats(repo['name'], deadline)
+                if stats is not None:
+                    punch_card, commit_activity, contributor_stats = stats
+                    activity.add_stats(punch_card, commit_activity)
+                    self.author_sketches[repo['name']] = Commit.get_author_sketch_from_contributor_stats(contributor_stats)
+                    self.data_sources[repo['name']] = 'stats'
+                else:
+                    # Statistics unavailable or not exact enough: crawl this repo's commits
+                    repo_commits = await self.github_service.get_repo_commits(self.username, repo['name'], deadline=deadline)
+                    self._add_crawled_commits(repo['name'], repo_commits, activity)
+                self.coverage[repo['name']] = COMPLETE
+            except (DeadlineExceeded, IncompleteFetch) as e:
+                self._add_crawled_commits(repo['name'], e.partial, activity)
+                self.coverage[repo['name']] = TRUNCATED
+            progress_callback(1, 'fetch commit statistics')
+
+        return activity
+
+    async def _get_repo_stats(self, repo_name: str,
+                              deadline: Optional[Deadline]) -> Optional[Tuple[List[Any], List[Any], List[Any]]]:
+        punch_card, commit_activity, contributor_stats = await asyncio.gather(*(
+            self.github_service.get_repo_stats(self.username, repo_name, kind, deadline=deadline)
+            for kind in ('punch_card', 'commit_activity', 'contributors')
+        ))
+        if punch_card is None or commit_activity is None or contributor_stats is None:
+            return None
+        if self.exact_history:
+            all_time_total = sum(count for _, _, count in punch_card)
+            last_year_total = sum(week['total'] for week in commit_activity)
+            if all_time_total != last_year_total:
+                return None
+        return punch_card, commit_activity, contributor_stats
+
+    def _add_crawled_commits(self, repo_name: str, repo_commits: List[Dict[str, Any]], activity: CommitActivity) -> None:
+        commits = [Commit.from_dict(commit) for commit in repo_commits]
+        self._write_rows(repo_name, commits)
+        activity.add_commits(commits)
+        if commits:
+            self.author_sketches[repo_name] = Commit.get_author_sketch(commits)
+        self.data_sources[repo_name] = 'crawl'
+
+    def _write_rows(self, repo_name: str, commits: List[Commit]) -> None:
+        if self.row_writer is not None and commits:
+            self.row_writer('commits', [{'repo': repo_name, **vars(commit)} for commit in commits])
+
+    def analyze_commit_activity(self, activity: CommitActivity, progress_callback: Callable[[int, str], None]) -> Dict[str, Any]:
+        time_distribution = dict(activity.time_distribution)
+        activity_heatmap = activity.heatmap
+        progress_callback(1, 'time distribution and heatmap')  # Step 3: Calculated time distribution and activity heatmap
+
+        avg_frequency = Commit.get_average_frequency_from_daily_counts(activity.daily_counts)
+        progress_callback(1, 'average frequency')  # Step 4: Calculated average frequency
+
+        longest_streak = Commit.get_longest_streak_from_dates(activity.daily_counts)
+        progress_callback(1, 'longest streak')  # Step 5: Calculated longest streak
+
+        top_authors = self.analyze_top_authors([], self.author_sketches)
+        progress_callback(1, 'top authors')  # Step 6: Calculated top authors
+
+        return {
+            "time_distribution": time_distribution,
+            "activity_heatmap": activity_heatmap,
+            "timezone": self.timezone,
+            "avg_frequency": avg_frequency,
+            "longest_streak": longest_streak,
+            "top_authors": top_authors,
+            "coverage": dict(self.coverage),
+            "data_sources": dict(self.data_sources),
+            "windows": self._stats_windows()
+        }
+
+    def _stats_windows(self) -> Dict[str, str]:
+        # A punch card covers a repo's whole history, but commit_activity (daily counts) only its last 52 weeks.
+        # With exact_history, repos with older commits are crawled instead, so every figure covers all time.
+        # Crawled repos contribute daily counts from their whole history, so with both sources those are mixed.
+        if self.exact_history or 'stats' not in self.data_sources.values():
+            return {}
+        daily = 'last 52 weeks'
+        if 'crawl' in self.data_sources.values():
+            daily = 'mixed: last 52 weeks from statistics, all time from crawled repos'
+        return {'time_distribution': 'all time', 'activity_heatmap': 'all time',
+                'avg_frequency': daily, 'longest_streak': daily}
+
+    def analyze_commits(self, commits: List[Commit], progress_callback: Callable[[int, str], None]) -> Dict[str, Any]:
+        if self.samples:
+            return self.analyze_sampled_commits(commits, progress_callback)
+
         time_distribution = Commit.get_commit_time_distribution(commits)
-        progress_callback(1)  # Step 3: Calculated time distribution
+        activity_heatmap = Commit.get_commit_activity_heatmap(commits, self.timezone).tolist()
+        progress_callback(1, 'time distribution and heatmap')  # Step 3: Calculated time distribution and activity heatmap
 
         avg_frequency = Commit.get_average_commit_frequency(commits)
-        progress_callback(1)  # Step 4: Calculated average frequency
+        progress_callback(1, 'average frequency')  # Step 4: Calculated average frequency
 
         longest_streak = Commit.get_longest_streak(commits)
-        progress_callback(1)  # Step 5: Calculated longest streak
+        progress_callback(1, 'longest streak')  # Step 5: Calculated longest streak
+
+        top_authors = self.analyze_top_authors(commits, self.author_sketches)
+        progress_callback(1, 'top authors')  # Step 6: Calculated top authors
 
         return {
             "time_distribution": time_distribution,
+            "activity_heatmap": activity_heatmap,
+            "timezone": self.timezone,
+            "avg_frequency": avg_frequency,
+            "longest_streak": longest_streak,
+            "top_authors": top_authors,
+            "duplicate_commits": self.duplicate_commits,
+            "coverage": dict(self.coverage)
+        }
+
+    def analyze_sampled_commits(self, commits: List[Commit], progress_callback: Callable[[int, str], None]) -> Dict[str, Any]:
+        # Exactly crawled repos count as they are; sampled repos add estimates whose variances add up
+        time_distribution = Commit.get_commit_time_distribution(commits)
+        variances = {day: 0.0 for day in WEEKDAYS}
+        activity_heatmap = Commit.get_commit_activity_heatmap(commits, self.timezone).astype(float)
+        for sample in self.samples.values():
+            for day, (estimate, variance) in sample.estimate_time_distribution().items():
+                time_distribution[day] += estimate
+                variances[day] += variance
+            activity_heatmap += sample.estimate_activity_heatmap(self.timezone)
+        intervals = {day: [round(bound) for bound in confidence_interval(count, variances[day], COMMIT_SAMPLE_CONFIDENCE_Z)]
+                     for day, count in time_distribution.items()}
+        progress_callback(1, 'estimate time distribution')  # Step 3: Calculated time distribution and activity heatmap
+
+        # The Link totals are exact and the first and last pages bound each history, so frequency needs no interval
+        sampled_commits = [commit for sample in self.samples.values() for commit in sample.commits]
+        dates = [commit.date.date() for commit in commits + sampled_commits]
+        total = len(commits) + sum(sample.total_commits for sample in self.samples.values())
+        avg_frequency = total / ((max(dates) - min(dates)).days + 1)
+        progress_callback(1, 'estimate average frequency')  # Step 4: Calculated average frequency
+
+        # Gaps between sampled pages hide days, so this is a lower bound
+        longest_streak = Commit.get_longest_streak_from_dates(dates)
+        progress_callback(1, 'longest streak')  # Step 5: Calculated longest streak
+
+        top_authors = self.analyze_top_authors(commits, self.author_sketches)
+        progress_callback(1, 'top authors')  # Step 6: Calculated top authors
+
+        return {
+            "time_distribution": {day: round(count) for day, count in time_distribution.items()},
+            "activity_heatmap": activity_heatmap.round().astype(int).tolist(),
+            "timezone": self.timezone,
             "avg_frequency": avg_frequency,
-            "longest_streak": longest_streak
+            "longest_streak": longest_streak,
+            "top_authors": top_authors,
+            "duplicate_commits": self.duplicate_commits,
+            "coverage": dict(self.coverage),
+            "estimates": {
+                "confidence_z": COMMIT_SAMPLE_CONFIDENCE_Z,
+                "time_distribution": intervals,
+                "longest_streak_is_lower_bound": True,
+                "sampled_repos": {
+                    repo_name: {"total_commits": sample.total_commits, "sampled_commits": sample.sampled_count,
+                                "sampled_pages": len(sample.pages), "page_count": sample.page_count}
+                    for repo_name, sample in self.samples.items()
+                }
+            }
         }
 
-    async def run_analysis(self, progress_callback: Callable[[int], None] = lambda x: None) -> Dict[str, Any]:
-        commits = await self.get_commits(progress_callback)
-        return self.analyze_commits(commits, progress_callback)
+    def analyze_top_authors(self, commits: List[Commit], sketches: Optional[Dict[str, SpaceSaving]] = None,
+                            top_n: int = TOP_AUTHORS_COUNT) -> Dict[str, Any]:
+        # Per-repo sketches of these commits, when given, are merged instead of counting them again
+        sketches = sketches or {}
+        if sketches:
+            overall = SpaceSaving(AUTHOR_SKETCH_CAPACITY)
+            for sketch in sketches.values():
+                overall.merge(sketch)
+        else:
+            overall = Commit.get_author_sketch(commits)
+
+        return {
+            "overall": overall.top(top_n),
+            "per_repo": {
+                repo_name: sketch.top(top_n)
+                for repo_name, sketch in sketches.items()
+            }
+        }
+
+    async def run_analysis(self, progress_callback: Callable[[int, str], None] = lambda steps, phase: None,
+                           time_budget: Optional[float] = None) -> Dict[str, Any]:
+        deadline = Deadline.from_budget(time_budget)
+        if self.use_stats_endpoints:
+            activity = await self.get_commit_activity(progress_callback, deadline)
+            analysis = self._memoized('commit_activity_analysis', activity,
+                                      lambda: self.analyze_commit_activity(activity, progress_callback),
+                                      progress_callback, 4)
+        else:
+            commits = await self.get_commits(progress_callback, deadline)
+            analysis = self._memoized('commit_analysis', commits, lambda: self.analyze_commits(commits, progress_callback),
+                                      progress_callback, 4)
+        if self.chart_dir is not None:
+            analysis = {**analysis, "chart_files": [self._render_heatmap_chart(analysis)]}
+        return analysis
+
+    def _memoized(self, name: str, data: Any, analyze: Callable[[], Dict[str, Any]],
+                  progress_callback: Callable[[int, str], None], steps: int) -> Dict[str, Any]:
+        if self.memo_store is None:
+            return analyze()
+        key = MemoStore.fingerprint(name, data, self.author_sketches, self.coverage, self.data_sources, self.timezone,
+                                    self.duplicate_commits, self.samples)
+        analysis, hit = self.memo_store.memoize(key, analyze)
+        if hit:
+            progress_callback(steps, 'memo hit')  # The analysis steps were skipped
+        return analysis
+
+    def _render_heatmap_chart(self, analysis: Dict[str, Any]) -> str:
+        os.makedirs(self.chart_dir, exist_ok=True)
+        filename = chart_utils.chart_filename("activity_heatmap")
+        path = os.path.join(self.chart_dir, filename)
+        render = lambda path: Commit.create_activity_heatmap_chart(analysis['activity_heatmap'], analysis['timezone'], path)
+        if self.memo_store is None:
+            render(path)
+        else:
+            self.memo_store.render_chart(MemoStore.fingerprint('chart', filename, analysis['activity_heatmap'],
+                                                               analysis['timezone']), path, render)
+        return path
@@ -1,43 +1,190 @@
 # controllers/pr_controller.py
-from typing import List, Dict, Any, Callable
+import asyncio
+import logging
+import aiohttp
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from models.pull_request import PullRequest
 from services.github_service import GitHubService
+from utils.quantile_sketch import QuantileSketch
+from utils.memo_store import MemoStore
+from utils.deadline import Deadline, DeadlineExceeded, COMPLETE, TRUNCATED, SKIPPED
+from config import PR_LATENCY_SKETCH_ACCURACY
+
+# Coverage entry for the account-wide count; repository names can't contain spaces or parentheses
+ACCOUNT_COUNT = "(all repositories)"
 
 
 class PRController:
-    def __init__(self, username: str, github_service: GitHubService):
+    def __init__(self, username: str, github_service: GitHubService,
+                 count_only: bool = False, per_repo_counts: bool = False,
+                 memo_store: Optional[MemoStore] = None,
+                 row_writer: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None):
         self.username = username
         self.github_service = github_service
+        self.memo_store = memo_store
+        # Count-only mode asks GitHub for open/closed totals instead of downloading every PR;
+        # it costs two requests per account (plus two per repo with per_repo_counts)
+        self.count_only = count_only
+        self.per_repo_counts = per_repo_counts
+        # Receives each repo's parsed pull requests as ('pull_requests', rows) as soon as they are fetched
+        self.row_writer = row_writer
+        self.time_to_close_sketches: Dict[str, QuantileSketch] = {}
+        self.coverage: Dict[str, str] = {}
+        self.logger = logging.getLogger(__name__)
 
-    async def get_pull_requests(self, progress_callback: Callable[[int], None]) -> List[PullRequest]:
-        repos = await self.github_service.get_user_repos(self.username)
-        progress_callback(1)  # Step 1: Fetched user repositories
+    async def get_pull_requests(self, progress_callback: Callable[[int, str], None],
+                                deadline: Optional[Deadline] = None) -> List[PullRequest]:
+        self.time_to_close_sketches = {}
+        self.coverage = {}
+        try:
+            repos = await self.github_service.get_user_repos(self.username, deadline=deadline)
+        except DeadlineExceeded as e:
+            repos = e.partial
+        progress_callback(1, 'fetch repositories')  # Step 1: Fetched user repositories
 
         all_pull_requests = []
         for repo in repos:
+            if deadline is not None and deadline.expired:
+                self.coverage[repo['name']] = SKIPPED
+                progress_callback(1, 'fetch pull requests')
+                continue
             try:
-                repo_prs = await self.github_service.get_repo_pull_requests(self.username, repo['name'])
-                all_pull_requests.extend([PullRequest.from_dict(pr) for pr in repo_prs])
+                repo_prs = await self._fetch_repo_pull_requests(repo['name'], deadline)
+                pull_requests = [PullRequest.from_dict(pr) for pr in repo_prs]
+                all_pull_requests.extend(pull_requests)
+                if self.row_writer is not None and pull_requests:
+                    self.row_writer('pull_requests', [
+                        {'repo': repo['name'], **vars(pr), 'time_to_close_hours': pr.time_to_close_hours}
+                        for pr in pull_requests
+                    ])
+
+                # Keep a per-repo latency partial so the overall distribution can be merged later
+                sketch = PullRequest.get_time_to_close_sketch(pull_requests)
+                if sketch.count:
+                    self.time_to_close_sketches[repo['name']] = sketch
 
                 # Update progress after processing each repository
-                progress_callback(1)
+                progress_callback(1, 'fetch pull requests')
             except Exception as e:
-                print(f"Warning: Error processing pull requests for repository {repo['name']}: {str(e)}")
+                self.logger.warning(f"Error processing pull requests for repository {repo['name']}: {str(e)}")
 
         return all_pull_requests
 
-    def analyze_pull_requests(self, pull_requests: List[PullRequest], progress_callback: Callable[[int], None]) -> Dict[str, Any]:
+    async def _fetch_repo_pull_requests(self, repo_name: str, deadline: Optional[Deadline]) -> List[Dict[str, Any]]:
+        try:
+            repo_prs = await self.github_service.get_repo_pull_requests(self.username, repo_name, deadline=deadline)
+            self.coverage[repo_name] = COMPLETE
+        except DeadlineExceeded as e:
+            repo_prs = e.partial
+            self.coverage[repo_name] = TRUNCATED
+        return repo_prs
+
+    async def get_pull_request_counts(self, progress_callback: Callable[[int, str], None],
+                                      deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        self.coverage = {}
+        try:
+            opened, closed = await self._count_pull_requests(None, deadline)
+        except (DeadlineExceeded, aiohttp.ClientError) as e:
+            # Reported as zero, with the count marked skipped so the totals aren't read as real
+            self.logger.warning(f"Error counting pull requests for {self.username}: {str(e)}")
+            opened, closed = 0, 0
+            self.coverage[ACCOUNT_COUNT] = SKIPPED
+        progress_callback(1, 'count pull requests')  # Step 1: Counted the account's pull requests
+
+        per_repo: Dict[str, Dict[str, int]] = {}
+        if self.per_repo_counts:
+            try:
+                repos = await self.github_service.get_user_repos(self.username, deadline=deadline)
+            except DeadlineExceeded as e:
+                repos = e.partial
+            for repo in repos:
+                if deadline is not None and deadline.expired:
+                    self.coverage[repo['name']] = SKIPPED
+                    continue
+                try:
+                    repo_opened, repo_closed = await self._count_pull_requests(repo['name'], deadline)
+                    per_repo[repo['name']] = {'opened': repo_opened, 'closed': repo_closed}
+                    self.coverage[repo['name']] = COMPLETE
+                except DeadlineExceeded:
+                    self.coverage[repo['name']] = SKIPPED
+                except Exception as e:
+                    self.logger.warning(f"Error counting pull requests for repository {repo['name']}: {str(e)}")
+            progress_callback(1, 'count pull requests per repository')  # Step 2: Counted pull requests per repository
+
+        return {'opened': opened, 'closed': closed, 'per_repo': per_repo}
+
+    async def _count_pull_requests(self, repo_name: Optional[str], deadline: Optional[Deadline]) -> Tuple[int, int]:
+        opened, closed = await asyncio.gather(*(
+            self.github_service.get_pull_request_count(self.username, repo_name, state, deadline=deadline)
+            for state in ('open', 'closed')
+        ))
+        return opened, closed
+
+    def analyze_pull_request_counts(self, counts: Dict[str, Any], progress_callback: Callable[[int, str], None]) -> Dict[str, Any]:
+        pr_stats = {'opened': counts['opened'], 'closed': counts['closed']}
+        total_prs = counts['opened'] + counts['closed']
+        progress_callback(1, 'pull request stats')  # Step 3: Calculated PR stats
+
+        return {
+            "pr_stats": pr_stats,
+            "total_prs": total_prs,
+            "per_repo_counts": counts['per_repo'],
+            "coverage": dict(self.coverage)
+        }
+
+    def analyze_pull_requests(self, pull_requests: List[PullRequest], progress_callback: Callable[[int, str], None]) -> Dict[str, Any]:
         pr_stats = PullRequest.get_pr_stats(pull_requests)
-        progress_callback(1)  # Step 3: Calculated PR stats
+        progress_callback(1, 'pull request stats')  # Step 3: Calculated PR stats
 
         total_prs = len(pull_requests)
-        progress_callback(1)  # Step 4: Counted total PRs
+        progress_callback(1, 'total pull requests')  # Step 4: Counted total PRs
+
+        time_to_close = self.analyze_time_to_close(pull_requests, self.time_to_close_sketches)
+        progress_callback(1, 'time to close')  # Step 5: Calculated time-to-close distribution
 
         return {
             "pr_stats": pr_stats,
-            "total_prs": total_prs
+            "total_prs": total_prs,
+            "time_to_close": time_to_close,
+            "coverage": dict(self.coverage)
         }
 
-    async def run_analysis(self, progress_callback: Callable[[int], None] = lambda x: None) -> Dict[str, Any]:
-        pull_requests = await self.get_pull_requests(progress_callback)
-        return self.analyze_pull_requests(pull_requests, progress_callback)
+    def analyze_time_to_close(self, pull_requests: List[PullRequest],
+                              sketches: Optional[Dict[str, QuantileSketch]] = None) -> Dict[str, Any]:
+        # Per-repo sketches of these pull requests, when given, are merged instead of sketching them again
+        sketches = sketches or {}
+        if sketches:
+            overall = QuantileSketch.merge_all(sketches.values(), PR_LATENCY_SKETCH_ACCURACY)
+        else:
+            overall = PullRequest.get_time_to_close_sketch(pull_requests)
+
+        return {
+            "overall": PullRequest.summarize_time_to_close(overall),
+            "per_repo": {
+                repo_name: PullRequest.summarize_time_to_close(sketch)
+                for repo_name, sketch in sketches.items()
+            }
+        }
+
+    async def run_analysis(self, progress_callback: Callable[[int, str], None] = lambda steps, phase: None,
+                           time_budget: Optional[float] = None) -> Dict[str, Any]:
+        deadline = Deadline.from_budget(time_budget)
+        if self.count_only:
+            counts = await self.get_pull_request_counts(progress_callback, deadline)
+            return self._memoized('pull_request_count_analysis', counts,
+                                  lambda: self.analyze_pull_request_counts(counts, progress_callback),
+                                  progress_callback, 1)
+        pull_requests = await self.get_pull_requests(progress_callback, deadline)
+        return self._memoized('pull_request_analysis', pull_requests,
+                              lambda: self.analyze_pull_requests(pull_requests, progress_callback),
+                              progress_callback, 3)
+
+    def _memoized(self, name: str, data: Any, analyze: Callable[[], Dict[str, Any]],
+                  progress_callback: Callable[[int, str], None], steps: int) -> Dict[str, Any]:
+        if self.memo_store is None:
+            return analyze()
+        key = MemoStore.fingerprint(name, data, self.time_to_close_sketches, self.coverage)
+        analysis, hit = self.memo_store.memoize(key, analyze)
+        if hit:
+            progress_callback(steps, 'memo hit')  # The analysis steps were skipped
+        return analysis
@@ -1,80 +1,134 @@
 # controllers/repo_controller.py
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Optional
 import logging
+import os
 from models.repo import Repo
+from models.repo_index import RepoIndex
 from services.github_service import GitHubService
 from utils import chart_utils
+from utils.memo_store import MemoStore
+from utils.deadline import Deadline, DeadlineExceeded, COMPLETE, TRUNCATED, SKIPPED
+from config import CONTRIBUTOR_COUNT_APPROXIMATE
 
 
 class RepoController:
-    def __init__(self, username: str, github_service: GitHubService):
+    def __init__(self, username: str, github_service: GitHubService, chart_dir: Optional[str] = None,
+                 memo_store: Optional[MemoStore] = None,
+                 row_writer: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None):
         self.username = username
         self.github_service = github_service
+        self.chart_dir = chart_dir
+        self.memo_store = memo_store
+        # Receives each repo as ('repos', [row]) once its contributors are fetched
+        self.row_writer = row_writer
+        self.coverage: Dict[str, str] = {}
+        # Rankings of the last analysed repos, for further top-N and percentile queries
+        self.repo_index = RepoIndex()
         self.logger = logging.getLogger(__name__)
 
-    async def get_repos(self, progress_callback: Callable[[int], None]) -> List[Repo]:
-        repo_data = await self.github_service.get_user_repos(self.username)
-        progress_callback(1)  # Step 1: Fetched user repositories
+    def _chart_path(self, filename: str) -> str:
+        if self.chart_dir is None:
+            return filename
+        os.makedirs(self.chart_dir, exist_ok=True)
+        return os.path.join(self.chart_dir, filename)
+
+    def _render_chart(self, filename: str, render: Callable[[str], None], *chart_inputs: Any) -> None:
+        # Charts are keyed by everything they are drawn from, so unchanged charts are copied, not redrawn
+        path = self._chart_path(filename)
+        if self.memo_store is None:
+            render(path)
+        else:
+            self.memo_store.render_chart(MemoStore.fingerprint('chart', filename, *chart_inputs), path, render)
+
+    async def get_repos(self, progress_callback: Callable[[int, str], None],
+                        deadline: Optional[Deadline] = None) -> List[Repo]:
+        self.coverage = {}
+        try:
+            repo_data = await self.github_service.get_user_repos(self.username, deadline=deadline)
+        except DeadlineExceeded as e:
+            repo_data = e.partial
+        progress_callback(1, 'fetch repositories')  # Step 1: Fetched user repositories
         repos = [Repo.from_dict(repo) for repo in repo_data]
 
         # Fetch contributors for each repo
         for repo in repos:
+            if deadline is not None and deadline.expired:
+                self.coverage[repo.name] = SKIPPED
+                progress_callback(1, 'fetch contributors')
+                continue
             try:
-                contributors = await self.github_service.get_repo_contributors(self.username, repo.name)
+                contributors = await self.github_service.get_repo_contributors(self.username, repo.name, deadline=deadline)
                 repo.add_contributors(contributors)
+                self.coverage[repo.name] = COMPLETE
+            except DeadlineExceeded as e:
+                repo.add_contributors(e.partial)
+                self.coverage[repo.name] = TRUNCATED
             except Exception as e:
                 self.logger.warning(f"Error fetching contributors for {repo.name}: {str(e)}")
-            progress_callback(1)  # Step: Fetched contributors for a repo (or attempted to)
+            if self.row_writer is not None:
+                self.row_writer('repos', [repo.to_dict()])
+            progress_callback(1, 'fetch contributors')  # Step: Fetched contributors for a repo (or attempted to)
 
         return repos
 
-    def analyze_repos(self, repos: List[Repo], progress_callback: Callable[[int], None]) -> Dict[str, Any]:
-        top_repos = Repo.most_starred_and_forked(repos)
-        progress_callback(1)  # Step 2: Calculated top repos
+    def analyze_repos(self, repos: List[Repo], progress_callback: Callable[[int, str], None]) -> Dict[str, Any]:
+        # Every ranking below reads one index instead of sorting the repos again
+        self.repo_index = RepoIndex(repos)
+        top_repos = {'most_starred': self.repo_index.top('stars'), 'most_forked': self.repo_index.top('forks')}
+        progress_callback(1, 'top repositories')  # Step 2: Calculated top repos
 
-        recent_activity = Repo.most_recent_activity(repos)
-        progress_callback(1)  # Step 3: Calculated recent activity
+        recent_activity = self.repo_index.top('recency')
+        progress_callback(1, 'recent activity')  # Step 3: Calculated recent activity
 
         language_breakdown = Repo.get_language_breakdown(repos)
-        progress_callback(1)  # Step 4: Calculated language breakdown
-
-        total_contributor_count = Repo.get_total_contributor_count(repos)
-        progress_callback(1)  # Step: Calculated total contributor count
-
-          # Create a chart for repositories by contributor count
-        chart_utils.create_bar_chart(
-            [(repo.name, repo.contributor_count) for repo in sorted(repos, key=lambda r: r.contributor_count, reverse=True)[:10]],
-            "Top 10 Repositories by Contributor Count",
-            "Repository",
-            "Contributors",
-            "top_contributors.png"
+        progress_callback(1, 'language breakdown')  # Step 4: Calculated language breakdown
+
+        contributor_sketch = Repo.merge_contributor_sketches(repos)
+        total_contributor_count = (contributor_sketch.count() if CONTRIBUTOR_COUNT_APPROXIMATE
+                                   else Repo.get_total_contributor_count(repos))
+        progress_callback(1, 'total contributor count')  # Step: Calculated total contributor count
+
+        # Create a chart for repositories by contributor count
+        top_contributors = [(repo.name, repo.contributor_count) for repo in self.repo_index.top('contributors', 10)]
+        self._render_chart(
+            chart_utils.chart_filename("top_contributors"),
+            lambda path: chart_utils.create_bar_chart(
+                top_contributors, "Top 10 Repositories by Contributor Count", "Repository", "Contributors", path
+            ),
+            top_contributors
         )
-        progress_callback(1)  # Step: Created top contributors chart
+        progress_callback(1, 'top contributors chart')  # Step: Created top contributors chart
 
         # Create charts
-        chart_utils.create_bar_chart(
-            [(repo.name, repo.stars) for repo in top_repos['most_starred']],
-            "Top Starred Repositories",
-            "Repository",
-            "Stars",
-            "top_starred.png"
+        top_starred = [(repo.name, repo.stars) for repo in top_repos['most_starred']]
+        self._render_chart(
+            chart_utils.chart_filename("top_starred"),
+            lambda path: chart_utils.create_bar_chart(top_starred, "Top Starred Repositories", "Repository", "Stars", path),
+            top_starred
         )
-        progress_callback(1)  # Step 5: Created top starred chart
-
-        chart_utils.create_bar_chart(
-            [(repo.name, repo.forks) for repo in top_repos['most_forked']],
-            "Top Forked Repositories",
-            "Repository",
-            "Forks",
-            "top_forked.png"
+        progress_callback(1, 'top starred chart')  # Step 5: Created top starred chart
+
+        top_forked = [(repo.name, repo.forks) for repo in top_repos['most_forked']]
+        self._render_chart(
+            chart_utils.chart_filename("top_forked"),
+            lambda path: chart_utils.create_bar_chart(top_forked, "Top Forked Repositories", "Repository", "Forks", path),
+            top_forked
         )
-        progress_callback(1)  # Step 6: Created top forked chart
+        progress_callback(1, 'top forked chart')  # Step 6: Created top forked chart
 
-        Repo.create_language_breakdown_chart(repos, "language_breakdown.png")
-        progress_callback(1)  # Step 7: Created language breakdown chart
+        self._render_chart(
+            chart_utils.chart_filename("language_breakdown"),
+            lambda path: Repo.create_language_breakdown_chart(repos, path),
+            language_breakdown
+        )
+        progress_callback(1, 'language breakdown chart')  # Step 7: Created language breakdown chart
 
-        Repo.create_repo_size_distribution_chart(repos, "repo_size_distribution.png")
-        progress_callback(1)  # Step 8: Created repo size distribution chart
+        self._render_chart(
+            chart_utils.chart_filename("repo_size_distribution"),
+            lambda path: Repo.create_repo_size_distribution_chart(repos, path),
+            [repo.size for repo in repos]
+        )
+        progress_callback(1, 'repo size distribution chart')  # Step 8: Created repo size distribution chart
 
         return {
             "top_starred": top_repos['most_starred'],
@@ -82,15 +136,18 @@ class RepoController:
             "recent_activity": recent_activity,
             "language_breakdown": language_breakdown,
             "chart_files": [
-                "top_starred.png",
-                "top_forked.png",
-                "language_breakdown.png",
-                "repo_size_distribution.png",
-                "top_contributors.png"
+                self._chart_path(chart_utils.chart_filename("top_starred")),
+                self._chart_path(chart_utils.chart_filename("top_forked")),
+                self._chart_path(chart_utils.chart_filename("language_breakdown")),
+                self._chart_path(chart_utils.chart_filename("repo_size_distribution")),
+                self._chart_path(chart_utils.chart_filename("top_contributors"))
             ],
             "total_contributor_count": total_contributor_count,
+            "contributor_sketch": contributor_sketch,
+            "coverage": dict(self.coverage),
         }
 
-    async def run_analysis(self, progress_callback: Callable[[int], None] = lambda x: None) -> Dict[str, Any]:
-        repos = await self.get_repos(progress_callback)
+    async def run_analysis(self, progress_callback: Callable[[int, str], None] = lambda steps, phase: None,
+                           time_budget: Optional[float] = None) -> Dict[str, Any]:
+        repos = await self.get_repos(progress_callback, Deadline.from_budget(time_budget))
         return self.analyze_repos(repos, progress_callback)
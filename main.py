@@ -1,57 +1,253 @@
 # main.py
+import argparse
 import asyncio
+import cProfile
+import os
+import socket
+import sys
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from tqdm import tqdm
+from services.checkpoint_store import CheckpointStore
+from services.crawl_worker import QueuedGitHubService, run_worker, start_workers
 from services.github_service import GitHubService
+from services.job_queue import JobQueue
+from services.traffic_archive import TrafficRecorder, TrafficReplay
 from controllers.commit_controller import CommitController
 from controllers.pr_controller import PRController
 from controllers.repo_controller import RepoController
+from models.commit import AUTHOR_TIMEZONE
 from views.commit_view import CommitView
 from views.pr_view import PRView
 from views.repo_view import RepoView
-from config import GITHUB_TOKEN, GITHUB_USERNAME
+from views.profile_view import ProfileView
+from views.token_view import TokenView
+from views.report_writer import REPORT_FORMATS, STDOUT, create_report_writer
+from server import serve
+from utils.deadline import Deadline
+from utils import chart_utils
+from utils.memo_store import MemoStore
+from utils.profiler import LoopStallMonitor, PhaseProfiler
+from config import (ACTIVITY_TIMEZONE, CHART_BACKEND, CHECKPOINT_PATH, COMMIT_SAMPLE_PAGES, GITHUB_TOKENS, GITHUB_USERNAME,
+                    JOB_QUEUE_PATH, JOB_TIMEOUT, PROFILE_STALL_THRESHOLD, SERVER_HOST, SERVER_PORT)
 
 
-async def run_analysis_with_progress(controller, total_steps):
-    progress_bar = tqdm(total=total_steps, desc=f"{controller.__class__.__name__}")
-    results = await controller.run_analysis(progress_callback=progress_bar.update)
+def timezone_name(value: str) -> str:
+    if value == AUTHOR_TIMEZONE:
+        return value
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise argparse.ArgumentTypeError(f"unknown timezone '{value}' (use an IANA name like Europe/Berlin, or 'author')")
+    return value
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyze a GitHub account's repositories, commits and pull requests.")
+    parser.add_argument('--serve', action='store_true', help="Run as a long-lived HTTP/JSON analytics server")
+    parser.add_argument('--host', default=SERVER_HOST, help="Host to bind in server mode")
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help="Port to bind in server mode")
+    parser.add_argument('--time-budget', type=float, default=None, metavar='SECONDS',
+                        help="Stop fetching after this many seconds and report on the data collected so far")
+    parser.add_argument('--use-stats', action='store_true',
+                        help="Derive commit analytics from GitHub's precomputed statistics endpoints")
+    parser.add_argument('--exact-history', action='store_true',
+                        help="With --use-stats, crawl repos whose history is older than the 52 weeks the statistics cover")
+    parser.add_argument('--sample-pages', type=int, nargs='?', const=COMMIT_SAMPLE_PAGES, default=None, metavar='N',
+                        help=f"Estimate commit analytics from N pages spread across each larger repo's history "
+                             f"(default {COMMIT_SAMPLE_PAGES}) instead of crawling every commit")
+    parser.add_argument('--count-prs', action='store_true',
+                        help="Only count open and closed pull requests (no time-to-close analytics)")
+    parser.add_argument('--per-repo-prs', action='store_true',
+                        help="With --count-prs, also count pull requests per repository (two requests per repository)")
+    parser.add_argument('--memo-dir', default=None, metavar='DIR',
+                        help="Reuse analyses and charts stored in DIR when their inputs have not changed")
+    parser.add_argument('--chart-backend', choices=sorted(chart_utils.CHART_BACKENDS), default=CHART_BACKEND,
+                        help="Render charts as PNG with matplotlib or as SVG without extra dependencies")
+    parser.add_argument('--timezone', type=timezone_name, default=ACTIVITY_TIMEZONE,
+                        help="IANA timezone for the commit activity heatmap, or 'author' for each commit's own "
+                             "offset (GitHub reports commit times in UTC, so this matches UTC for fetched commits)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted crawl from its last checkpoint instead of starting over")
+    parser.add_argument('--checkpoint-db', default=None, metavar='PATH',
+                        help=f"Checkpoint fetched data here so the crawl can be resumed (default with --resume: "
+                             f"{CHECKPOINT_PATH}); runs without either option don't checkpoint")
+    parser.add_argument('--workers', type=int, default=0, metavar='N',
+                        help="Fetch and parse per-repo data in N worker processes")
+    parser.add_argument('--worker', action='store_true',
+                        help="Only run a worker, taking jobs from --queue-db (e.g. on another host sharing the file)")
+    parser.add_argument('--queue-db', default=JOB_QUEUE_PATH, metavar='PATH',
+                        help="Job queue shared by the coordinator and its workers")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time each analysis phase (controllers then run one at a time) and report loop stalls")
+    parser.add_argument('--profile-output', default=None, metavar='PATH',
+                        help="With --profile, also write cProfile statistics to PATH")
+    traffic = parser.add_mutually_exclusive_group()
+    traffic.add_argument('--record', default=None, metavar='PATH',
+                         help="Append every API response to a compressed archive at PATH")
+    traffic.add_argument('--replay', default=None, metavar='PATH',
+                         help="Serve the whole run from an archive made with --record, without the network")
+    parser.add_argument('--report-format', choices=REPORT_FORMATS, default=None,
+                        help="Also stream the analyses and raw per-repo, per-commit and per-PR rows in this format")
+    parser.add_argument('--report-output', default=STDOUT, metavar='PATH',
+                        help="Where --report-format writes ('-' for stdout, which replaces the text report); "
+                             "CSV writes PATH-<table>.csv files")
+    args = parser.parse_args()
+    if args.sample_pages is not None and (args.use_stats or args.sample_pages < 2):
+        parser.error("--sample-pages needs at least 2 pages and can't be combined with --use-stats")
+    if args.per_repo_prs and not args.count_prs:
+        parser.error("--per-repo-prs needs --count-prs")
+    if args.report_format == 'csv' and args.report_output == STDOUT:
+        parser.error("--report-format csv writes one file per table and needs --report-output")
+    if (args.record or args.replay) and (args.workers or args.worker):
+        parser.error("--record and --replay cover this process's requests only and can't be used with workers")
+    return args
+
+
+async def run_analysis_with_progress(controller, total_steps, time_budget=None, profiler=None, report_writer=None,
+                                     section=None):
+    name = controller.__class__.__name__
+    progress_bar = tqdm(total=total_steps, desc=name)
+    if profiler is None:
+        progress_callback = lambda steps, phase: progress_bar.update(steps)
+    else:
+        progress_callback = profiler.track(name, progress_bar.update)
+    results = await controller.run_analysis(progress_callback=progress_callback, time_budget=time_budget)
+    if profiler is not None:
+        profiler.finish(name)
     progress_bar.close()
+    if report_writer is not None:
+        # Written as soon as this controller is done, not after the slowest one
+        report_writer.write_analysis(section, results)
     return results
 
 
-async def main():
-    if not GITHUB_TOKEN or not GITHUB_USERNAME:
+async def main(args: argparse.Namespace):
+    if not (GITHUB_TOKENS or args.replay) or not (GITHUB_USERNAME or args.serve or args.worker):
         print("Error: GitHub token or username not found in environment variables.")
         print("Please ensure you have set GITHUB_TOKEN and GITHUB_USERNAME in your .env file.")
         return
 
-    github_service = GitHubService(GITHUB_TOKEN)
-    commit_controller = CommitController(GITHUB_USERNAME, github_service)
-    pr_controller = PRController(GITHUB_USERNAME, github_service)
-    repo_controller = RepoController(GITHUB_USERNAME, github_service)
+    chart_utils.set_backend(args.chart_backend)
+    if args.worker:
+        processed = await run_worker(args.queue_db, f"{socket.gethostname()}-{os.getpid()}", GITHUB_TOKENS)
+        print(f"Worker finished after {processed} jobs.")
+        return
+    if args.serve:
+        await serve(GitHubService(GITHUB_TOKENS), args.host, args.port, default_username=GITHUB_USERNAME)
+        return
+
+    # Status messages go to stderr when stdout carries the machine-readable report
+    console = sys.stderr if args.report_format and args.report_output == STDOUT else sys.stdout
+
+    # Checkpointing writes every page to SQLite, so only runs that may need resuming pay for it
+    checkpoint_store = None
+    if args.checkpoint_db or args.resume:
+        checkpoint_store = CheckpointStore(args.checkpoint_db or CHECKPOINT_PATH)
+        if args.resume:
+            print(f"Resuming crawl: {checkpoint_store.completed_count()} fetches already complete.", file=console)
+        else:
+            checkpoint_store.clear()
+    job_queue = None
+    workers = []
+    if args.workers:
+        # Jobs finished before an interrupted run are reused on --resume, like checkpoints
+        job_queue = JobQueue(args.queue_db, job_timeout=JOB_TIMEOUT)
+        if not args.resume:
+            job_queue.clear()
+        job_queue.open_queue()
+        workers = start_workers(args.queue_db, args.workers)
+        github_service = QueuedGitHubService(GITHUB_TOKENS, job_queue, checkpoint_store=checkpoint_store)
+    else:
+        traffic_recorder = TrafficRecorder(args.record) if args.record else None
+        traffic_replay = TrafficReplay(args.replay) if args.replay else None
+        # Replayed runs never send a request, so they don't need a token
+        github_service = GitHubService(GITHUB_TOKENS or ["replay"], checkpoint_store=checkpoint_store,
+                                       traffic_recorder=traffic_recorder, traffic_replay=traffic_replay)
+
+    memo_store = MemoStore(args.memo_dir) if args.memo_dir else None
+    report_writer = create_report_writer(args.report_format, args.report_output) if args.report_format else None
+    row_writer = report_writer.write_rows if report_writer is not None else None
+    commit_controller = CommitController(GITHUB_USERNAME, github_service,
+                                         use_stats_endpoints=args.use_stats, exact_history=args.exact_history,
+                                         memo_store=memo_store, timezone=args.timezone, chart_dir=os.curdir,
+                                         row_writer=row_writer, sample_pages=args.sample_pages)
+    pr_controller = PRController(GITHUB_USERNAME, github_service, count_only=args.count_prs,
+                                 per_repo_counts=args.per_repo_prs, memo_store=memo_store, row_writer=row_writer)
+    repo_controller = RepoController(GITHUB_USERNAME, github_service, memo_store=memo_store, row_writer=row_writer)
 
     commit_view = CommitView()
     pr_view = PRView()
     repo_view = RepoView()
 
+    deadline = Deadline.from_budget(args.time_budget)
+    stall_monitor = LoopStallMonitor(PROFILE_STALL_THRESHOLD) if args.profile else None
+    profiler = PhaseProfiler(stall_monitor) if args.profile else None
+    cprofile = cProfile.Profile() if args.profile and args.profile_output else None
+
     try:
         # Get repository count first
         repo_count = await github_service.get_user_repo_count(GITHUB_USERNAME)
 
-        # Run analyses concurrently with estimated total steps
-        analyses = await asyncio.gather(
-            run_analysis_with_progress(commit_controller, total_steps=5 + repo_count),
-            run_analysis_with_progress(pr_controller, total_steps=4 + repo_count),
-            run_analysis_with_progress(repo_controller, total_steps=8)
-        )
+        runs = [
+            (commit_controller, 6 + repo_count, 'commits'),
+            (pr_controller, (3 if args.per_repo_prs else 2) if args.count_prs else 5 + repo_count, 'pull_requests'),
+            (repo_controller, 8, 'repos'),
+        ]
+        if profiler is None:
+            # Run analyses concurrently with estimated total steps; they share what is left of the time budget
+            time_budget = deadline.remaining() if deadline else None
+            analyses = await asyncio.gather(*(run_analysis_with_progress(controller, total_steps, time_budget,
+                                                                         report_writer=report_writer, section=section)
+                                              for controller, total_steps, section in runs))
+        else:
+            # One at a time, so CPU time and stalls are charged to the phase that caused them
+            stall_monitor.start()
+            if cprofile is not None:
+                cprofile.enable()
+            analyses = []
+            try:
+                for controller, total_steps, section in runs:
+                    analyses.append(await run_analysis_with_progress(
+                        controller, total_steps, deadline.remaining() if deadline else None, profiler, report_writer,
+                        section))
+            finally:
+                # Statistics of a run that failed or was interrupted are still written
+                if cprofile is not None:
+                    cprofile.disable()
+                    cprofile.dump_stats(args.profile_output)
+                stall_monitor.stop()
 
         commit_analysis_results, pr_analysis_results, repo_analysis_results = analyses
 
-        # Display results
-        commit_view.display_analysis(commit_analysis_results)
-        pr_view.display_analysis(pr_analysis_results)
-        repo_view.display_analysis(repo_analysis_results)
+        if report_writer is not None:
+            report_writer.write_analysis('tokens', {'tokens': github_service.get_token_utilization()})
+
+        # Display results, unless stdout carries the machine-readable report
+        if report_writer is None or args.report_output != STDOUT:
+            commit_view.display_analysis(commit_analysis_results)
+            pr_view.display_analysis(pr_analysis_results)
+            repo_view.display_analysis(repo_analysis_results)
+            TokenView.display_utilization(github_service.get_token_utilization())
+        if profiler is not None:
+            ProfileView.display_profile(profiler.report(), stall_monitor, args.profile_output, console)
     except Exception as e:
-        print(f"An error occurred during analysis: {str(e)}")
+        print(f"An error occurred during analysis: {str(e)}", file=console)
+    finally:
+        await github_service.close()
+        if checkpoint_store is not None:
+            checkpoint_store.close()
+        if report_writer is not None:
+            report_writer.close()
+        if github_service.traffic_recorder is not None:
+            github_service.traffic_recorder.close()
+        if job_queue is not None:
+            job_queue.close_queue()
+            for worker in workers:
+                # Workers exit once the queue is drained; ones still busy with jobs nobody awaits are stopped
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            job_queue.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(parse_args()))
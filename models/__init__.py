@@ -1,6 +1,6 @@
 # models/__init__.py
 from .repo import Repo
-from .commit import Commit
+from .commit import Commit, CommitActivity
 from .pull_request import PullRequest
 
-__all__ = ['Repo', 'Commit', 'PullRequest']
+__all__ = ['Repo', 'Commit', 'CommitActivity', 'PullRequest']
@@ -1,8 +1,25 @@
 # models/commit.py
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
-from dataclasses import dataclass
-from typing import List, Dict
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, List, Dict, Iterable, Optional, Tuple
+import numpy as np
+from config import ACTIVITY_TIMEZONE, AUTHOR_SKETCH_CAPACITY, TOP_AUTHORS_COUNT
+from utils import chart_utils
+from utils.heavy_hitters import SpaceSaving
+from utils.sampling import ratio_estimate
+
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# The statistics endpoints number days from Sunday
+STATS_WEEKDAYS = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+# Activity heatmaps use each commit's own UTC offset instead of one timezone. The REST API reports commit
+# dates in UTC (with a Z suffix), so for fetched commits this is the same as UTC; it only differs for
+# commits built from timestamps that carry an offset.
+AUTHOR_TIMEZONE = 'author'
+# Every timezone transition falls on a quarter hour (UTC)
+_OFFSET_RESOLUTION = 900
 
 
 @dataclass
@@ -11,19 +28,25 @@ class Commit:
     author: str
     date: datetime
     message: str
+    # Seconds east of UTC the author's timestamp was recorded with; date itself is always UTC
+    utc_offset: int = 0
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Commit':
+        authored = datetime.fromisoformat(data['commit']['author']['date'].replace('Z', '+00:00'))
+        offset = authored.utcoffset()
         return cls(
             sha=data['sha'],
             author=data['commit']['author']['name'],
-            date=datetime.strptime(data['commit']['author']['date'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=ZoneInfo("UTC")),
-            message=data['commit']['message']
+            # REST dates are already UTC; converting those anyway would allocate a datetime per commit
+            date=authored.astimezone(ZoneInfo("UTC")) if offset else authored,
+            message=data['commit']['message'],
+            utc_offset=int(offset.total_seconds()) if offset else 0
         )
 
     @staticmethod
     def get_commit_time_distribution(commits: List['Commit']) -> Dict[str, int]:
-        day_counts = {day: 0 for day in ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']}
+        day_counts = {day: 0 for day in WEEKDAYS}
         for commit in commits:
             day_name = commit.date.strftime('%A')
             day_counts[day_name] += 1
@@ -33,17 +56,33 @@ class Commit:
     def get_average_commit_frequency(commits: List['Commit']) -> float:
         if not commits:
             return 0
-        commit_dates = [commit.date.date() for commit in commits]
-        first_commit = min(commit_dates)
-        last_commit = max(commit_dates)
-        total_days = (last_commit - first_commit).days + 1
-        return len(commits) / total_days
+        return Commit.get_average_frequency_from_daily_counts(Commit.get_daily_counts(commits))
 
     @staticmethod
     def get_longest_streak(commits: List['Commit']) -> int:
-        if not commits:
+        return Commit.get_longest_streak_from_dates(commit.date.date() for commit in commits)
+
+    @staticmethod
+    def get_daily_counts(commits: List['Commit']) -> Dict[date, int]:
+        daily_counts: Dict[date, int] = {}
+        for commit in commits:
+            day = commit.date.date()
+            daily_counts[day] = daily_counts.get(day, 0) + 1
+        return daily_counts
+
+    @staticmethod
+    def get_average_frequency_from_daily_counts(daily_counts: Dict[date, int]) -> float:
+        active_days = [day for day, count in daily_counts.items() if count]
+        if not active_days:
+            return 0
+        total_days = (max(active_days) - min(active_days)).days + 1
+        return sum(daily_counts.values()) / total_days
+
+    @staticmethod
+    def get_longest_streak_from_dates(dates: Iterable[date]) -> int:
+        commit_dates = sorted(set(dates))
+        if not commit_dates:
             return 0
-        commit_dates = sorted(set(commit.date.date() for commit in commits))
         longest_streak = current_streak = 1
         for i in range(1, len(commit_dates)):
             if (commit_dates[i] - commit_dates[i-1]) == timedelta(days=1):
@@ -52,3 +91,163 @@ class Commit:
             else:
                 current_streak = 1
         return longest_streak
+
+    @staticmethod
+    def get_time_distribution_from_punch_card(punch_card: List[List[int]]) -> Dict[str, int]:
+        day_counts = {day: 0 for day in WEEKDAYS}
+        for day, hour, count in punch_card:
+            day_counts[STATS_WEEKDAYS[day]] += count
+        return day_counts
+
+    @staticmethod
+    def get_daily_counts_from_commit_activity(commit_activity: List[Dict[str, Any]]) -> Dict[date, int]:
+        daily_counts: Dict[date, int] = {}
+        for week in commit_activity:
+            week_start = datetime.fromtimestamp(week['week'], ZoneInfo("UTC")).date()
+            for offset, count in enumerate(week['days']):
+                if count:
+                    day = week_start + timedelta(days=offset)
+                    daily_counts[day] = daily_counts.get(day, 0) + count
+        return daily_counts
+
+    @staticmethod
+    def get_timestamps(commits: List['Commit']) -> Tuple[np.ndarray, np.ndarray]:
+        # Epoch seconds and the UTC offset (in seconds) each timestamp was recorded with
+        timestamps = np.fromiter((int(commit.date.timestamp()) for commit in commits), dtype=np.int64, count=len(commits))
+        offsets = np.fromiter((commit.utc_offset for commit in commits), dtype=np.int64, count=len(commits))
+        return timestamps, offsets
+
+    @staticmethod
+    def get_zone_offsets(timestamps: np.ndarray, timezone: str) -> np.ndarray:
+        # Offsets only change at transitions, so look each distinct quarter hour up once
+        zone = ZoneInfo(timezone)
+        buckets, inverse = np.unique(timestamps // _OFFSET_RESOLUTION, return_inverse=True)
+        bucket_offsets = np.fromiter(
+            (int(datetime.fromtimestamp(int(bucket) * _OFFSET_RESOLUTION, zone).utcoffset().total_seconds())
+             for bucket in buckets),
+            dtype=np.int64, count=len(buckets))
+        return bucket_offsets[inverse].reshape(timestamps.shape)
+
+    @staticmethod
+    def get_activity_heatmap(timestamps: np.ndarray, offsets: Optional[np.ndarray] = None) -> np.ndarray:
+        # 7x24 commit counts, Monday first, from epoch seconds shifted to local time
+        local = timestamps if offsets is None else timestamps + offsets
+        days, seconds = np.divmod(local, 86400)
+        weekdays = (days + 3) % 7  # 1970-01-01 was a Thursday
+        return np.bincount(weekdays * 24 + seconds // 3600, minlength=7 * 24).reshape(7, 24)
+
+    @staticmethod
+    def get_commit_activity_heatmap(commits: List['Commit'], timezone: str = ACTIVITY_TIMEZONE) -> np.ndarray:
+        timestamps, offsets = Commit.get_timestamps(commits)
+        if timezone != AUTHOR_TIMEZONE:
+            offsets = Commit.get_zone_offsets(timestamps, timezone)
+        return Commit.get_activity_heatmap(timestamps, offsets)
+
+    @staticmethod
+    def get_heatmap_from_punch_card(punch_card: List[List[int]], timezone: str = ACTIVITY_TIMEZONE) -> np.ndarray:
+        utc = np.zeros(7 * 24, dtype=np.int64)
+        for day, hour, count in punch_card:
+            utc[((day - 1) % 7) * 24 + hour] += count  # Punch cards number days from Sunday
+        if timezone == AUTHOR_TIMEZONE:
+            return utc.reshape(7, 24)  # Punch cards are aggregated in UTC; per-commit offsets are gone
+        # Punch cards only have hours, so the zone's current offset is applied to the whole history
+        offset = datetime.now(ZoneInfo(timezone)).utcoffset().total_seconds()
+        hours, fraction = divmod(offset / 3600, 1)
+        shifted = np.roll(utc, int(hours))
+        # In half- and quarter-hour zones each UTC hour spans two local hours, so its count is split between them
+        later = np.rint(shifted * fraction).astype(np.int64)
+        return (shifted - later + np.roll(later, 1)).reshape(7, 24)
+
+    @staticmethod
+    def create_activity_heatmap_chart(heatmap: List[List[int]], timezone: str, filename: str):
+        chart_utils.create_heatmap(heatmap, WEEKDAYS, [str(hour) for hour in range(24)],
+                                   f'Commit Activity by Weekday and Hour ({timezone})', filename)
+
+    @staticmethod
+    def get_author_sketch(commits: List['Commit'], capacity: int = AUTHOR_SKETCH_CAPACITY) -> SpaceSaving:
+        sketch = SpaceSaving(capacity)
+        for commit in commits:
+            sketch.add(commit.author)
+        return sketch
+
+    @staticmethod
+    def get_scaled_author_sketch(commits: List['Commit'], weight: float,
+                                 capacity: int = AUTHOR_SKETCH_CAPACITY) -> SpaceSaving:
+        # Each sampled commit stands for `weight` commits of the whole history
+        sketch = SpaceSaving(capacity)
+        for author, count in Counter(commit.author for commit in commits).items():
+            sketch.add(author, max(round(count * weight), 1))
+        return sketch
+
+    @staticmethod
+    def get_top_authors(commits: List['Commit'], top_n: int = TOP_AUTHORS_COUNT) -> List[Tuple[str, int]]:
+        return Commit.get_author_sketch(commits).top(top_n)
+
+    @staticmethod
+    def get_author_sketch_from_contributor_stats(contributor_stats: List[Dict[str, Any]],
+                                                 capacity: int = AUTHOR_SKETCH_CAPACITY) -> SpaceSaving:
+        sketch = SpaceSaving(capacity)
+        for contributor in contributor_stats:
+            if contributor.get('author') and contributor['total']:
+                sketch.add(contributor['author']['login'], contributor['total'])
+        return sketch
+
+
+@dataclass
+class CommitActivity:
+    """Commit counts by weekday, by day and by weekday and hour, built from crawled commits or statistics endpoints."""
+    time_distribution: Dict[str, int] = field(default_factory=lambda: {day: 0 for day in WEEKDAYS})
+    daily_counts: Dict[date, int] = field(default_factory=dict)
+    timezone: str = ACTIVITY_TIMEZONE
+    heatmap: List[List[int]] = field(default_factory=lambda: [[0] * 24 for _ in WEEKDAYS])
+
+    def _add_heatmap(self, heatmap: np.ndarray) -> None:
+        self.heatmap = (np.array(self.heatmap, dtype=np.int64) + heatmap).tolist()
+
+    def _add_daily_counts(self, daily_counts: Dict[date, int]) -> None:
+        for day, count in daily_counts.items():
+            self.daily_counts[day] = self.daily_counts.get(day, 0) + count
+
+    def add_commits(self, commits: List[Commit]) -> None:
+        for day, count in Commit.get_commit_time_distribution(commits).items():
+            self.time_distribution[day] += count
+        self._add_daily_counts(Commit.get_daily_counts(commits))
+        self._add_heatmap(Commit.get_commit_activity_heatmap(commits, self.timezone))
+
+    def add_stats(self, punch_card: List[List[int]], commit_activity: List[Dict[str, Any]]) -> None:
+        for day, count in Commit.get_time_distribution_from_punch_card(punch_card).items():
+            self.time_distribution[day] += count
+        self._add_daily_counts(Commit.get_daily_counts_from_commit_activity(commit_activity))
+        self._add_heatmap(Commit.get_heatmap_from_punch_card(punch_card, self.timezone))
+
+
+@dataclass
+class CommitSample:
+    """Whole pages of commits spread across a repository's history, standing in for all ``total_commits``."""
+    total_commits: int
+    page_count: int
+    pages: List[List[Commit]]
+
+    @property
+    def commits(self) -> List[Commit]:
+        return [commit for page in self.pages for commit in page]
+
+    @property
+    def sampled_count(self) -> int:
+        return sum(len(page) for page in self.pages)
+
+    @property
+    def weight(self) -> float:
+        return self.total_commits / self.sampled_count if self.sampled_count else 0.0
+
+    def estimate_time_distribution(self) -> Dict[str, Tuple[float, float]]:
+        # Estimated commits per weekday over the whole history, with the variance of each estimate
+        sizes = [len(page) for page in self.pages]
+        distributions = [Commit.get_commit_time_distribution(page) for page in self.pages]
+        return {
+            day: ratio_estimate(self.total_commits, self.page_count, [counts[day] for counts in distributions], sizes)
+            for day in WEEKDAYS
+        }
+
+    def estimate_activity_heatmap(self, timezone: str = ACTIVITY_TIMEZONE) -> np.ndarray:
+        return Commit.get_commit_activity_heatmap(self.commits, timezone) * self.weight
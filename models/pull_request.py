@@ -1,9 +1,12 @@
 # models/pull_request.py
 import asyncio
 import aiohttp
-from typing import Dict, Union, List, Tuple, Set
+from typing import Dict, Union, List, Tuple, Set, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from config import PR_LATENCY_SKETCH_ACCURACY, CONTRIBUTOR_COUNT_ERROR_RATE, CONTRIBUTOR_EXACT_THRESHOLD
+from utils.hyperloglog import HyperLogLog
+from utils.quantile_sketch import QuantileSketch
 
 
 @dataclass
@@ -24,6 +27,12 @@ class PullRequest:
             closed_at=datetime.strptime(data['closed_at'], '%Y-%m-%dT%H:%M:%SZ') if data['closed_at'] else None
         )
 
+    @property
+    def time_to_close_hours(self) -> Optional[float]:
+        if self.closed_at is None:
+            return None
+        return max((self.closed_at - self.created_at).total_seconds(), 0) / 3600
+
     @classmethod
     async def create_from_api(cls, data: Dict) -> 'PullRequest':
         return cls.from_dict(data)
@@ -38,17 +47,39 @@ class PullRequest:
                 stats['closed'] += 1
         return stats
 
+    @staticmethod
+    def get_time_to_close_sketch(pull_requests: List['PullRequest'],
+                                 relative_accuracy: float = PR_LATENCY_SKETCH_ACCURACY) -> QuantileSketch:
+        sketch = QuantileSketch(relative_accuracy)
+        for pr in pull_requests:
+            hours = pr.time_to_close_hours
+            if hours is not None:
+                sketch.add(hours)
+        return sketch
+
+    @staticmethod
+    def summarize_time_to_close(sketch: QuantileSketch) -> Dict[str, Optional[float]]:
+        return {
+            'count': sketch.count,
+            'p50': sketch.quantile(0.5),
+            'p90': sketch.quantile(0.9),
+            'p99': sketch.quantile(0.99)
+        }
+
     @classmethod
     async def get_pull_requests_stats(cls, client, session: aiohttp.ClientSession, username: str, repo_name: str) -> Dict[str, int]:
         pull_requests = await client.get_pull_requests_async(session, username, repo_name)
         return cls.get_pr_stats([cls.from_dict(pr) for pr in pull_requests])
 
     @staticmethod
-    async def get_contributor_count(client, username: str, repo_names: Union[str, List[str]], verbose: bool = False) -> Tuple[int, int]:
+    async def get_contributor_count(client, username: str, repo_names: Union[str, List[str]], verbose: bool = False,
+                                    approximate: bool = False) -> Tuple[int, int]:
         if isinstance(repo_names, str):
             repo_names = [repo_names]
 
-        all_contributors: Set[str] = set()
+        all_contributors: Union[Set[str], HyperLogLog] = (
+            HyperLogLog(CONTRIBUTOR_COUNT_ERROR_RATE, CONTRIBUTOR_EXACT_THRESHOLD) if approximate else set()
+        )
         repos_without_contributors = 0
 
         async with aiohttp.ClientSession() as session:
@@ -60,4 +91,5 @@ class PullRequest:
                 repos_without_contributors += 1
             all_contributors.update(contributor['login'] for contributor in contributors)
 
-        return len(all_contributors), repos_without_contributors
+        count = all_contributors.count() if approximate else len(all_contributors)
+        return count, repos_without_contributors
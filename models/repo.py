@@ -1,9 +1,11 @@
 # models/repo.py
 from collections import Counter
-import matplotlib.pyplot as plt
 from datetime import datetime
 from dataclasses import dataclass
 from typing import Any, List, Dict
+from config import CONTRIBUTOR_COUNT_ERROR_RATE, CONTRIBUTOR_EXACT_THRESHOLD
+from utils import chart_utils
+from utils.hyperloglog import HyperLogLog
 
 
 class Repo:
@@ -15,6 +17,7 @@ class Repo:
         self.size = size
         self.updated_at = updated_at
         self.contributors: List[Dict[str, Any]] = []
+        self.contributor_sketch = HyperLogLog(CONTRIBUTOR_COUNT_ERROR_RATE, CONTRIBUTOR_EXACT_THRESHOLD)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Repo':
@@ -29,6 +32,22 @@ class Repo:
 
     def add_contributors(self, contributors: List[Dict[str, Any]]) -> None:
         self.contributors = contributors
+        self.contributor_sketch = HyperLogLog.from_iterable(
+            (contributor['login'] for contributor in contributors),
+            CONTRIBUTOR_COUNT_ERROR_RATE,
+            CONTRIBUTOR_EXACT_THRESHOLD
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'stars': self.stars,
+            'forks': self.forks,
+            'language': self.language,
+            'size': self.size,
+            'updated_at': self.updated_at.isoformat(),
+            'contributor_count': self.contributor_count
+        }
 
     @property
     def contributor_count(self) -> int:
@@ -59,25 +78,27 @@ class Repo:
     @staticmethod
     def create_language_breakdown_chart(repos: List['Repo'], filename: str):
         language_breakdown = Repo.get_language_breakdown(repos)
-        plt.figure(figsize=(10, 6))
-        plt.pie(language_breakdown.values(), labels=language_breakdown.keys(), autopct='%1.1f%%')
-        plt.title('Repository Language Breakdown')
-        plt.savefig(filename)
-        plt.close()
+        chart_utils.create_pie_chart(list(language_breakdown.keys()), list(language_breakdown.values()),
+                                     'Repository Language Breakdown', filename)
 
     @staticmethod
     def create_repo_size_distribution_chart(repos: List['Repo'], filename: str):
         sizes = [repo.size for repo in repos]
-        plt.figure(figsize=(10, 6))
-        plt.hist(sizes, bins=20)
-        plt.title('Distribution of Repository Sizes')
-        plt.xlabel('Size (KB)')
-        plt.ylabel('Number of Repositories')
-        plt.savefig(filename)
-        plt.close()
+        chart_utils.create_histogram(sizes, 20, 'Distribution of Repository Sizes', 'Size (KB)',
+                                     'Number of Repositories', filename)
 
     @staticmethod
-    def get_total_contributor_count(repos: List['Repo']) -> int:
+    def merge_contributor_sketches(repos: List['Repo']) -> HyperLogLog:
+        merged = HyperLogLog(CONTRIBUTOR_COUNT_ERROR_RATE, CONTRIBUTOR_EXACT_THRESHOLD)
+        for repo in repos:
+            merged.merge(repo.contributor_sketch)
+        return merged
+
+    @staticmethod
+    def get_total_contributor_count(repos: List['Repo'], approximate: bool = False) -> int:
+        if approximate:
+            return Repo.merge_contributor_sketches(repos).count()
+
         unique_contributors = set()
         for repo in repos:
             unique_contributors.update(contributor['login'] for contributor in repo.contributors)
@@ -0,0 +1,141 @@
+# models/repo_index.py
+import math
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from models.repo import Repo
+
+_EPOCH = datetime(1970, 1, 1)
+
+# How each metric reads a repo; higher ranks first
+METRICS: Dict[str, Callable[[Repo], float]] = {
+    'stars': lambda repo: repo.stars,
+    'forks': lambda repo: repo.forks,
+    'size': lambda repo: repo.size,
+    'contributors': lambda repo: repo.contributor_count,
+    'recency': lambda repo: (repo.updated_at - _EPOCH).total_seconds(),
+}
+
+
+class _Ordering:
+    # Keys are (-value, seq), so the best repo comes first and ties keep insertion order like a stable sort
+    def __init__(self, keys: Iterable[Tuple[float, int]] = ()):
+        self.keys: List[Tuple[float, int]] = sorted(keys)
+
+    def add(self, key: Tuple[float, int]) -> None:
+        self.keys.insert(bisect_left(self.keys, key), key)
+
+    def remove(self, key: Tuple[float, int]) -> None:
+        del self.keys[bisect_left(self.keys, key)]
+
+    def rank_counts(self, value: float) -> Tuple[int, int]:
+        # (repos ranked higher, repos tied) for a metric value; seqs are never negative or infinite
+        higher = bisect_left(self.keys, (-value, -1))
+        return higher, bisect_right(self.keys, (-value, math.inf)) - higher
+
+
+class RepoIndex:
+    """Repos kept ordered by every metric, overall and per language, for repeated top-N and rank queries.
+
+    Each ordering is sorted once up front and then maintained with bisection as repos are added, changed
+    or removed, so no query sorts the repo list again.
+    """
+
+    def __init__(self, repos: Iterable[Repo] = ()):
+        self._repos: Dict[int, Repo] = {}
+        self._seqs: Dict[str, int] = {}
+        # Each repo's (-value, seq) key per metric, shared by its overall and language orderings
+        self._keys: Dict[int, Dict[str, Tuple[float, int]]] = {}
+        # The language each repo was filed under, so it can be found again after the repo changes.
+        # None is the overall scope, so repos without a language are filed as 'Unknown' like Repo.from_dict does.
+        self._languages: Dict[int, str] = {}
+        self._next_seq = 0
+        for repo in repos:
+            self._register(repo)
+        by_language: Dict[Optional[str], List[int]] = {None: list(self._repos)}
+        for seq, language in self._languages.items():
+            by_language.setdefault(language, []).append(seq)
+        self._orderings: Dict[Optional[str], Dict[str, _Ordering]] = {
+            language: {metric: _Ordering(self._keys[seq][metric] for seq in seqs) for metric in METRICS}
+            for language, seqs in by_language.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._repos)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._seqs
+
+    def get(self, name: str) -> Repo:
+        return self._repos[self._seqs[name]]
+
+    def _register(self, repo: Repo, seq: Optional[int] = None) -> int:
+        if repo.name in self._seqs:
+            raise ValueError(f"Repository {repo.name} is already indexed")
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        self._seqs[repo.name] = seq
+        self._repos[seq] = repo
+        self._keys[seq] = {metric: (-read(repo), seq) for metric, read in METRICS.items()}
+        self._languages[seq] = repo.language or 'Unknown'
+        return seq
+
+    def _scopes(self, language: str) -> List[Dict[str, _Ordering]]:
+        return [self._orderings.setdefault(None, {metric: _Ordering() for metric in METRICS}),
+                self._orderings.setdefault(language, {metric: _Ordering() for metric in METRICS})]
+
+    def add(self, repo: Repo, seq: Optional[int] = None) -> None:
+        seq = self._register(repo, seq)
+        for orderings in self._scopes(self._languages[seq]):
+            for metric, ordering in orderings.items():
+                ordering.add(self._keys[seq][metric])
+
+    def remove(self, name: str) -> Repo:
+        seq = self._seqs.pop(name)
+        repo = self._repos.pop(seq)
+        keys = self._keys.pop(seq)
+        language = self._languages.pop(seq)
+        for orderings in (self._orderings[None], self._orderings[language]):
+            for metric, ordering in orderings.items():
+                ordering.remove(keys[metric])
+        if not self._orderings[language]['stars'].keys:
+            del self._orderings[language]
+        return repo
+
+    def update(self, repo: Repo) -> None:
+        # Re-files a repo whose fields (stars, contributors, language, ...) changed; it keeps its place among ties
+        seq = self._seqs.get(repo.name)
+        if seq is not None:
+            self.remove(repo.name)
+        self.add(repo, seq)
+
+    def iter_ranked(self, metric: str, language: Optional[str] = None) -> Iterator[Repo]:
+        orderings = self._orderings.get(language)
+        if orderings is None:
+            return iter(())
+        return (self._repos[seq] for _, seq in orderings[metric].keys)
+
+    def top(self, metric: str, n: int = 5, language: Optional[str] = None,
+            where: Optional[Callable[[Repo], bool]] = None) -> List[Repo]:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Available: {', '.join(METRICS)}")
+        # Walks the ordering from the top, so a filter stops as soon as it has n matches
+        top: List[Repo] = []
+        for repo in self.iter_ranked(metric, language):
+            if len(top) == n:
+                break
+            if where is None or where(repo):
+                top.append(repo)
+        return top
+
+    def percentile_rank(self, name: str, metric: str, language: Optional[str] = None) -> float:
+        # Share of repos (in the language, if given) ranked below this one, counting ties as half, from 0 to 100
+        ordering = self._orderings[language][metric]
+        higher, tied = ordering.rank_counts(-self._keys[self._seqs[name]][metric][0])
+        below = len(ordering.keys) - higher - tied
+        return 100 * (below + tied / 2) / len(ordering.keys)
+
+    def languages(self) -> Dict[str, int]:
+        return {language: len(orderings['stars'].keys)
+                for language, orderings in self._orderings.items() if language is not None}
@@ -0,0 +1,109 @@
+# server.py
+import asyncio
+import logging
+import os
+import re
+from typing import Any, Dict, Optional, Tuple
+import aiohttp
+from aiohttp import web
+from controllers.commit_controller import CommitController
+from controllers.pr_controller import PRController
+from controllers.repo_controller import RepoController
+from services.github_service import GitHubService
+from services.refresh_scheduler import RefreshScheduler
+from utils.serialization import to_serializable
+
+# GitHub logins: letters, digits and hyphens, at most 39 characters
+USERNAME_PATTERN = re.compile(r'^[A-Za-z0-9-]{1,39}$')
+
+
+class AnalyticsServer:
+    CONTROLLERS = {
+        'commits': CommitController,
+        'pull_requests': PRController,
+        'repos': RepoController,
+    }
+
+    def __init__(self, github_service: GitHubService, default_username: Optional[str] = None,
+                 chart_root: str = "charts"):
+        self.github_service = github_service
+        self.default_username = default_username
+        self.chart_root = chart_root
+        self.refresh_scheduler = RefreshScheduler(github_service)
+        self.logger = logging.getLogger(__name__)
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def _chart_dir(self, username: str) -> str:
+        # Each account gets its own chart directory so concurrent requests don't overwrite files
+        root = os.path.realpath(self.chart_root)
+        chart_dir = os.path.realpath(os.path.join(root, username))
+        if os.path.commonpath([root, chart_dir]) != root or chart_dir == root:
+            raise ValueError(f"Invalid username: {username}")
+        return chart_dir
+
+    def _create_controller(self, kind: str, username: str):
+        if kind == 'repos':
+            return RepoController(username, self.github_service, chart_dir=self._chart_dir(username))
+        if kind == 'commits':
+            return CommitController(username, self.github_service, chart_dir=self._chart_dir(username))
+        return self.CONTROLLERS[kind](username, self.github_service)
+
+    async def run_analysis(self, kind: str, username: str) -> Dict[str, Any]:
+        # Concurrent queries for the same analysis and account share a single run
+        key = (kind, username)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._create_controller(kind, username).run_analysis())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'status': 'ok',
+            'cached_entries': len(self.github_service.cache),
+            'tokens': self.github_service.get_token_utilization(),
+        })
+
+    async def handle_analysis(self, request: web.Request) -> web.Response:
+        kind = request.match_info['kind']
+        if kind not in self.CONTROLLERS:
+            raise web.HTTPNotFound(text=f"Unknown analysis: {kind}")
+        username = request.query.get('username', self.default_username)
+        if not username:
+            raise web.HTTPBadRequest(text="The username query parameter is required")
+        if not USERNAME_PATTERN.fullmatch(username):
+            raise web.HTTPBadRequest(text=f"Invalid username: {username}")
+
+        try:
+            analysis = await self.run_analysis(kind, username)
+        except aiohttp.ClientResponseError as e:
+            self.logger.error(f"GitHub request failed for {kind} analysis of {username}: {str(e)}")
+            return web.json_response({'error': f"GitHub API error: {e.status} {e.message}"}, status=502)
+        return web.json_response(to_serializable(analysis))
+
+    async def _start_scheduler(self, app: web.Application) -> None:
+        self.refresh_scheduler.start()
+
+    async def _close_service(self, app: web.Application) -> None:
+        await self.refresh_scheduler.stop()
+        await self.github_service.close()
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/health', self.handle_health)
+        app.router.add_get('/analysis/{kind}', self.handle_analysis)
+        app.on_startup.append(self._start_scheduler)
+        app.on_cleanup.append(self._close_service)
+        return app
+
+
+async def serve(github_service: GitHubService, host: str, port: int, default_username: Optional[str] = None) -> None:
+    runner = web.AppRunner(AnalyticsServer(github_service, default_username).create_app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"Serving analytics on http://{host}:{port} (GET /analysis/{{commits,pull_requests,repos}}?username=...)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
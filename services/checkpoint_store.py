@@ -0,0 +1,69 @@
+# services/checkpoint_store.py
+import json
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+
+class CheckpointStore:
+    """Durable record of a crawl, so an interrupted run can resume where it stopped.
+
+    Finished fetches are stored whole under their cache key; fetches still in
+    progress store each page as it arrives, keyed by the request it came from.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages (cursor TEXT NOT NULL, page INTEGER NOT NULL, items TEXT NOT NULL, "
+            "PRIMARY KEY (cursor, page))"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def cursor_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        return url + "?" + json.dumps(params or {}, sort_keys=True)
+
+    def __contains__(self, key: str) -> bool:
+        return self._connection.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is not None
+
+    def load_result(self, key: str) -> Any:
+        row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def save_result(self, key: str, value: Any) -> None:
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                                     (key, json.dumps(value)))
+
+    def load_pages(self, cursor: str) -> List[List[Dict[str, Any]]]:
+        rows = self._connection.execute("SELECT items FROM pages WHERE cursor = ? ORDER BY page", (cursor,))
+        return [json.loads(items) for items, in rows]
+
+    def save_page(self, cursor: str, page: int, items: List[Dict[str, Any]]) -> None:
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO pages (cursor, page, items) VALUES (?, ?, ?)",
+                                     (cursor, page, json.dumps(items)))
+
+    def clear_pages(self, cursor: str) -> None:
+        with self._connection:
+            self._connection.execute("DELETE FROM pages WHERE cursor = ?", (cursor,))
+
+    def clear(self) -> None:
+        with self._connection:
+            self._connection.execute("DELETE FROM results")
+            self._connection.execute("DELETE FROM pages")
+
+    def completed_count(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,173 @@
+# services/crawl_worker.py
+import asyncio
+import logging
+import multiprocessing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import aiohttp
+from config import GITHUB_TOKENS, JOB_POLL_INTERVAL, JOB_TIMEOUT, WORKER_CONCURRENCY
+from services.github_service import GitHubService, IncompleteFetch
+from services.job_queue import DONE, PENDING, RUNNING, Job, JobQueue
+
+
+# Per-repo fetches that can run in worker processes, by job kind: how a worker's GitHubService runs the job
+JOB_FETCHERS: Dict[str, Callable[[GitHubService, Job], Awaitable[Tuple[Any, bool]]]] = {
+    'commits': lambda service, job: service._fetch_repo_commits(job.username, job.repo_name, []),
+    'pulls': lambda service, job: service._fetch_repo_pull_requests(job.username, job.repo_name, []),
+    'contributors': lambda service, job: service._fetch_repo_contributors(job.username, job.repo_name, []),
+    'commit_count': lambda service, job: service._fetch_repo_commit_count(job.username, job.repo_name),
+    'commit_pages': lambda service, job: service._fetch_repo_commit_pages(job.username, job.repo_name,
+                                                                          job.params['pages'], []),
+}
+
+
+class QueuedGitHubService(GitHubService):
+    """GitHubService whose per-repo crawls run in worker processes.
+
+    Commit, pull request and contributor fetches, commit counts, sampled
+    commit pages and fork crawls become jobs on a JobQueue. Workers hand back
+    the projected items as JSON, which go through caching and single-flight
+    here, so the controllers work as with a local crawl.
+    """
+
+    def __init__(self, token: Union[str, Sequence[str]], job_queue: JobQueue,
+                 poll_interval: float = JOB_POLL_INTERVAL, **kwargs: Any) -> None:
+        super().__init__(token, **kwargs)
+        self.job_queue = job_queue
+        self.poll_interval = poll_interval
+        self._waiting: Dict[int, asyncio.Future] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    async def _run_job(self, kind: str, username: str, repo_name: str,
+                       params: Optional[Dict[str, Any]] = None) -> Job:
+        job = await self._wait_for_job(self.job_queue.enqueue(kind, username, repo_name, params))
+        if job.status != DONE:
+            self.logger.error(f"Worker failed to fetch {kind} for {username}/{repo_name}: {job.error}")
+        return job
+
+    async def _collect_job(self, kind: str, username: str, repo_name: str, items: List[Any],
+                           params: Optional[Dict[str, Any]] = None) -> Tuple[List[Any], bool]:
+        job = await self._run_job(kind, username, repo_name, params)
+        if job.status != DONE:
+            return items, False
+        items.extend(job.result['result'])
+        return items, job.result['cacheable']
+
+    async def _wait_for_job(self, job_id: int) -> Job:
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[job_id] = future
+        # One poller checks every outstanding job per round instead of one query per waiting fetch
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll_jobs())
+        return await future
+
+    async def _poll_jobs(self) -> None:
+        while self._waiting:
+            for job_id, future in list(self._waiting.items()):
+                if future.cancelled():
+                    del self._waiting[job_id]
+            for job in self.job_queue.finished(list(self._waiting)):
+                future = self._waiting.pop(job.id)
+                if not future.done():
+                    future.set_result(job)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _fetch_repo_commits(self, username: str, repo_name: str,
+                                  commits: List[Any]) -> Tuple[List[Any], bool]:
+        commits, complete = await self._collect_job('commits', username, repo_name, commits)
+        if not complete:
+            raise IncompleteFetch(f"Worker failed to fetch all commits for {username}/{repo_name}", list(commits))
+        return commits, True
+
+    async def _fetch_repo_pull_requests(self, username: str, repo_name: str,
+                                        pull_requests: List[Any]) -> Tuple[List[Any], bool]:
+        return await self._collect_job('pulls', username, repo_name, pull_requests)
+
+    async def _fetch_repo_contributors(self, username: str, repo_name: str,
+                                       contributors: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        return await self._collect_job('contributors', username, repo_name, contributors)
+
+    async def _fetch_repo_commit_count(self, username: str, repo_name: str) -> Tuple[int, bool]:
+        job = await self._run_job('commit_count', username, repo_name)
+        if job.status != DONE:
+            # Callers fall back to crawling the repo, as when the count request itself fails
+            raise aiohttp.ClientError(f"Worker failed to count commits for {username}/{repo_name}: {job.error}")
+        return job.result['result'], job.result['cacheable']
+
+    async def _fetch_repo_commit_pages(self, username: str, repo_name: str, pages: Sequence[int],
+                                       fetched: List[List[Any]]) -> Tuple[List[List[Any]], bool]:
+        return await self._collect_job('commit_pages', username, repo_name, fetched, {'pages': list(pages)})
+
+    async def _iter_commit_pages(self, username: str, repo_name: str) -> AsyncIterator[List[Any]]:
+        # Fork crawls stop at a page the caller picks, so each page is its own job; the next one is
+        # queued while the current one is checked, so at most one page past the stop is fetched
+        page = 1
+        job_id = self.job_queue.enqueue('commit_pages', username, repo_name, {'pages': [page]})
+        while True:
+            next_job_id = self.job_queue.enqueue('commit_pages', username, repo_name, {'pages': [page + 1]})
+            job = await self._wait_for_job(job_id)
+            if job.status != DONE or not job.result['cacheable']:
+                raise aiohttp.ClientError(f"Worker failed to fetch commit page {page} for {username}/{repo_name}: "
+                                          f"{job.error or 'request failed'}")
+            page_commits = job.result['result'][0][1]
+            if not page_commits:
+                return
+            yield page_commits
+            if len(page_commits) < self.PER_PAGE:
+                return
+            page, job_id = page + 1, next_job_id
+
+    async def close(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+        await super().close()
+
+
+async def run_worker(queue_path: str, worker_id: str, tokens: Union[str, Sequence[str]],
+                     concurrency: int = WORKER_CONCURRENCY, idle_interval: float = JOB_POLL_INTERVAL) -> int:
+    # Fetches jobs until the coordinator closes the queue and it is drained
+    job_queue = JobQueue(queue_path, job_timeout=JOB_TIMEOUT)
+    service = GitHubService(tokens)
+    logger = logging.getLogger(__name__)
+    processed = 0
+
+    async def consume() -> None:
+        nonlocal processed
+        while True:
+            job = job_queue.claim(worker_id)
+            if job is None:
+                # Stay while other workers hold jobs, in case one dies and its jobs are handed out again
+                if job_queue.is_closed() and job_queue.count(PENDING, RUNNING) == 0:
+                    return
+                await asyncio.sleep(idle_interval)
+                continue
+            try:
+                result, cacheable = await JOB_FETCHERS[job.kind](service, job)
+                job_queue.complete(job.id, {'result': result, 'cacheable': cacheable}, final=cacheable)
+            except IncompleteFetch as e:
+                logger.error(f"Job {job.kind} for {job.username}/{job.repo_name} was cut short: {str(e)}")
+                job_queue.complete(job.id, {'result': e.partial, 'cacheable': False}, final=False)
+            except Exception as e:
+                logger.error(f"Job {job.kind} for {job.username}/{job.repo_name} failed: {str(e)}")
+                job_queue.fail(job.id, str(e))
+            processed += 1
+
+    try:
+        await asyncio.gather(*(consume() for _ in range(concurrency)))
+    finally:
+        await service.close()
+        job_queue.close()
+    return processed
+
+
+def _worker_process(queue_path: str, worker_id: str) -> None:
+    asyncio.run(run_worker(queue_path, worker_id, GITHUB_TOKENS))
+
+
+def start_workers(queue_path: str, count: int) -> List[multiprocessing.Process]:
+    # Spawned rather than forked, so workers don't inherit the coordinator's event loop
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_worker_process, args=(queue_path, f"local-{i}"), daemon=True)
+                 for i in range(count)]
+    for process in processes:
+        process.start()
+    return processes
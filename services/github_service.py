@@ -1,135 +1,449 @@
 # services/github_service.py
 import aiohttp
 import asyncio
-from typing import List, Dict, Any, Optional
+import re
+from urllib.parse import parse_qs, urlparse
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Sequence, Tuple, NamedTuple, Union
 import logging
-from cachetools import TTLCache
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
 from config import (
     GITHUB_API_BASE_URL,
     GITHUB_API_VERSION,
     CACHE_MAX_SIZE,
     CACHE_TTL,
+    CACHE_STALE_TTL,
+    HTTP_CONNECTION_LIMIT,
+    STATS_MAX_ATTEMPTS,
+    STATS_RETRY_DELAY,
+    TOKEN_MIN_REMAINING,
     LOG_LEVEL,
     LOG_FORMAT
 )
+from services.projections import FIELD_PROJECTIONS, project
+from services.checkpoint_store import CheckpointStore
+from services.swr_cache import StaleWhileRevalidateCache, Refresher
+from services.traffic_archive import TrafficRecorder, TrafficReplay
+from services.token_pool import ACTIVE, TokenPool, TokenState
+from utils.deadline import Deadline, DeadlineExceeded
+
+
+class IncompleteFetch(aiohttp.ClientError):
+    # A crawl cut short by a failed request; partial holds what was fetched before it
+    def __init__(self, message: str, partial: List[Any]):
+        super().__init__(message)
+        self.partial = partial
+
+
+class ApiResponse(NamedTuple):
+    status: int
+    headers: CIMultiDictProxy  # Case-insensitive, like HTTP header names
+    body: Any
+
+
+class _InflightFetch:
+    def __init__(self, future: asyncio.Future, items: List[Any]):
+        self.future = future
+        self.items = items  # Items collected so far, available to callers that give up early
+        self.waiters = 0
 
 
 class GitHubService:
-    def __init__(self, token: str) -> None:
+    PER_PAGE = 100
+    STATS_KINDS = ('commit_activity', 'punch_card', 'participation', 'contributors')
+
+    def __init__(self, token: Union[str, Sequence[str]], project_fields: bool = True,
+                 checkpoint_store: Optional[CheckpointStore] = None,
+                 traffic_recorder: Optional[TrafficRecorder] = None,
+                 traffic_replay: Optional[TrafficReplay] = None) -> None:
         self.base_url: str = GITHUB_API_BASE_URL
         self.headers: Dict[str, str] = {
-            "Authorization": f"token {token}",
             "Accept": f"application/vnd.github.{GITHUB_API_VERSION}+json"
         }
-        self.cache: TTLCache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL)
+        self.token_pool: TokenPool = TokenPool([token] if isinstance(token, str) else token, TOKEN_MIN_REMAINING)
+        self.cache: StaleWhileRevalidateCache = StaleWhileRevalidateCache(
+            maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL, stale_ttl=CACHE_STALE_TTL
+        )
+        self.rate_limit_remaining: Optional[int] = None
+        self.project_fields = project_fields
+        self.checkpoint_store = checkpoint_store
+        self.traffic_recorder = traffic_recorder
+        self.traffic_replay = traffic_replay
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[str, _InflightFetch] = {}
         logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
         self.logger: logging.Logger = logging.getLogger(__name__)
 
-    async def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        async with aiohttp.ClientSession() as session:
+    def _get_session(self) -> aiohttp.ClientSession:
+        # One long-lived session keeps the connection pool warm across requests
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT))
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _send(self, url: str, params: Optional[Dict[str, Any]] = None) -> ApiResponse:
+        if self.traffic_replay is not None:
+            return self._replay(url, params)
+        try:
+            response = await self._send_request(url, params)
+        except aiohttp.ClientResponseError as e:
+            if self.traffic_recorder is not None:
+                self.traffic_recorder.record(url, params, e.status, dict(e.headers or {}), None)
+            raise
+        if self.traffic_recorder is not None:
+            self.traffic_recorder.record(url, params, response.status, dict(response.headers), response.body)
+        return response
+
+    def _replay(self, url: str, params: Optional[Dict[str, Any]]) -> ApiResponse:
+        status, headers, body = self.traffic_replay.lookup(url, params)
+        if status >= 400 and status != 409:
+            request_info = aiohttp.RequestInfo(URL(url), 'GET', CIMultiDictProxy(CIMultiDict()), URL(url))
+            raise aiohttp.ClientResponseError(request_info, (), status=status, headers=headers)
+        return ApiResponse(status, CIMultiDictProxy(CIMultiDict(headers)), body)
+
+    async def _send_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> ApiResponse:
+        session = self._get_session()
+        while True:
+            token = await self._acquire_token()
             try:
-                async with session.get(url, headers=self.headers, params=params) as response:
-                    await self._check_rate_limit(response)
+                headers = {**self.headers, "Authorization": f"token {token.token}"}
+                async with session.get(url, headers=headers, params=params) as response:
+                    self._check_rate_limit(response, token)
+                    if response.status in (401, 403, 429) and self._reject_token(token, response, await response.text()):
+                        continue  # Retry with another token, or this one after its cool-down
                     if response.status == 409:
-                        self.logger.info(f"Resource not available or empty: {url}")
-                        return None
+                        return ApiResponse(response.status, response.headers, None)
                     response.raise_for_status()
                     content_type = response.headers.get('Content-Type', '')
                     if 'application/json' in content_type:
-                        return await response.json()
+                        body = await response.json()
                     elif 'text/plain' in content_type:
-                        return await response.text()
+                        body = await response.text()
                     else:
-                        return await response.read()
-            except aiohttp.ClientResponseError as e:
-                if e.status == 409:
-                    self.logger.info(f"Resource not available or empty: {url}")
-                    return None
-                raise  # Re-raise the exception without logging
-            except aiohttp.ClientError as e:
-                raise  # Re-raise the exception without logging
-
-    async def _check_rate_limit(self, response: aiohttp.ClientResponse) -> None:
-        remaining: int = int(response.headers.get('X-RateLimit-Remaining', 0))
-        if remaining <= 10:
-            reset_time: int = int(response.headers.get('X-RateLimit-Reset', 0))
-            wait_time: float = max(reset_time - asyncio.get_event_loop().time(), 0)
-            self.logger.warning(f"Rate limit nearly exceeded. Waiting for {wait_time} seconds.")
+                        body = await response.read()
+                    return ApiResponse(response.status, response.headers, body)
+            finally:
+                self.token_pool.release(token)
+
+    async def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        try:
+            response = await self._send(url, params)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 409:
+                self.logger.info(f"Resource not available or empty: {url}")
+                return None
+            raise  # Re-raise the exception without logging
+        except aiohttp.ClientError as e:
+            raise  # Re-raise the exception without logging
+        if response.status == 409:
+            self.logger.info(f"Resource not available or empty: {url}")
+            return None
+        return response.body
+
+    async def _fetch_once(self, cache_key: str, fetch: Refresher, deadline: Optional[Deadline] = None) -> Any:
+        # Serve from cache, or join an identical fetch already in flight instead of
+        # issuing duplicate upstream requests. fetch fills the given list and returns
+        # (result, cacheable).
+        entry = self.cache.get_entry(cache_key)
+        if entry is not None:
+            if not self.cache.is_fresh(entry):
+                # Stale-while-revalidate: answer now, refresh in the background
+                self._start_fetch(cache_key, fetch)
+            return entry.value
+
+        if self.checkpoint_store is not None and cache_key in self.checkpoint_store:
+            # Finished before an interrupted run stopped
+            result = self.checkpoint_store.load_result(cache_key)
+            self.cache.put(cache_key, result, refresh=fetch)
+            return result
+
+        inflight = self._start_fetch(cache_key, fetch)
+        inflight.waiters += 1
+        try:
+            # Shield the shared fetch so one cancelled caller does not cancel it for the others
+            if deadline is None:
+                return await asyncio.shield(inflight.future)
+            return await asyncio.wait_for(asyncio.shield(inflight.future), deadline.remaining())
+        except asyncio.TimeoutError:
+            if inflight.waiters == 1:
+                inflight.future.cancel()  # Nobody else is waiting for this fetch
+            raise DeadlineExceeded(f"Deadline reached while fetching {cache_key}", list(inflight.items))
+        finally:
+            inflight.waiters -= 1
+
+    def _start_fetch(self, cache_key: str, fetch: Refresher) -> _InflightFetch:
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            items: List[Any] = []
+            inflight = _InflightFetch(asyncio.ensure_future(self._fetch_and_cache(cache_key, fetch, items)), items)
+            self._inflight[cache_key] = inflight
+            inflight.future.add_done_callback(lambda done: self._finish_fetch(cache_key, done))
+        return inflight
+
+    def _finish_fetch(self, cache_key: str, future: asyncio.Future) -> None:
+        self._inflight.pop(cache_key, None)
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.warning(f"Fetching {cache_key} failed: {str(future.exception())}")
+
+    async def _fetch_and_cache(self, cache_key: str, fetch: Refresher, items: List[Any]) -> Any:
+        result, cacheable = await fetch(items)
+        if cacheable:
+            self.cache.put(cache_key, result, refresh=fetch)
+            if self.checkpoint_store is not None:
+                self.checkpoint_store.save_result(cache_key, result)
+        return result
+
+    async def refresh(self, cache_key: str) -> Any:
+        entry = self.cache.get_entry(cache_key)
+        if entry is None or entry.refresh is None:
+            raise KeyError(cache_key)
+        return await asyncio.shield(self._start_fetch(cache_key, entry.refresh).future)
+
+    async def _acquire_token(self) -> TokenState:
+        token = self.token_pool.acquire()
+        wait_time = self.token_pool.wait_time(token)
+        if wait_time > 0:
+            self.logger.warning(f"Rate limit nearly exceeded on every token. Waiting for {wait_time:.0f} seconds.")
             await asyncio.sleep(wait_time)
+        return token
 
-    async def get_user_repos(self, username: str) -> List[Dict[str, Any]]:
-        cache_key: str = f"user_repos_{username}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+    def _check_rate_limit(self, response: aiohttp.ClientResponse, token: TokenState) -> None:
+        self.token_pool.update(token, response.headers)
+        self.rate_limit_remaining = self.token_pool.total_remaining()
 
-        repos: List[Dict[str, Any]] = []
-        page: int = 1
-        while True:
-            url: str = f"{self.base_url}/users/{username}/repos"
-            page_repos: List[Dict[str, Any]] = await self._make_request(url, params={"page": page, "per_page": 100})
-            if not page_repos:
-                break
-            repos.extend(page_repos)
-            page += 1
+    def _reject_token(self, token: TokenState, response: aiohttp.ClientResponse, message: str) -> bool:
+        retry = self.token_pool.reject(token, response.status, response.headers, message)
+        if token.status != ACTIVE:
+            self.logger.warning(f"Token {token.label} was rejected with {response.status}; quarantining it")
+        return retry
 
-        self.cache[cache_key] = repos
-        return repos
+    def get_token_utilization(self) -> List[Dict[str, Any]]:
+        return self.token_pool.utilization()
 
-    async def get_repo_commits(self, username: str, repo_name: str) -> List[Dict[str, Any]]:
-        commits: List[Dict[str, Any]] = []
+    async def _iter_pages(self, url: str, endpoint: str,
+                          params: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        # Pages are projected as they arrive so the raw payloads can be released immediately
+        projection = FIELD_PROJECTIONS.get(endpoint) if self.project_fields else None
         page: int = 1
-        while True:
-            url: str = f"{self.base_url}/repos/{username}/{repo_name}/commits"
-            try:
-                page_commits = await self._make_request(url, params={"page": page, "per_page": 100})
-                if page_commits is None:
-                    self.logger.info(f"Repository {username}/{repo_name} is empty or has no commits.")
-                    break
-                if not page_commits or not isinstance(page_commits, list):
+        cursor = CheckpointStore.cursor_key(url, params) if self.checkpoint_store is not None else None
+        finished: bool = False
+        interrupted: bool = False
+        try:
+            if cursor is not None:
+                # Replay the pages an interrupted run already fetched, then carry on after them
+                for page_items in self.checkpoint_store.load_pages(cursor):
+                    yield page_items
+                    finished = len(page_items) < self.PER_PAGE
+                    page += 1
+            while not finished:
+                page_items = await self._make_request(url, params={**(params or {}), "page": page, "per_page": self.PER_PAGE})
+                if not page_items or not isinstance(page_items, list):
                     break
-                commits.extend(page_commits)
-                if len(page_commits) < 100:
+                projected = [project(item, projection) for item in page_items]
+                if cursor is not None:
+                    self.checkpoint_store.save_page(cursor, page, projected)
+                yield projected
+                if len(page_items) < self.PER_PAGE:
                     break
                 page += 1
+        except (Exception, asyncio.CancelledError, KeyboardInterrupt):
+            interrupted = True  # Failed or cancelled crawls keep their pages to resume from
+            raise
+        finally:
+            # The whole result is checkpointed once the fetch finishes, or the caller stopped reading early
+            if cursor is not None and not interrupted:
+                self.checkpoint_store.clear_pages(cursor)
+
+    async def _collect_pages(self, url: str, endpoint: str, items: List[Dict[str, Any]],
+                             params: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        async for page_items in self._iter_pages(url, endpoint, params):
+            items.extend(page_items)
+        return items, True
+
+    async def get_user_repos(self, username: str, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        url: str = f"{self.base_url}/users/{username}/repos"
+        return await self._fetch_once(f"user_repos_{username}",
+                                      lambda items: self._collect_pages(url, 'repos', items), deadline)
+
+    async def get_repo_commits(self, username: str, repo_name: str,
+                               deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        return await self._fetch_once(f"repo_commits_{username}/{repo_name}",
+                                      lambda items: self._fetch_repo_commits(username, repo_name, items), deadline)
+
+    async def _fetch_repo_commits(self, username: str, repo_name: str,
+                                  commits: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        url: str = f"{self.base_url}/repos/{username}/{repo_name}/commits"
+        try:
+            async for page_commits in self._iter_pages(url, 'commits'):
+                commits.extend(page_commits)
+        except aiohttp.ClientError as e:
+            # Not cached; callers get the commits fetched so far and can tell the crawl was cut short
+            self.logger.error(f"Error fetching commits for {repo_name}: {str(e)}")
+            raise IncompleteFetch(f"Error fetching commits for {repo_name}: {str(e)}", list(commits)) from e
+        return commits, True
+
+    async def get_repo_commits_until(self, username: str, repo_name: str,
+                                     stop: Callable[[List[Dict[str, Any]]], bool],
+                                     deadline: Optional[Deadline] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        # Crawls newest first up to the first page stop() accepts, and returns the commits before it and
+        # whether stop() ended the crawl early. Neither cached nor shared, since the result depends on where
+        # the caller stops.
+        commits: List[Dict[str, Any]] = []
+
+        async def crawl() -> Tuple[List[Dict[str, Any]], bool]:
+            pages = self._iter_commit_pages(username, repo_name)
+            stopped = False
+            try:
+                async for page_commits in pages:
+                    if stop(page_commits):
+                        stopped = True
+                        break
+                    commits.extend(page_commits)
             except aiohttp.ClientError as e:
                 self.logger.error(f"Error fetching commits for {repo_name}: {str(e)}")
-                break  # Exit the loop on error
-        return commits  # Return the commits we've managed to fetch, even if it's an empty list
+                raise IncompleteFetch(f"Error fetching commits for {repo_name}: {str(e)}", list(commits)) from e
+            finally:
+                await pages.aclose()
+            return commits, stopped
 
-    async def get_repo_pull_requests(self, username: str, repo_name: str) -> List[Dict[str, Any]]:
-        pull_requests: List[Dict[str, Any]] = []
-        page: int = 1
-        while True:
-            url: str = f"{self.base_url}/repos/{username}/{repo_name}/pulls"
-            page_prs: List[Dict[str, Any]] = await self._make_request(url, params={"state": "all", "page": page, "per_page": 100})
-            if not page_prs:
-                break
-            pull_requests.extend(page_prs)
-            if len(page_prs) < 100:
-                break
-            page += 1
-        return pull_requests
-
-    async def get_repo_contributors(self, username: str, repo_name: str) -> List[Dict[str, Any]]:
-        contributors: List[Dict[str, Any]] = []
-        page: int = 1
-        while True:
-            url: str = f"{self.base_url}/repos/{username}/{repo_name}/contributors"
-            try:
-                page_contributors: List[Dict[str, Any]] = await self._make_request(url, params={"page": page, "per_page": 100})
-                if not page_contributors or not isinstance(page_contributors, list):
-                    break
+        if deadline is None:
+            return await crawl()
+        try:
+            return await asyncio.wait_for(crawl(), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Deadline reached while fetching commits for {repo_name}", list(commits))
+
+    def _iter_commit_pages(self, username: str, repo_name: str) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self._iter_pages(f"{self.base_url}/repos/{username}/{repo_name}/commits", 'commits')
+
+    async def get_repo_commit_count(self, username: str, repo_name: str,
+                                    deadline: Optional[Deadline] = None) -> int:
+        return await self._fetch_once(f"repo_commit_count_{username}/{repo_name}",
+                                      lambda items: self._fetch_repo_commit_count(username, repo_name), deadline)
+
+    async def _fetch_repo_commit_count(self, username: str, repo_name: str) -> Tuple[int, bool]:
+        # With one commit per page, the number of the last page is the number of commits
+        url: str = f"{self.base_url}/repos/{username}/{repo_name}/commits"
+        response = await self._send(url, params={"per_page": 1})
+        if response.status == 409 or not response.body:
+            return 0, True  # Empty repository
+        last_page = self._get_last_page_number(response.headers)
+        return (last_page if last_page is not None else len(response.body)), True
+
+    async def get_repo_commit_pages(self, username: str, repo_name: str, pages: Sequence[int],
+                                    deadline: Optional[Deadline] = None) -> List[List[Any]]:
+        # Returns [page, commits] pairs for the requested pages of PER_PAGE commits
+        return await self._fetch_once(f"repo_commit_pages_{username}/{repo_name}_{','.join(map(str, pages))}",
+                                      lambda items: self._fetch_repo_commit_pages(username, repo_name, pages, items),
+                                      deadline)
+
+    async def _fetch_repo_commit_pages(self, username: str, repo_name: str, pages: Sequence[int],
+                                       fetched: List[List[Any]]) -> Tuple[List[List[Any]], bool]:
+        url: str = f"{self.base_url}/repos/{username}/{repo_name}/commits"
+        projection = FIELD_PROJECTIONS.get('commits') if self.project_fields else None
+
+        async def fetch_page(page: int) -> None:
+            page_items = await self._make_request(url, params={"page": page, "per_page": self.PER_PAGE})
+            fetched.append([page, [project(item, projection) for item in page_items or []]])
+
+        # Sampled pages are independent, so they are fetched concurrently; pages that fail are left out
+        results = await asyncio.gather(*(fetch_page(page) for page in pages), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        for error in errors:
+            self.logger.error(f"Error fetching sampled commits for {repo_name}: {str(error)}")
+        return sorted(fetched, key=lambda entry: entry[0]), not errors
+
+    async def get_repo_pull_requests(self, username: str, repo_name: str,
+                                     deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        return await self._fetch_once(f"repo_pulls_{username}/{repo_name}",
+                                      lambda items: self._fetch_repo_pull_requests(username, repo_name, items),
+                                      deadline)
+
+    async def _fetch_repo_pull_requests(self, username: str, repo_name: str,
+                                        pull_requests: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        url: str = f"{self.base_url}/repos/{username}/{repo_name}/pulls"
+        return await self._collect_pages(url, 'pulls', pull_requests, params={"state": "all"})
+
+    async def get_repo_contributors(self, username: str, repo_name: str,
+                                    deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        return await self._fetch_once(f"repo_contributors_{username}/{repo_name}",
+                                      lambda items: self._fetch_repo_contributors(username, repo_name, items), deadline)
+
+    async def _fetch_repo_contributors(self, username: str, repo_name: str,
+                                       contributors: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        url: str = f"{self.base_url}/repos/{username}/{repo_name}/contributors"
+        try:
+            async for page_contributors in self._iter_pages(url, 'contributors'):
                 contributors.extend(page_contributors)
-                if len(page_contributors) < 100:
-                    break
-                page += 1
-            except aiohttp.ContentTypeError:
-                self.logger.warning(f"Unable to fetch contributors for {username}/{repo_name}. The repository might be empty or not exist.")
-                break
-            except Exception as e:
-                self.logger.error(f"Error fetching contributors for {username}/{repo_name}: {str(e)}")
-                break
-        return contributors
+        except aiohttp.ContentTypeError:
+            self.logger.warning(f"Unable to fetch contributors for {username}/{repo_name}. The repository might be empty or not exist.")
+            return contributors, False
+        except Exception as e:
+            self.logger.error(f"Error fetching contributors for {username}/{repo_name}: {str(e)}")
+            return contributors, False
+        return contributors, True
+
+    async def get_repo_stats(self, username: str, repo_name: str, kind: str,
+                             deadline: Optional[Deadline] = None) -> Optional[Any]:
+        if kind not in self.STATS_KINDS:
+            raise ValueError(f"Unknown repository statistics endpoint: {kind}")
+        return await self._fetch_once(f"repo_stats_{kind}_{username}/{repo_name}",
+                                      lambda items: self._fetch_repo_stats(username, repo_name, kind), deadline)
+
+    async def _fetch_repo_stats(self, username: str, repo_name: str, kind: str) -> Tuple[Optional[Any], bool]:
+        # GitHub answers 202 Accepted while it computes the statistics in the background;
+        # poll with exponential backoff and give up (returning None) after STATS_MAX_ATTEMPTS.
+        url: str = f"{self.base_url}/repos/{username}/{repo_name}/stats/{kind}"
+        delay: float = STATS_RETRY_DELAY
+        for attempt in range(STATS_MAX_ATTEMPTS):
+            try:
+                response = await self._send(url)
+            except aiohttp.ClientError as e:
+                self.logger.error(f"Error fetching {kind} statistics for {username}/{repo_name}: {str(e)}")
+                return None, False
+            if response.status == 202:
+                if attempt < STATS_MAX_ATTEMPTS - 1:
+                    await asyncio.sleep(delay)
+                    delay *= 2
+                continue
+            if response.status == 204 or response.status == 409:
+                return [], True  # Empty repository
+            return response.body, True
+        self.logger.info(f"{kind} statistics for {username}/{repo_name} are still being computed")
+        return None, False
+
+    @staticmethod
+    def _get_last_page_number(headers: CIMultiDictProxy) -> Optional[int]:
+        match = re.search(r'<([^>]+)>;\s*rel="last"', headers.get('Link', ''))
+        if match is None:
+            return None
+        pages = parse_qs(urlparse(match.group(1)).query).get('page')
+        return int(pages[0]) if pages else None
+
+    async def get_pull_request_count(self, username: str, repo_name: Optional[str] = None, state: str = "open",
+                                     deadline: Optional[Deadline] = None) -> int:
+        scope = f"{username}/{repo_name}" if repo_name else username
+        return await self._fetch_once(f"pull_request_count_{state}_{scope}",
+                                      lambda items: self._fetch_pull_request_count(username, repo_name, state), deadline)
+
+    async def _fetch_pull_request_count(self, username: str, repo_name: Optional[str], state: str) -> Tuple[int, bool]:
+        if repo_name is None:
+            # Account-wide totals come straight from the search API
+            url: str = f"{self.base_url}/search/issues"
+            response = await self._send(url, params={"q": f"user:{username} type:pr state:{state}", "per_page": 1})
+            return response.body['total_count'], True
+
+        # With one PR per page, the number of the last page is the number of PRs
+        url = f"{self.base_url}/repos/{username}/{repo_name}/pulls"
+        response = await self._send(url, params={"state": state, "per_page": 1})
+        if response.status == 409 or not response.body:
+            return 0, True
+        last_page = self._get_last_page_number(response.headers)
+        return (last_page if last_page is not None else len(response.body)), True
 
     async def get_user_repo_count(self, username: str) -> int:
         url: str = f"{self.base_url}/users/{username}"
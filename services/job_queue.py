@@ -0,0 +1,141 @@
+# services/job_queue.py
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    username: str
+    repo_name: str
+    status: str = PENDING
+    result: Any = None
+    error: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+
+
+class JobQueue:
+    """Durable queue of per-repo fetch jobs shared by a coordinator and its workers.
+
+    The queue lives in one SQLite file, so workers in other processes, or on
+    other hosts sharing the file, can claim jobs. Claims are atomic, and jobs
+    whose worker stopped responding are handed out again after ``job_timeout``
+    seconds. Failed jobs, and jobs that finished with an incomplete result,
+    are run again when enqueued again.
+    """
+
+    def __init__(self, path: str, job_timeout: float = 600, timer: Callable[[], float] = time.time):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.job_timeout = job_timeout
+        self.timer = timer
+        # Autocommit mode, so claims can take the write lock explicitly
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, kind TEXT NOT NULL, username TEXT NOT NULL, "
+            "repo_name TEXT NOT NULL, params TEXT NOT NULL DEFAULT '', status TEXT NOT NULL, result TEXT, error TEXT, "
+            "final INTEGER NOT NULL DEFAULT 1, worker TEXT, claimed_at REAL, UNIQUE (kind, username, repo_name, params))"
+        )
+        self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def enqueue(self, kind: str, username: str, repo_name: str, params: Optional[Dict[str, Any]] = None) -> int:
+        # Enqueueing a job that already exists returns it, finished or not; failed and incomplete jobs are
+        # handed back to workers first, so a new run or --resume retries them
+        encoded = json.dumps(params, sort_keys=True) if params is not None else ''
+        self._connection.execute(
+            "INSERT OR IGNORE INTO jobs (kind, username, repo_name, params, status) VALUES (?, ?, ?, ?, ?)",
+            (kind, username, repo_name, encoded, PENDING),
+        )
+        row = self._connection.execute(
+            "SELECT id FROM jobs WHERE kind = ? AND username = ? AND repo_name = ? AND params = ?",
+            (kind, username, repo_name, encoded)
+        ).fetchone()
+        self._connection.execute(
+            "UPDATE jobs SET status = ?, result = NULL, error = NULL, final = 1, worker = NULL, claimed_at = NULL "
+            "WHERE id = ? AND (status = ? OR (status = ? AND final = 0))", (PENDING, row[0], FAILED, DONE)
+        )
+        return row[0]
+
+    def claim(self, worker: str) -> Optional[Job]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._connection.execute(
+                "SELECT id, kind, username, repo_name, params FROM jobs "
+                "WHERE status = ? OR (status = ? AND claimed_at < ?) ORDER BY id LIMIT 1",
+                (PENDING, RUNNING, self.timer() - self.job_timeout),
+            ).fetchone()
+            if row is not None:
+                self._connection.execute("UPDATE jobs SET status = ?, worker = ?, claimed_at = ? WHERE id = ?",
+                                         (RUNNING, worker, self.timer(), row[0]))
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        job_id, kind, username, repo_name, params = row
+        return Job(job_id, kind, username, repo_name, RUNNING, params=json.loads(params) if params else None)
+
+    def complete(self, job_id: int, result: Any, final: bool = True) -> None:
+        # Results that aren't final, such as a crawl cut short by a failed request, are retried on the next enqueue
+        self._connection.execute("UPDATE jobs SET status = ?, result = ?, final = ? WHERE id = ?",
+                                 (DONE, json.dumps(result), int(final), job_id))
+
+    def fail(self, job_id: int, error: str) -> None:
+        self._connection.execute("UPDATE jobs SET status = ?, error = ? WHERE id = ?", (FAILED, error, job_id))
+
+    def get(self, job_id: int) -> Job:
+        row = self._connection.execute(
+            "SELECT id, kind, username, repo_name, status, result, error, params FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        job_id, kind, username, repo_name, status, result, error, params = row
+        return Job(job_id, kind, username, repo_name, status, json.loads(result) if result is not None else None,
+                   error, json.loads(params) if params else None)
+
+    def count(self, *statuses: str) -> int:
+        placeholders = ", ".join("?" for _ in statuses)
+        return self._connection.execute(f"SELECT COUNT(*) FROM jobs WHERE status IN ({placeholders})",
+                                        statuses).fetchone()[0]
+
+    def finished(self, job_ids: List[int]) -> List[Job]:
+        jobs = []
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self._connection.execute(
+                f"SELECT id FROM jobs WHERE id IN ({placeholders}) AND status IN (?, ?)", (*chunk, DONE, FAILED)
+            )
+            jobs.extend(self.get(job_id) for job_id, in rows.fetchall())
+        return jobs
+
+    def open_queue(self) -> None:
+        self._connection.execute("DELETE FROM meta WHERE key = 'closed'")
+
+    def close_queue(self) -> None:
+        # Tells workers no more jobs are coming, so they exit once the queue is drained
+        self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('closed', '1')")
+
+    def is_closed(self) -> bool:
+        return self._connection.execute("SELECT 1 FROM meta WHERE key = 'closed'").fetchone() is not None
+
+    def clear(self) -> None:
+        self._connection.execute("DELETE FROM jobs")
+        self._connection.execute("DELETE FROM meta")
+
+    def close(self) -> None:
+        self._connection.close()
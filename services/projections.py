@@ -0,0 +1,55 @@
+# services/projections.py
+from typing import Any, Dict, Optional
+
+# A projection maps each retained key to None (keep the value as is) or to a
+# nested projection applied to the value. Only the fields read by the models'
+# from_dict methods, and by the controllers, are kept.
+Projection = Dict[str, Optional['Projection']]
+
+REPO_PROJECTION: Projection = {
+    'name': None,
+    'fork': None,
+    'stargazers_count': None,
+    'forks_count': None,
+    'language': None,
+    'size': None,
+    'updated_at': None,
+}
+
+COMMIT_PROJECTION: Projection = {
+    'sha': None,
+    'commit': {
+        'author': {'name': None, 'date': None},
+        'message': None,
+    },
+}
+
+PULL_REQUEST_PROJECTION: Projection = {
+    'number': None,
+    'title': None,
+    'state': None,
+    'created_at': None,
+    'closed_at': None,
+}
+
+CONTRIBUTOR_PROJECTION: Projection = {
+    'login': None,
+    'contributions': None,
+}
+
+FIELD_PROJECTIONS: Dict[str, Projection] = {
+    'repos': REPO_PROJECTION,
+    'commits': COMMIT_PROJECTION,
+    'pulls': PULL_REQUEST_PROJECTION,
+    'contributors': CONTRIBUTOR_PROJECTION,
+}
+
+
+def project(data: Any, projection: Optional[Projection]) -> Any:
+    if projection is None or not isinstance(data, dict):
+        return data
+    return {
+        key: project(data[key], sub_projection)
+        for key, sub_projection in projection.items()
+        if key in data
+    }
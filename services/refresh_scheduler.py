@@ -0,0 +1,62 @@
+# services/refresh_scheduler.py
+import asyncio
+import logging
+from typing import Optional
+from config import REFRESH_INTERVAL, REFRESH_LEAD_TIME, REFRESH_TOP_KEYS, REFRESH_RATE_LIMIT_RESERVE
+
+
+class RefreshScheduler:
+    """Proactively refreshes the most-read cache entries of a GitHubService before they expire."""
+
+    def __init__(self, github_service, interval: float = REFRESH_INTERVAL, lead_time: float = REFRESH_LEAD_TIME,
+                 top_keys: int = REFRESH_TOP_KEYS, rate_limit_reserve: int = REFRESH_RATE_LIMIT_RESERVE):
+        self.github_service = github_service
+        self.interval = interval
+        self.lead_time = lead_time
+        self.top_keys = top_keys
+        self.rate_limit_reserve = rate_limit_reserve
+        self.logger = logging.getLogger(__name__)
+        self._task: Optional[asyncio.Task] = None
+
+    def _has_budget(self) -> bool:
+        remaining = self.github_service.rate_limit_remaining
+        return remaining is None or remaining > self.rate_limit_reserve
+
+    async def refresh_once(self) -> int:
+        cache = self.github_service.cache
+        # Account-level repo lists are always worth keeping warm; otherwise rank by reads
+        candidates = sorted(
+            cache.hottest(self.top_keys),
+            key=lambda item: (not item[0].startswith('user_repos_'), -item[1].hits)
+        )
+        refreshed = 0
+        for key, entry in candidates:
+            if entry.refresh is None or cache.expires_in(entry) > self.lead_time:
+                continue
+            if not self._has_budget():
+                self.logger.info("Skipping proactive cache refresh to preserve the rate-limit budget")
+                break
+            try:
+                await self.github_service.refresh(key)
+                refreshed += 1
+            except Exception as e:
+                self.logger.warning(f"Background refresh of {key} failed: {str(e)}")
+        return refreshed
+
+    async def run(self) -> None:
+        while True:
+            await self.refresh_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
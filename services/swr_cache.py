@@ -0,0 +1,85 @@
+# services/swr_cache.py
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Tuple
+
+# Fills the given list as items arrive and returns (result, cacheable)
+Refresher = Callable[[List[Any]], Awaitable[Tuple[Any, bool]]]
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fetched_at: float
+    refresh: Optional[Refresher] = None
+    hits: int = 0
+
+
+class StaleWhileRevalidateCache:
+    """LRU cache whose entries stay servable for ``stale_ttl`` seconds after they expire.
+
+    Fresh entries are younger than ``ttl``; stale entries are older but still
+    returned so callers don't wait while a refresh runs in the background.
+    Each entry remembers how to refresh itself and how often it was read.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timer = timer
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+
+    def _age(self, entry: CacheEntry) -> float:
+        return self.timer() - entry.fetched_at
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self._age(entry) < self.ttl
+
+    def expires_in(self, entry: CacheEntry) -> float:
+        return self.ttl - self._age(entry)
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._age(entry) >= self.ttl + self.stale_ttl:
+            del self._entries[key]
+            return None
+        entry.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, value: Any, refresh: Optional[Refresher] = None) -> None:
+        previous = self._entries.pop(key, None)
+        self._entries[key] = CacheEntry(
+            value=value,
+            fetched_at=self.timer(),
+            refresh=refresh or (previous.refresh if previous else None),
+            hits=previous.hits if previous else 0
+        )
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def hottest(self, n: int) -> List[Tuple[str, CacheEntry]]:
+        return sorted(self._entries.items(), key=lambda item: item[1].hits, reverse=True)[:n]
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and self._age(entry) < self.ttl + self.stale_ttl
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self.get_entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry.value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.put(key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,121 @@
+# services/token_pool.py
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+import aiohttp
+
+ACTIVE = "active"
+QUARANTINED = "quarantined"
+
+
+class NoTokensAvailable(aiohttp.ClientError):
+    pass
+
+
+@dataclass
+class TokenState:
+    token: str
+    remaining: Optional[int] = None  # Unknown until the first response carries rate-limit headers
+    limit: Optional[int] = None
+    reset_at: float = 0.0
+    requests: int = 0
+    in_flight: int = 0
+    status: str = ACTIVE
+    cooldown_until: float = 0.0  # Set by secondary rate limits (Retry-After)
+
+    @property
+    def label(self) -> str:
+        # Never print whole credentials
+        return f"...{self.token[-4:]}"
+
+
+class TokenPool:
+    """Spreads requests over several tokens to pool their hourly rate limits.
+
+    Each request goes to the active token with the most headroom left, as
+    reported by the X-RateLimit headers of its previous responses. Tokens
+    GitHub rejects as bad credentials are quarantined and no longer used;
+    tokens hit by a secondary rate limit cool down for the Retry-After time.
+    """
+
+    DEFAULT_LIMIT = 5000  # GitHub's hourly limit for authenticated requests
+
+    def __init__(self, tokens: Sequence[str], min_remaining: int = 10, timer: Callable[[], float] = time.time):
+        if not tokens:
+            raise ValueError("TokenPool needs at least one token")
+        self.tokens: List[TokenState] = [TokenState(token) for token in dict.fromkeys(tokens)]
+        self.min_remaining = min_remaining
+        self.timer = timer
+
+    def active_tokens(self) -> List[TokenState]:
+        return [state for state in self.tokens if state.status == ACTIVE]
+
+    def remaining(self, state: TokenState) -> int:
+        if state.remaining is None or (state.reset_at and self.timer() >= state.reset_at):
+            return state.limit or self.DEFAULT_LIMIT  # The window has reset since we last heard
+        return state.remaining
+
+    def headroom(self, state: TokenState) -> int:
+        return self.remaining(state) - state.in_flight
+
+    def acquire(self) -> TokenState:
+        active = self.active_tokens()
+        if not active:
+            raise NoTokensAvailable("Every GitHub token has been rejected")
+        # Tokens that are cooling down only come after the others, the one that is ready soonest first
+        now = self.timer()
+        state = max(active, key=lambda state: (min(now - state.cooldown_until, 0), self.headroom(state)))
+        state.in_flight += 1
+        state.requests += 1
+        return state
+
+    def release(self, state: TokenState) -> None:
+        state.in_flight -= 1
+
+    def wait_time(self, state: TokenState) -> float:
+        # Only wait once even the best token is nearly spent or cooling down
+        cooldown = max(state.cooldown_until - self.timer(), 0.0)
+        if self.headroom(state) > self.min_remaining:
+            return cooldown
+        return max(state.reset_at - self.timer(), cooldown)
+
+    def update(self, state: TokenState, headers: Dict[str, str]) -> None:
+        if 'X-RateLimit-Remaining' in headers:
+            state.remaining = int(headers['X-RateLimit-Remaining'])
+        if 'X-RateLimit-Limit' in headers:
+            state.limit = int(headers['X-RateLimit-Limit'])
+        if 'X-RateLimit-Reset' in headers:
+            state.reset_at = float(headers['X-RateLimit-Reset'])
+
+    def reject(self, state: TokenState, status: int, headers: Dict[str, str], message: str = '') -> bool:
+        # Returns whether the request should be retried. Only bad credentials quarantine a token;
+        # other 403s (SAML enforcement, blocked repositories, ...) are the caller's error.
+        if status == 401 or 'bad credentials' in message.lower():
+            state.status = QUARANTINED
+        elif headers.get('Retry-After') is not None:
+            state.cooldown_until = self.timer() + float(headers['Retry-After'])
+        elif status == 403 and headers.get('X-RateLimit-Remaining') == '0':
+            state.remaining = 0
+        else:
+            return False
+        return bool(self.active_tokens())
+
+    def total_remaining(self) -> Optional[int]:
+        if all(state.remaining is None for state in self.tokens):
+            return None
+        return sum(self.remaining(state) for state in self.active_tokens())
+
+    def utilization(self) -> List[Dict[str, object]]:
+        report = []
+        for state in self.tokens:
+            limit = state.limit or self.DEFAULT_LIMIT
+            remaining = self.remaining(state)
+            report.append({
+                'token': state.label,
+                'status': state.status,
+                'requests': state.requests,
+                'remaining': remaining,
+                'limit': limit,
+                'utilization': 1 - remaining / limit,
+            })
+        return report
@@ -0,0 +1,69 @@
+# services/traffic_archive.py
+import base64
+import gzip
+import json
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+import aiohttp
+
+
+class ReplayMissError(aiohttp.ClientError):
+    pass
+
+
+def request_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    return url + "?" + json.dumps({key: str(value) for key, value in (params or {}).items()}, sort_keys=True)
+
+
+class TrafficRecorder:
+    """Appends every API response to a gzip-compressed JSON Lines archive.
+
+    Each line holds the request URL and params and the response status,
+    headers and body. Opening an existing archive appends a new gzip member,
+    so several runs can share one file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = 0
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+
+    def record(self, url: str, params: Optional[Dict[str, Any]], status: int, headers: Dict[str, str], body: Any) -> None:
+        record = {'url': url, 'params': params or {}, 'status': status, 'headers': headers}
+        if isinstance(body, bytes):
+            record['body_base64'] = base64.b64encode(body).decode('ascii')
+        else:
+            record['body'] = body
+        self._file.write(json.dumps(record) + "\n")
+        self.records += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class TrafficReplay:
+    """Serves responses from a TrafficRecorder archive instead of the network.
+
+    Responses to the same request are replayed in the order they were
+    recorded (a /stats endpoint answering 202 before 200, say); once they run
+    out, the last one is repeated.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._responses: Dict[str, Deque[Tuple[int, Dict[str, str], Any]]] = defaultdict(deque)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                body = base64.b64decode(record['body_base64']) if 'body_base64' in record else record.get('body')
+                self._responses[request_key(record['url'], record['params'])].append(
+                    (record['status'], record['headers'], body))
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def lookup(self, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, str], Any]:
+        responses = self._responses.get(request_key(url, params))
+        if not responses:
+            raise ReplayMissError(f"No recorded response for {url} {params or {}}")
+        return responses.popleft() if len(responses) > 1 else responses[0]
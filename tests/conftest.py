@@ -0,0 +1,23 @@
+# tests/conftest.py
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_commit():
+    # Builds a commit as the REST API lists it
+    def make(sha, author='Test Author', date='2023-07-03T10:00:00Z'):
+        return {'sha': sha, 'commit': {'author': {'name': author, 'date': date}, 'message': 'Test commit'}}
+    return make
@@ -0,0 +1,279 @@
+# /tests/test_controllers/test_commit_controller.py
+import aiohttp
+import pytest
+from collections import Counter
+from unittest.mock import Mock, patch
+from controllers.commit_controller import CommitController
+from models.commit import Commit
+from services.github_service import GitHubService, IncompleteFetch
+from utils.deadline import DeadlineExceeded
+from utils.memo_store import MemoStore
+
+
+@pytest.fixture
+def mock_github_service():
+    return Mock(spec=GitHubService)
+
+
+@pytest.fixture
+def commit_controller(mock_github_service):
+    return CommitController('test_user', mock_github_service)
+
+
+@pytest.mark.asyncio
+async def test_get_commits(commit_controller, mock_github_service, make_commit):
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}, {'name': 'repo2'}]
+    mock_github_service.get_repo_commits.side_effect = [
+        [make_commit('sha1', 'alice'), make_commit('sha2', 'bob')],
+        []
+    ]
+    mock_progress_callback = Mock()
+
+    commits = await commit_controller.get_commits(mock_progress_callback)
+
+    assert len(commits) == 2
+    assert all(isinstance(commit, Commit) for commit in commits)
+    assert list(commit_controller.author_sketches) == ['repo1']
+    assert mock_progress_callback.call_count == 3  # Once for fetching repos, once per repo
+
+
+@pytest.mark.asyncio
+async def test_run_analysis_top_authors(commit_controller, mock_github_service, make_commit):
+    repo_authors = {
+        'repo1': ['alice'] * 5 + ['bob'] * 3 + ['carol'],
+        'repo2': ['bob'] * 4 + ['dave'] * 2,
+    }
+    mock_github_service.get_user_repos.return_value = [{'name': name} for name in repo_authors]
+    mock_github_service.get_repo_commits.side_effect = [
+        [make_commit(f'{name}-{i}', author) for i, author in enumerate(authors)]
+        for name, authors in repo_authors.items()
+    ]
+    mock_progress_callback = Mock()
+
+    analysis = await commit_controller.run_analysis(mock_progress_callback)
+
+    exact = Counter(author for authors in repo_authors.values() for author in authors)
+    assert analysis['top_authors']['overall'] == exact.most_common(5)
+    assert analysis['top_authors']['per_repo']['repo1'] == Counter(repo_authors['repo1']).most_common(5)
+    assert analysis['top_authors']['per_repo']['repo2'] == Counter(repo_authors['repo2']).most_common(5)
+    assert sum(analysis['time_distribution'].values()) == 15
+    assert mock_progress_callback.call_count == 7  # Repos, two repos, and four analysis steps
+
+
+@pytest.mark.asyncio
+async def test_top_authors_uses_the_commits_it_is_given(commit_controller, mock_github_service, make_commit):
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
+    mock_github_service.get_repo_commits.return_value = [make_commit('sha1', 'alice')]
+    await commit_controller.run_analysis(Mock())
+
+    top_authors = commit_controller.analyze_top_authors([Commit.from_dict(make_commit('sha2', 'bob'))])
+
+    assert top_authors == {'overall': [('bob', 1)], 'per_repo': {}}
+
+
+@pytest.mark.asyncio
+async def test_run_analysis_with_time_budget_reports_coverage(commit_controller, mock_github_service, make_commit):
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}, {'name': 'repo2'}, {'name': 'repo3'}]
+
+    async def get_repo_commits(username, repo_name, deadline=None):
+        if repo_name == 'repo1':
+            return [make_commit('sha1', 'alice')]
+        deadline.expires_at = deadline.timer()  # The budget runs out while fetching repo2
+        raise DeadlineExceeded("late", [make_commit('sha2', 'bob')])
+
+    mock_github_service.get_repo_commits.side_effect = get_repo_commits
+
+    analysis = await commit_controller.run_analysis(Mock(), time_budget=60)
+
+    assert analysis['coverage'] == {'repo1': 'complete', 'repo2': 'truncated', 'repo3': 'skipped'}
+    assert sum(analysis['time_distribution'].values()) == 2
+    assert mock_github_service.get_repo_commits.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_analysis_marks_repos_cut_short_by_errors_truncated(commit_controller, mock_github_service,
+                                                                      make_commit):
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}, {'name': 'fork1', 'fork': True}]
+    mock_github_service.get_repo_commits.side_effect = IncompleteFetch("boom", [make_commit('sha1', 'alice')])
+    mock_github_service.get_repo_commits_until.side_effect = IncompleteFetch("boom", [make_commit('sha2', 'bob')])
+
+    analysis = await commit_controller.run_analysis(Mock())
+
+    assert analysis['coverage'] == {'repo1': 'truncated', 'fork1': 'truncated'}
+    assert sum(analysis['time_distribution'].values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_mode_uses_statistics_and_falls_back_to_crawl(mock_github_service, make_commit):
+    controller = CommitController('test_user', mock_github_service, use_stats_endpoints=True)
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}, {'name': 'repo2'}]
+    week_start = 1688256000  # Sunday 2023-07-02 UTC
+    stats = {
+        'punch_card': [[1, 10, 2], [2, 11, 1]],
+        'commit_activity': [{'days': [0, 2, 1, 0, 0, 0, 0], 'total': 3, 'week': week_start}],
+        'contributors': [{'author': {'login': 'alice'}, 'total': 3, 'weeks': []}],
+    }
+
+    async def get_repo_stats(username, repo_name, kind, deadline=None):
+        return stats[kind] if repo_name == 'repo1' else None  # repo2 is still being computed
+
+    mock_github_service.get_repo_stats.side_effect = get_repo_stats
+    mock_github_service.get_repo_commits.return_value = [make_commit('sha1', 'bob', '2023-07-05T10:00:00Z')]
+    mock_progress_callback = Mock()
+
+    analysis = await controller.run_analysis(mock_progress_callback)
+
+    assert analysis['data_sources'] == {'repo1': 'stats', 'repo2': 'crawl'}
+    assert analysis['time_distribution']['Monday'] == 2
+    assert analysis['time_distribution']['Tuesday'] == 1
+    assert analysis['time_distribution']['Wednesday'] == 1
+    assert analysis['longest_streak'] == 3  # July 3rd to 5th
+    assert analysis['avg_frequency'] == pytest.approx(4 / 3)
+    assert analysis['top_authors']['overall'] == [('alice', 3), ('bob', 1)]
+    mixed = 'mixed: last 52 weeks from statistics, all time from crawled repos'
+    assert analysis['windows'] == {'time_distribution': 'all time', 'activity_heatmap': 'all time',
+                                   'avg_frequency': mixed, 'longest_streak': mixed}
+    mock_github_service.get_repo_commits.assert_called_once()
+    assert mock_progress_callback.call_count == 7
+
+
+@pytest.mark.asyncio
+async def test_stats_mode_exact_history_crawls_old_repos(mock_github_service, make_commit):
+    controller = CommitController('test_user', mock_github_service, use_stats_endpoints=True, exact_history=True)
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
+    stats = {
+        'punch_card': [[1, 10, 50]],  # 50 commits in total
+        'commit_activity': [{'days': [0, 2, 0, 0, 0, 0, 0], 'total': 2, 'week': 1688256000}],  # 2 in the last year
+        'contributors': [],
+    }
+
+    async def get_repo_stats(username, repo_name, kind, deadline=None):
+        return stats[kind]
+
+    mock_github_service.get_repo_stats.side_effect = get_repo_stats
+    mock_github_service.get_repo_commits.return_value = [make_commit('sha1', 'bob')]
+
+    analysis = await controller.run_analysis(Mock())
+
+    assert analysis['data_sources'] == {'repo1': 'crawl'}
+    assert sum(analysis['time_distribution'].values()) == 1
+    assert analysis['windows'] == {}
+
+
+@pytest.mark.asyncio
+async def test_run_analysis_reuses_memoized_analysis(mock_github_service, tmp_path, mocker, make_commit):
+    controller = CommitController('test_user', mock_github_service, memo_store=MemoStore(str(tmp_path)))
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
+    mock_github_service.get_repo_commits.return_value = [make_commit('sha1', 'alice')]
+    analyze = mocker.spy(controller, 'analyze_commits')
+
+    first_progress, second_progress = Mock(), Mock()
+    first = await controller.run_analysis(first_progress)
+    second = await controller.run_analysis(second_progress)
+
+    assert first == second
+    assert analyze.call_count == 1
+    # Progress still adds up; the skipped analysis steps are reported in one go
+    assert sum(call.args[0] for call in second_progress.call_args_list) == \
+        sum(call.args[0] for call in first_progress.call_args_list)
+    second_progress.assert_called_with(4, 'memo hit')
+
+
+@pytest.mark.asyncio
+async def test_run_analysis_activity_heatmap(mock_github_service, tmp_path, make_commit):
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
+    mock_github_service.get_repo_commits.return_value = [
+        make_commit('sha1', 'alice', '2023-07-03T10:00:00Z'),
+        make_commit('sha2', 'bob', '2023-07-03T10:30:00Z'),
+    ]
+    controller = CommitController('test_user', mock_github_service, timezone='Europe/Berlin', chart_dir=str(tmp_path))
+
+    with patch('models.commit.Commit.create_activity_heatmap_chart') as mock_create_heatmap_chart:
+        analysis = await controller.run_analysis()
+
+    assert analysis['timezone'] == 'Europe/Berlin'
+    assert analysis['activity_heatmap'][0][12] == 2  # Monday 10:00 UTC is 12:00 in Berlin
+    assert mock_create_heatmap_chart.call_count == 1
+    assert analysis['chart_files'] == [mock_create_heatmap_chart.call_args[0][2]]
+
+
+@pytest.mark.asyncio
+async def test_get_commits_counts_shared_history_once(commit_controller, mock_github_service, make_commit):
+    shared = [make_commit(f'shared{i}', 'alice') for i in range(3)]
+    mock_github_service.get_user_repos.return_value = [
+        {'name': 'fork', 'fork': True},
+        {'name': 'upstream', 'fork': False},
+        {'name': 'mirror', 'fork': False},
+    ]
+    mock_github_service.get_repo_commits.side_effect = [shared, shared + [make_commit('mirror1', 'bob')]]
+
+    async def divergent_commits(username, repo_name, stop, deadline=None):
+        pages = [[make_commit('fork1', 'carol')], shared[:2], [make_commit('unreached', 'carol')]]
+        commits = []
+        for page in pages:
+            if stop(page):
+                return commits, True
+            commits.extend(page)
+        return commits, False
+
+    mock_github_service.get_repo_commits_until.side_effect = divergent_commits
+
+    commits = await commit_controller.get_commits(Mock())
+
+    # Non-forks are crawled first; the fork stops at the first page of known commits, so 'unreached' may be missing
+    assert [call.args[1] for call in mock_github_service.get_repo_commits.call_args_list] == ['upstream', 'mirror']
+    assert sorted(commit.sha for commit in commits) == ['fork1', 'mirror1', 'shared0', 'shared1', 'shared2']
+    assert commit_controller.duplicate_commits == 3
+    assert commit_controller.coverage == {'upstream': 'complete', 'mirror': 'complete', 'fork': 'shared_history'}
+
+
+@pytest.mark.asyncio
+async def test_get_commits_streams_rows_per_repo(mock_github_service, make_commit):
+    rows = []
+    controller = CommitController('test_user', mock_github_service, row_writer=lambda table, batch: rows.append((table, batch)))
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}, {'name': 'repo2'}]
+    mock_github_service.get_repo_commits.side_effect = [[make_commit('sha1', 'alice')], []]
+
+    await controller.get_commits(Mock())
+
+    assert [(table, [row['sha'] for row in batch]) for table, batch in rows] == [('commits', ['sha1'])]
+    assert rows[0][1][0]['repo'] == 'repo1'
+
+
+@pytest.mark.asyncio
+async def test_sampling_mode_estimates_large_repos(mock_github_service, make_commit):
+    controller = CommitController('test_user', mock_github_service, sample_pages=3)
+    mock_github_service.get_user_repos.return_value = [{'name': 'small'}, {'name': 'huge'}]
+    mock_github_service.get_repo_commit_count.side_effect = lambda username, repo_name, deadline=None: {
+        'small': 1, 'huge': 1000}[repo_name]
+    mock_github_service.get_repo_commits.return_value = [make_commit('small1', 'alice', '2023-07-05T10:00:00Z')]
+    # Every sampled page holds 100 Monday commits (2023-07-03), so each stands for 10 pages of Mondays
+    mock_github_service.get_repo_commit_pages.return_value = [
+        [page, [make_commit(f'huge{page}-{i}', 'bob') for i in range(100)]] for page in (1, 6, 10)
+    ]
+
+    analysis = await controller.run_analysis(Mock())
+
+    mock_github_service.get_repo_commit_pages.assert_called_once_with('test_user', 'huge', [1, 6, 10], deadline=None)
+    assert analysis['time_distribution']['Monday'] == 1000
+    assert analysis['time_distribution']['Wednesday'] == 1
+    assert analysis['estimates']['time_distribution']['Monday'] == [1000, 1000]  # No spread between pages
+    assert analysis['estimates']['sampled_repos'] == {
+        'huge': {'total_commits': 1000, 'sampled_commits': 300, 'sampled_pages': 3, 'page_count': 10}}
+    assert analysis['avg_frequency'] == pytest.approx(1001 / 3)
+    assert analysis['top_authors']['overall'][0] == ('bob', 1000)
+    assert sum(map(sum, analysis['activity_heatmap'])) == 1001
+
+
+@pytest.mark.asyncio
+async def test_sampling_mode_crawls_repos_whose_count_fails(mock_github_service, make_commit):
+    controller = CommitController('test_user', mock_github_service, sample_pages=3)
+    mock_github_service.get_user_repos.return_value = [{'name': 'blocked'}, {'name': 'repo2'}]
+    mock_github_service.get_repo_commit_count.side_effect = aiohttp.ClientResponseError(Mock(), (), status=451)
+    mock_github_service.get_repo_commits.side_effect = [[make_commit('sha1', 'alice')], [make_commit('sha2', 'bob')]]
+
+    commits = await controller.get_commits(Mock())
+
+    assert sorted(commit.sha for commit in commits) == ['sha1', 'sha2']
+    assert controller.coverage == {'blocked': 'complete', 'repo2': 'complete'}
+    mock_github_service.get_repo_commit_pages.assert_not_called()
@@ -1,7 +1,8 @@
 # /tests/pr_controller.py
+import aiohttp
 import pytest
 from datetime import datetime
-from controllers.pr_controller import PRController
+from controllers.pr_controller import ACCOUNT_COUNT, PRController
 from models.pull_request import PullRequest
 from services.github_service import GitHubService
 
@@ -42,11 +43,12 @@ class TestPRController:
         mock_progress_callback = mocker.Mock()
         analysis = pr_controller.analyze_pull_requests(pull_requests, mock_progress_callback)
 
-        assert analysis == {
-            "pr_stats": {'opened': 1, 'closed': 1},
-            "total_prs": 2
-        }
-        assert mock_progress_callback.call_count == 2  # Once for PR stats, once for total PRs
+        assert analysis["pr_stats"] == {'opened': 1, 'closed': 1}
+        assert analysis["total_prs"] == 2
+        assert analysis["time_to_close"]["overall"]["count"] == 1
+        assert analysis["time_to_close"]["overall"]["p50"] == pytest.approx(24, rel=0.01)
+        assert analysis["time_to_close"]["per_repo"] == {}
+        assert mock_progress_callback.call_count == 3  # PR stats, total PRs and time-to-close
 
     async def test_run_analysis(self, pr_controller, mock_github_service, mocker):
         mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
@@ -58,8 +60,83 @@ class TestPRController:
         mock_progress_callback = mocker.Mock()
         analysis = await pr_controller.run_analysis(mock_progress_callback)
 
-        assert analysis == {
-            "pr_stats": {'opened': 1, 'closed': 1},
-            "total_prs": 2
-        }
+        assert analysis["pr_stats"] == {'opened': 1, 'closed': 1}
+        assert analysis["total_prs"] == 2
+        assert analysis["time_to_close"]["per_repo"]["repo1"]["count"] == 1
+        assert analysis["time_to_close"]["overall"]["p99"] == pytest.approx(24, rel=0.01)
         assert mock_progress_callback.call_count > 0  # Ensure the callback was called at least once
+
+    async def test_time_to_close_merges_per_repo_sketches(self, pr_controller, mock_github_service, mocker):
+        mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}, {'name': 'repo2'}]
+        mock_github_service.get_repo_pull_requests.side_effect = [
+            [{'number': 1, 'title': 'PR 1', 'state': 'closed', 'created_at': '2023-01-01T00:00:00Z', 'closed_at': '2023-01-01T10:00:00Z'}],
+            [{'number': 2, 'title': 'PR 2', 'state': 'closed', 'created_at': '2023-01-01T00:00:00Z', 'closed_at': '2023-01-05T00:00:00Z'},
+             {'number': 3, 'title': 'PR 3', 'state': 'open', 'created_at': '2023-01-02T00:00:00Z', 'closed_at': None}]
+        ]
+
+        analysis = await pr_controller.run_analysis(mocker.Mock())
+
+        time_to_close = analysis["time_to_close"]
+        assert time_to_close["per_repo"]["repo1"]["p50"] == pytest.approx(10, rel=0.01)
+        assert time_to_close["per_repo"]["repo2"]["p50"] == pytest.approx(96, rel=0.01)
+        assert time_to_close["overall"]["count"] == 2
+        assert time_to_close["overall"]["p50"] == pytest.approx(10, rel=0.01)
+
+    async def test_time_to_close_uses_the_pull_requests_it_is_given(self, pr_controller, mock_github_service, mocker):
+        mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
+        mock_github_service.get_repo_pull_requests.return_value = [
+            {'number': 1, 'title': 'PR 1', 'state': 'closed', 'created_at': '2023-01-01T00:00:00Z', 'closed_at': '2023-01-01T10:00:00Z'}
+        ]
+        await pr_controller.run_analysis(mocker.Mock())
+        other = PullRequest(2, 'PR 2', 'closed', datetime(2023, 1, 1), datetime(2023, 1, 2))
+
+        time_to_close = pr_controller.analyze_time_to_close([other])
+
+        assert time_to_close["overall"]["p50"] == pytest.approx(24, rel=0.01)
+        assert time_to_close["per_repo"] == {}
+
+    async def test_run_analysis_without_budget_is_complete(self, pr_controller, mock_github_service, mocker):
+        mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
+        mock_github_service.get_repo_pull_requests.return_value = []
+
+        analysis = await pr_controller.run_analysis(mocker.Mock())
+
+        assert analysis["coverage"] == {'repo1': 'complete'}
+
+    async def test_run_analysis_with_expired_budget_skips_repos(self, pr_controller, mock_github_service, mocker):
+        mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}, {'name': 'repo2'}]
+
+        analysis = await pr_controller.run_analysis(mocker.Mock(), time_budget=0)
+
+        assert analysis["coverage"] == {'repo1': 'skipped', 'repo2': 'skipped'}
+        assert analysis["total_prs"] == 0
+        mock_github_service.get_repo_pull_requests.assert_not_called()
+
+    async def test_count_only_mode(self, mock_github_service, mocker):
+        controller = PRController('test_user', mock_github_service, count_only=True, per_repo_counts=True)
+        mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
+        counts = {(None, 'open'): 12, (None, 'closed'): 30, ('repo1', 'open'): 2, ('repo1', 'closed'): 5}
+
+        async def get_pull_request_count(username, repo_name=None, state='open', deadline=None):
+            return counts[(repo_name, state)]
+
+        mock_github_service.get_pull_request_count.side_effect = get_pull_request_count
+        mock_progress_callback = mocker.Mock()
+
+        analysis = await controller.run_analysis(mock_progress_callback)
+
+        assert analysis["pr_stats"] == {'opened': 12, 'closed': 30}
+        assert analysis["total_prs"] == 42
+        assert analysis["per_repo_counts"] == {'repo1': {'opened': 2, 'closed': 5}}
+        mock_github_service.get_repo_pull_requests.assert_not_called()
+        assert mock_progress_callback.call_count == 3
+
+    async def test_count_only_mode_reports_a_failed_account_count(self, mock_github_service, mocker):
+        controller = PRController('test_user', mock_github_service, count_only=True)
+        mock_github_service.get_pull_request_count.side_effect = aiohttp.ClientResponseError(
+            mocker.Mock(), (), status=502)
+
+        analysis = await controller.run_analysis(mocker.Mock())
+
+        assert analysis["total_prs"] == 0
+        assert analysis["coverage"] == {ACCOUNT_COUNT: 'skipped'}
@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 from controllers.repo_controller import RepoController
 from models.repo import Repo
 from services.github_service import GitHubService
+from utils.memo_store import MemoStore
 
 
 @pytest.fixture
@@ -89,5 +90,31 @@ async def test_run_analysis(repo_controller, mock_github_service, sample_repo_da
         assert 'chart_files' in analysis
         assert mock_progress_callback.call_count > 0  # Ensure the callback was called at least once
 
+
+@pytest.mark.asyncio
+async def test_run_analysis_with_memo_store_renders_unchanged_charts_once(mock_github_service, sample_repo_data, tmp_path):
+    mock_github_service.get_user_repos.return_value = sample_repo_data
+    mock_github_service.get_repo_contributors.return_value = []
+    controller = RepoController('test_user', mock_github_service, chart_dir=str(tmp_path / 'charts'),
+                                memo_store=MemoStore(str(tmp_path / 'memo')))
+
+    def write_chart(*args):
+        with open(args[-1], 'wb') as f:
+            f.write(b'chart')
+
+    with patch('controllers.repo_controller.chart_utils.create_bar_chart', side_effect=write_chart) as mock_create_bar_chart, \
+         patch('models.repo.Repo.create_language_breakdown_chart', side_effect=write_chart), \
+         patch('models.repo.Repo.create_repo_size_distribution_chart', side_effect=write_chart):
+
+        await controller.run_analysis(Mock())
+        assert mock_create_bar_chart.call_count == 3
+
+        await controller.run_analysis(Mock())
+        assert mock_create_bar_chart.call_count == 3
+
+        sample_repo_data[0]['stargazers_count'] = 100
+        await controller.run_analysis(Mock())
+        assert mock_create_bar_chart.call_count == 4  # Only the top starred chart changed
+
 if __name__ == '__main__':
     pytest.main()
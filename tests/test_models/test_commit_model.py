@@ -2,7 +2,9 @@
 import unittest
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from models.commit import Commit
+from datetime import date
+import numpy as np
+from models.commit import AUTHOR_TIMEZONE, Commit, CommitActivity
 
 
 class TestCommitModel(unittest.TestCase):
@@ -59,6 +61,107 @@ class TestCommitModel(unittest.TestCase):
         streak = Commit.get_longest_streak(self.sample_commits)
         self.assertEqual(streak, 3)  # Longest streak is 3 days (July 1-3)
 
+    def test_get_top_authors(self):
+        commits = self.sample_commits + [
+            Commit(sha='extra1', author='Other Author', date=self.sample_commits[0].date, message='Other'),
+            Commit(sha='extra2', author='Other Author', date=self.sample_commits[0].date, message='Other'),
+            Commit(sha='extra3', author='Third Author', date=self.sample_commits[0].date, message='Third'),
+        ]
+        top_authors = Commit.get_top_authors(commits, top_n=2)
+        self.assertEqual(top_authors, [('Test Author', 8), ('Other Author', 2)])
+
+    def test_get_time_distribution_from_punch_card(self):
+        punch_card = [[0, 10, 2], [1, 9, 3], [1, 17, 1], [6, 23, 4]]
+        distribution = Commit.get_time_distribution_from_punch_card(punch_card)
+        self.assertEqual(distribution['Sunday'], 2)
+        self.assertEqual(distribution['Monday'], 4)
+        self.assertEqual(distribution['Saturday'], 4)
+        self.assertEqual(sum(distribution.values()), 10)
+
+    def test_get_daily_counts_from_commit_activity(self):
+        week_start = int(datetime(2023, 7, 2, tzinfo=ZoneInfo("UTC")).timestamp())  # A Sunday
+        commit_activity = [{'days': [1, 2, 0, 0, 0, 0, 3], 'total': 6, 'week': week_start}]
+        daily_counts = Commit.get_daily_counts_from_commit_activity(commit_activity)
+        self.assertEqual(daily_counts, {date(2023, 7, 2): 1, date(2023, 7, 3): 2, date(2023, 7, 8): 3})
+
+    def test_commit_activity_matches_commit_analysis(self):
+        activity = CommitActivity()
+        activity.add_commits(self.sample_commits)
+        self.assertEqual(activity.time_distribution, Commit.get_commit_time_distribution(self.sample_commits))
+        self.assertAlmostEqual(Commit.get_average_frequency_from_daily_counts(activity.daily_counts),
+                               Commit.get_average_commit_frequency(self.sample_commits))
+        self.assertEqual(Commit.get_longest_streak_from_dates(activity.daily_counts),
+                         Commit.get_longest_streak(self.sample_commits))
+
+    def test_get_author_sketch_from_contributor_stats(self):
+        contributor_stats = [
+            {'author': {'login': 'alice'}, 'total': 10, 'weeks': []},
+            {'author': {'login': 'bob'}, 'total': 4, 'weeks': []},
+            {'author': None, 'total': 7, 'weeks': []},
+        ]
+        sketch = Commit.get_author_sketch_from_contributor_stats(contributor_stats)
+        self.assertEqual(sketch.top(2), [('alice', 10), ('bob', 4)])
+
+    def test_get_commit_activity_heatmap(self):
+        heatmap = Commit.get_commit_activity_heatmap(self.sample_commits, 'UTC')
+        self.assertEqual(heatmap.shape, (7, 24))
+        self.assertEqual(heatmap.sum(), 8)
+        self.assertEqual(heatmap[5][10], 1)  # Saturday 10:00
+        self.assertEqual(heatmap[0][9], 2)  # Mondays 09:15 and 09:00
+
+    def test_activity_heatmap_in_timezone_follows_daylight_saving(self):
+        commits = [self.sample_commits[0], Commit('winter', 'Test Author', datetime(2023, 1, 7, 10, tzinfo=ZoneInfo("UTC")), '')]
+        heatmap = Commit.get_commit_activity_heatmap(commits, 'America/New_York')
+        self.assertEqual(heatmap[5][6], 1)  # 10:00 UTC is 06:00 EDT in July
+        self.assertEqual(heatmap[5][5], 1)  # and 05:00 EST in January
+
+    def test_activity_heatmap_with_author_offsets(self):
+        commit = Commit.from_dict({'sha': 'a', 'commit': {'author': {'name': 'Test Author', 'date': '2023-07-01T23:30:00+02:00'},
+                                                          'message': ''}})
+        self.assertEqual((commit.date, commit.utc_offset), (datetime(2023, 7, 1, 21, 30, tzinfo=ZoneInfo("UTC")), 7200))
+        self.assertEqual(Commit.get_commit_activity_heatmap([commit], AUTHOR_TIMEZONE)[5][23], 1)
+        self.assertEqual(Commit.get_commit_activity_heatmap([commit], 'UTC')[5][21], 1)
+
+    def test_activity_heatmap_matches_datetime_bucketing(self):
+        rng = np.random.default_rng(0)
+        timestamps = rng.integers(-10**9, 2 * 10**9, size=2000)
+        zone = ZoneInfo('Europe/Berlin')
+        expected = np.zeros((7, 24), dtype=np.int64)
+        for timestamp in timestamps:
+            local = datetime.fromtimestamp(int(timestamp), zone)
+            expected[local.weekday()][local.hour] += 1
+
+        heatmap = Commit.get_activity_heatmap(timestamps, Commit.get_zone_offsets(timestamps, 'Europe/Berlin'))
+        np.testing.assert_array_equal(heatmap, expected)
+
+    def test_get_heatmap_from_punch_card(self):
+        punch_card = [[0, 1, 5], [6, 20, 2]]  # Sunday 01:00 and Saturday 20:00 UTC
+        utc = Commit.get_heatmap_from_punch_card(punch_card, 'UTC')
+        self.assertEqual(utc[6][1], 5)
+        self.assertEqual(utc[5][20], 2)
+
+        tokyo = Commit.get_heatmap_from_punch_card(punch_card, 'Asia/Tokyo')  # UTC+9, no daylight saving
+        self.assertEqual(tokyo[6][10], 5)
+        self.assertEqual(tokyo[6][5], 2)  # Wraps into Sunday morning
+        self.assertEqual(tokyo.sum(), 7)
+
+        kolkata = Commit.get_heatmap_from_punch_card(punch_card, 'Asia/Kolkata')  # UTC+5:30
+        self.assertEqual(kolkata[6][6] + kolkata[6][7], 5)  # 01:00-02:00 UTC is 06:30-07:30 local
+        self.assertEqual(kolkata[6][7], 2)  # Half of 5, rounded to even, moves to the later hour
+        self.assertEqual((kolkata[6][1], kolkata[6][2]), (1, 1))
+        self.assertEqual(kolkata.sum(), 7)
+
+        newfoundland = Commit.get_heatmap_from_punch_card([[1, 12, 4]], 'America/St_Johns')  # UTC-3:30 or -2:30
+        self.assertEqual(newfoundland.sum(), 4)
+        self.assertEqual(np.count_nonzero(newfoundland), 2)
+
+    def test_commit_activity_heatmap(self):
+        activity = CommitActivity(timezone='UTC')
+        activity.add_commits(self.sample_commits)
+        activity.add_stats([[0, 1, 5]], [])
+        self.assertEqual(np.array(activity.heatmap).sum(), 13)
+        self.assertEqual(activity.heatmap[6][1], 5)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -49,6 +49,21 @@ class TestPullRequestModel:
         stats = PullRequest.get_pr_stats(sample_prs)
         assert stats == {'opened': 2, 'closed': 2}
 
+    def test_time_to_close_hours(self, sample_prs):
+        assert sample_prs[0].time_to_close_hours is None
+        assert sample_prs[1].time_to_close_hours == 24
+
+    def test_time_to_close_summary(self, sample_prs):
+        sketch = PullRequest.get_time_to_close_sketch(sample_prs)
+        summary = PullRequest.summarize_time_to_close(sketch)
+        assert summary['count'] == 2
+        assert summary['p50'] == pytest.approx(24, rel=0.01)
+        assert summary['p99'] == pytest.approx(24, rel=0.01)
+
+    def test_time_to_close_summary_without_closed_prs(self, sample_prs):
+        sketch = PullRequest.get_time_to_close_sketch([sample_prs[0], sample_prs[3]])
+        assert PullRequest.summarize_time_to_close(sketch) == {'count': 0, 'p50': None, 'p90': None, 'p99': None}
+
     async def test_get_pull_requests_stats(self, mocker):
         mock_client = mocker.AsyncMock()
         mock_session = mocker.AsyncMock()
@@ -83,3 +98,14 @@ class TestPullRequestModel:
         count, empty_repos = await PullRequest.get_contributor_count(mock_client, 'test_user', ['repo1', 'repo2', 'repo3'])
         assert count == 3
         assert empty_repos == 1
+
+    async def test_get_contributor_count_approximate(self, mocker):
+        mock_client = mocker.AsyncMock()
+        mock_client.get_repo_contributors_async.side_effect = [
+            [{'login': 'user1'}, {'login': 'user2'}],
+            [{'login': 'user2'}, {'login': 'user3'}]
+        ]
+
+        count, empty_repos = await PullRequest.get_contributor_count(mock_client, 'test_user', ['repo1', 'repo2'], approximate=True)
+        assert count == 3
+        assert empty_repos == 0
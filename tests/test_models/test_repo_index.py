@@ -0,0 +1,85 @@
+# tests/test_models/test_repo_index.py
+import random
+from datetime import datetime, timedelta
+import pytest
+from models.repo import Repo
+from models.repo_index import RepoIndex
+
+
+@pytest.fixture
+def sample_repos():
+    return [
+        Repo('repo1', 10, 5, 'Python', 100, datetime(2023, 1, 1)),
+        Repo('repo2', 20, 15, 'JavaScript', 200, datetime(2023, 2, 1)),
+        Repo('repo3', 5, 2, 'Python', 50, datetime(2023, 3, 1)),
+        Repo('repo4', 30, 10, 'Java', 150, datetime(2023, 4, 1)),
+        Repo('repo5', 15, 20, 'Python', 300, datetime(2023, 5, 1)),
+    ]
+
+
+def names(repos):
+    return [repo.name for repo in repos]
+
+
+def test_top_matches_a_stable_sort_including_ties():
+    rng = random.Random(7)
+    repos = [Repo(f'repo{i}', rng.randrange(20), rng.randrange(20), rng.choice(['Python', 'Go']), rng.randrange(1000),
+                  datetime(2023, 1, 1) + timedelta(days=rng.randrange(30))) for i in range(500)]
+    index = RepoIndex(repos)
+
+    assert index.top('stars', 25) == sorted(repos, key=lambda repo: repo.stars, reverse=True)[:25]
+    assert index.top('recency', 25) == sorted(repos, key=lambda repo: repo.updated_at, reverse=True)[:25]
+    go = [repo for repo in repos if repo.language == 'Go']
+    assert index.top('size', 10, language='Go') == sorted(go, key=lambda repo: repo.size, reverse=True)[:10]
+
+
+def test_filtered_top_and_languages(sample_repos):
+    index = RepoIndex(sample_repos)
+    assert names(index.top('forks', 2, where=lambda repo: repo.stars < 20)) == ['repo5', 'repo1']
+    assert names(index.top('stars', 5, language='Python')) == ['repo5', 'repo1', 'repo3']
+    assert index.top('stars', language='Rust') == []
+    assert index.languages() == {'Python': 3, 'JavaScript': 1, 'Java': 1}
+    with pytest.raises(ValueError):
+        index.top('watchers')
+
+
+def test_percentile_rank(sample_repos):
+    index = RepoIndex(sample_repos)
+    assert index.percentile_rank('repo4', 'stars') == 90  # 4 below, itself counted as half
+    assert index.percentile_rank('repo3', 'stars') == 10
+    assert index.percentile_rank('repo1', 'stars', language='Python') == pytest.approx(50)
+
+
+def test_incremental_updates(sample_repos):
+    index = RepoIndex(sample_repos)
+
+    sample_repos[2].stars = 100
+    sample_repos[2].add_contributors([{'login': 'alice'}, {'login': 'bob'}])
+    index.update(sample_repos[2])
+    assert names(index.top('stars', 2)) == ['repo3', 'repo4']
+    assert names(index.top('contributors', 1)) == ['repo3']
+
+    sample_repos[1].language = 'Python'
+    index.update(sample_repos[1])
+    assert 'JavaScript' not in index.languages()
+    assert names(index.top('stars', 2, language='Python')) == ['repo3', 'repo2']
+
+    index.add(Repo('repo6', 50, 0, 'Rust', 10, datetime(2024, 1, 1)))
+    assert names(index.top('recency', 1)) == ['repo6']
+    assert index.remove('repo4').name == 'repo4'
+    assert 'repo4' not in index and len(index) == 5
+    assert names(index.top('stars', 3)) == ['repo3', 'repo6', 'repo2']
+    with pytest.raises(ValueError):
+        index.add(Repo('repo1', 1, 1, 'Python', 1, datetime(2023, 1, 1)))
+
+
+def test_repos_without_a_language_are_filed_once():
+    repos = [Repo('a', 10, 0, None, 1, datetime(2023, 1, 1)), Repo('b', 5, 0, 'Go', 1, datetime(2023, 1, 1))]
+    index = RepoIndex(repos)
+
+    assert names(index.top('stars')) == ['a', 'b']
+    assert names(index.top('stars', language='Unknown')) == ['a']
+    assert index.percentile_rank('a', 'stars') == 75
+    index.remove('a')
+    index.add(repos[0])
+    assert names(index.top('stars')) == ['a', 'b']
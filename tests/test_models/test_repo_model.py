@@ -65,6 +65,21 @@ class TestRepoModel:
         assert breakdown['Java'] == 1
         assert breakdown['C++'] == 1
 
+    def test_get_total_contributor_count(self, sample_repos):
+        sample_repos[0].add_contributors([{'login': 'user1'}, {'login': 'user2'}])
+        sample_repos[1].add_contributors([{'login': 'user2'}, {'login': 'user3'}])
+
+        assert Repo.get_total_contributor_count(sample_repos) == 3
+        assert Repo.get_total_contributor_count(sample_repos, approximate=True) == 3
+
+    def test_merge_contributor_sketches(self, sample_repos):
+        for i, repo in enumerate(sample_repos):
+            repo.add_contributors([{'login': f'user{j}'} for j in range(i * 1000, i * 1000 + 2000)])
+
+        merged = Repo.merge_contributor_sketches(sample_repos)
+        assert not merged.is_exact
+        assert merged.count() == pytest.approx(6000, rel=3 * merged.error_rate)
+
     @pytest.mark.skip(reason="This test requires matplotlib and saves a file")
     def test_create_language_breakdown_chart(self, sample_repos, tmp_path):
         filename = tmp_path / "language_breakdown.png"
@@ -0,0 +1,111 @@
+# tests/test_server/test_server.py
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from aiohttp.test_utils import TestClient, TestServer
+from server import AnalyticsServer
+from services.github_service import GitHubService
+from services.swr_cache import StaleWhileRevalidateCache
+
+
+@pytest.fixture
+def mock_github_service():
+    service = Mock(spec=GitHubService)
+    service.cache = StaleWhileRevalidateCache(maxsize=10, ttl=60, stale_ttl=60)
+    service.rate_limit_remaining = None
+    service.get_token_utilization.return_value = [
+        {'token': '...abcd', 'status': 'active', 'requests': 3, 'remaining': 4997, 'limit': 5000, 'utilization': 0.0006}
+    ]
+    service.close = AsyncMock()
+    return service
+
+
+@pytest.fixture
+async def client(mock_github_service, tmp_path):
+    server = AnalyticsServer(mock_github_service, chart_root=str(tmp_path))
+    async with TestClient(TestServer(server.create_app())) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_health(client):
+    response = await client.get('/health')
+    assert response.status == 200
+    body = await response.json()
+    assert body['status'] == 'ok'
+    assert body['tokens'][0]['requests'] == 3
+
+
+@pytest.mark.asyncio
+async def test_pull_request_analysis(client, mock_github_service):
+    mock_github_service.get_user_repos.return_value = [{'name': 'repo1'}]
+    mock_github_service.get_repo_pull_requests.return_value = [
+        {'number': 1, 'title': 'PR 1', 'state': 'closed', 'created_at': '2023-01-01T00:00:00Z', 'closed_at': '2023-01-02T00:00:00Z'}
+    ]
+
+    response = await client.get('/analysis/pull_requests', params={'username': 'test-user'})
+
+    assert response.status == 200
+    body = await response.json()
+    assert body['pr_stats'] == {'opened': 0, 'closed': 1}
+    assert body['time_to_close']['per_repo']['repo1']['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_repo_analysis_serializes_repos(client, mock_github_service):
+    mock_github_service.get_user_repos.return_value = [
+        {'name': 'repo1', 'stargazers_count': 10, 'forks_count': 5, 'size': 100, 'updated_at': '2023-01-01T00:00:00Z', 'language': 'Python'}
+    ]
+    mock_github_service.get_repo_contributors.return_value = [{'login': 'user1'}]
+
+    with patch('controllers.repo_controller.chart_utils.create_bar_chart'), \
+         patch('models.repo.Repo.create_language_breakdown_chart'), \
+         patch('models.repo.Repo.create_repo_size_distribution_chart'):
+        response = await client.get('/analysis/repos', params={'username': 'test-user'})
+
+    assert response.status == 200
+    body = await response.json()
+    assert body['top_starred'][0]['name'] == 'repo1'
+    assert body['top_starred'][0]['updated_at'] == '2023-01-01T00:00:00'
+    assert body['total_contributor_count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_analysis_and_missing_username(client):
+    assert (await client.get('/analysis/unknown', params={'username': 'test-user'})).status == 404
+    assert (await client.get('/analysis/commits')).status == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('username', ['../outside', '..', 'a/b', 'test_user', 'x' * 40])
+async def test_invalid_usernames_are_rejected(client, mock_github_service, username):
+    assert (await client.get('/analysis/repos', params={'username': username})).status == 400
+    mock_github_service.get_user_repos.assert_not_called()
+
+
+def test_chart_dir_stays_under_chart_root(mock_github_service, tmp_path):
+    server = AnalyticsServer(mock_github_service, chart_root=str(tmp_path))
+
+    assert server._chart_dir('test-user') == str(tmp_path.resolve() / 'test-user')
+    with pytest.raises(ValueError):
+        server._create_controller('commits', '../outside')
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_one_run(mock_github_service, tmp_path):
+    release = asyncio.Event()
+
+    async def slow_repos(username, deadline=None):
+        await release.wait()
+        return []
+
+    mock_github_service.get_user_repos.side_effect = slow_repos
+    server = AnalyticsServer(mock_github_service, chart_root=str(tmp_path))
+
+    tasks = [asyncio.ensure_future(server.run_analysis('commits', 'test-user')) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert mock_github_service.get_user_repos.call_count == 1
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,81 @@
+# tests/test_services/test_checkpoint_store.py
+import pytest
+from aioresponses import aioresponses
+from services.checkpoint_store import CheckpointStore
+from services.github_service import GitHubService, IncompleteFetch
+
+COMMITS_URL = 'https://api.github.com/repos/testuser/testrepo/commits'
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    return str(tmp_path / 'checkpoints' / 'crawl.db')
+
+
+def test_results_and_pages_survive_reopening(checkpoint_path):
+    store = CheckpointStore(checkpoint_path)
+    cursor = CheckpointStore.cursor_key(COMMITS_URL, {'state': 'all'})
+    store.save_result('user_repos_testuser', [{'name': 'repo1'}])
+    store.save_page(cursor, 2, [{'sha': 'b'}])
+    store.save_page(cursor, 1, [{'sha': 'a'}])
+    store.close()
+
+    store = CheckpointStore(checkpoint_path)
+    assert 'user_repos_testuser' in store
+    assert store.load_result('user_repos_testuser') == [{'name': 'repo1'}]
+    assert store.load_pages(cursor) == [[{'sha': 'a'}], [{'sha': 'b'}]]
+    assert store.completed_count() == 1
+
+    store.clear()
+    assert 'user_repos_testuser' not in store
+    assert store.load_pages(cursor) == []
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_crawl_resumes_after_checkpointed_pages(checkpoint_path):
+    first_page = [{'sha': f'commit{i}'} for i in range(100)]
+    second_page = [{'sha': f'commit{i}'} for i in range(100, 150)]
+
+    service = GitHubService('fake_token', checkpoint_store=CheckpointStore(checkpoint_path))
+    with aioresponses() as m:
+        m.get(f'{COMMITS_URL}?page=1&per_page=100', payload=first_page, status=200)
+        m.get(f'{COMMITS_URL}?page=2&per_page=100', status=500)
+        with pytest.raises(IncompleteFetch) as error:
+            await service.get_repo_commits('testuser', 'testrepo')
+    await service.close()
+    service.checkpoint_store.close()
+    assert len(error.value.partial) == 100
+
+    # A new process only fetches the page the first run never got
+    service = GitHubService('fake_token', checkpoint_store=CheckpointStore(checkpoint_path))
+    with aioresponses() as m:
+        m.get(f'{COMMITS_URL}?page=2&per_page=100', payload=second_page, status=200)
+        commits = await service.get_repo_commits('testuser', 'testrepo')
+        assert len(m.requests) == 1
+    await service.close()
+    assert [commit['sha'] for commit in commits] == [f'commit{i}' for i in range(150)]
+    assert service.checkpoint_store.load_pages(CheckpointStore.cursor_key(COMMITS_URL)) == []
+
+    # Once finished, the result is reused without any requests
+    service = GitHubService('fake_token', checkpoint_store=service.checkpoint_store)
+    with aioresponses() as m:
+        assert await service.get_repo_commits('testuser', 'testrepo') == commits
+        assert len(m.requests) == 0
+    await service.close()
+    service.checkpoint_store.close()
+
+
+@pytest.mark.asyncio
+async def test_crawl_stopped_early_clears_its_pages(checkpoint_path):
+    service = GitHubService('fake_token', checkpoint_store=CheckpointStore(checkpoint_path))
+    with aioresponses() as m:
+        m.get(f'{COMMITS_URL}?page=1&per_page=100', payload=[{'sha': f'new{i}'} for i in range(100)], status=200)
+        m.get(f'{COMMITS_URL}?page=2&per_page=100', payload=[{'sha': f'old{i}'} for i in range(100)], status=200)
+        commits, stopped = await service.get_repo_commits_until(
+            'testuser', 'testrepo', lambda page: page[0]['sha'].startswith('old'))
+    await service.close()
+
+    assert stopped and len(commits) == 100
+    assert service.checkpoint_store.load_pages(CheckpointStore.cursor_key(COMMITS_URL)) == []
+    service.checkpoint_store.close()
@@ -1,14 +1,18 @@
 # /tests/test_services/test_github_service.py
+import asyncio
 import pytest
 from unittest.mock import Mock
-from services.github_service import GitHubService
+from services.github_service import GitHubService, IncompleteFetch
+from utils.deadline import Deadline, DeadlineExceeded
 import aiohttp
 from aioresponses import aioresponses
 
 
 @pytest.fixture
-def github_service():
-    return GitHubService("fake_token")
+async def github_service():
+    service = GitHubService("fake_token")
+    yield service
+    await service.close()
 
 
 @pytest.mark.asyncio
@@ -70,14 +74,264 @@ async def test_get_repo_commits_error(github_service):
             exception=aiohttp.ClientError("API Error")
         )
 
-        commits = await github_service.get_repo_commits('testuser', 'testrepo')
+        with pytest.raises(IncompleteFetch) as error:
+            await github_service.get_repo_commits('testuser', 'testrepo')
 
-        assert commits == []  # Check that an empty list is returned
+        assert error.value.partial == []  # Nothing was fetched before the failure
 
         # Check that the error was logged
         github_service.logger.error.assert_called_once_with(
             "Error fetching commits for testrepo: API Error"
         )
 
+
+@pytest.mark.asyncio
+async def test_get_repo_commits_projects_fields(github_service):
+    with aioresponses() as m:
+        m.get(
+            'https://api.github.com/repos/testuser/testrepo/commits?page=1&per_page=100',
+            payload=[{
+                'sha': 'abc123',
+                'commit': {
+                    'author': {'name': 'Test Author', 'email': 'test@example.com', 'date': '2023-07-01T10:00:00Z'},
+                    'committer': {'name': 'Test Author', 'date': '2023-07-01T10:00:00Z'},
+                    'message': 'Test commit',
+                    'verification': {'verified': False}
+                },
+                'author': {'login': 'testuser'},
+                'parents': [{'sha': 'def456'}]
+            }],
+            status=200
+        )
+
+        commits = await github_service.get_repo_commits('testuser', 'testrepo')
+
+        assert commits == [{
+            'sha': 'abc123',
+            'commit': {'author': {'name': 'Test Author', 'date': '2023-07-01T10:00:00Z'}, 'message': 'Test commit'}
+        }]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_share_one_request(github_service):
+    with aioresponses() as m:
+        m.get(
+            'https://api.github.com/users/testuser/repos?page=1&per_page=100',
+            payload=[{'name': 'repo1'}],
+            status=200
+        )
+
+        results = await asyncio.gather(*(github_service.get_user_repos('testuser') for _ in range(5)))
+
+        assert all(repos == [{'name': 'repo1'}] for repos in results)
+        assert len(m.requests) == 1
+        assert len(next(iter(m.requests.values()))) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_not_cached(github_service):
+    github_service.logger = Mock()
+    url = 'https://api.github.com/repos/testuser/testrepo/commits?page=1&per_page=100'
+    with aioresponses() as m:
+        m.get(url, exception=aiohttp.ClientError("API Error"))
+        m.get(url, payload=[{'sha': 'abc123'}], status=200)
+
+        with pytest.raises(IncompleteFetch):
+            await github_service.get_repo_commits('testuser', 'testrepo')
+        assert await github_service.get_repo_commits('testuser', 'testrepo') == [{'sha': 'abc123'}]
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing(github_service):
+    url = 'https://api.github.com/users/testuser/repos?page=1&per_page=100'
+    with aioresponses() as m:
+        m.get(url, payload=[{'name': 'repo1'}], status=200)
+        m.get(url, payload=[{'name': 'repo1'}, {'name': 'repo2'}], status=200)
+
+        assert await github_service.get_user_repos('testuser') == [{'name': 'repo1'}]
+        github_service.cache.get_entry('user_repos_testuser').fetched_at -= github_service.cache.ttl
+
+        # The stale value is returned immediately and a refresh starts in the background
+        assert await github_service.get_user_repos('testuser') == [{'name': 'repo1'}]
+        await github_service._inflight['user_repos_testuser'].future
+        assert await github_service.get_user_repos('testuser') == [{'name': 'repo1'}, {'name': 'repo2'}]
+
+
+@pytest.mark.asyncio
+async def test_deadline_returns_partial_pages_and_cancels_fetch(github_service):
+    async def slow_page(url, **kwargs):
+        await asyncio.sleep(10)
+
+    with aioresponses() as m:
+        m.get(
+            'https://api.github.com/repos/testuser/testrepo/commits?page=1&per_page=100',
+            payload=[{'sha': f'commit{i}'} for i in range(100)],
+            status=200
+        )
+        m.get('https://api.github.com/repos/testuser/testrepo/commits?page=2&per_page=100', callback=slow_page)
+
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            await github_service.get_repo_commits('testuser', 'testrepo', deadline=Deadline(0.2))
+        await asyncio.sleep(0.05)  # Let the cancelled fetch unwind
+
+        assert len(exc_info.value.partial) == 100
+        assert github_service._inflight == {}
+        assert 'repo_commits_testuser/testrepo' not in github_service.cache
+
+
+@pytest.mark.asyncio
+async def test_get_repo_stats_polls_while_computing(github_service, mocker):
+    mocker.patch('services.github_service.STATS_RETRY_DELAY', 0)
+    url = 'https://api.github.com/repos/testuser/testrepo/stats/punch_card'
+    with aioresponses() as m:
+        m.get(url, payload={}, status=202)
+        m.get(url, payload={}, status=202)
+        m.get(url, payload=[[0, 10, 3], [1, 9, 2]], status=200)
+
+        stats = await github_service.get_repo_stats('testuser', 'testrepo', 'punch_card')
+
+        assert stats == [[0, 10, 3], [1, 9, 2]]
+        assert len(next(iter(m.requests.values()))) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_repo_stats_gives_up_after_max_attempts(github_service, mocker):
+    mocker.patch('services.github_service.STATS_RETRY_DELAY', 0)
+    mocker.patch('services.github_service.STATS_MAX_ATTEMPTS', 2)
+    url = 'https://api.github.com/repos/testuser/testrepo/stats/commit_activity'
+    with aioresponses() as m:
+        m.get(url, payload={}, status=202, repeat=True)
+
+        assert await github_service.get_repo_stats('testuser', 'testrepo', 'commit_activity') is None
+        assert 'repo_stats_commit_activity_testuser/testrepo' not in github_service.cache
+
+
+@pytest.mark.asyncio
+async def test_get_repo_stats_rejects_unknown_kind(github_service):
+    with pytest.raises(ValueError):
+        await github_service.get_repo_stats('testuser', 'testrepo', 'code_frequency')
+
+
+@pytest.mark.asyncio
+async def test_get_pull_request_count_for_account_uses_search(github_service):
+    with aioresponses() as m:
+        m.get(
+            'https://api.github.com/search/issues?q=user:testuser+type:pr+state:open&per_page=1',
+            payload={'total_count': 1234, 'incomplete_results': False, 'items': [{}]},
+            status=200
+        )
+
+        assert await github_service.get_pull_request_count('testuser') == 1234
+
+
+@pytest.mark.asyncio
+async def test_get_pull_request_count_for_repo_uses_last_page(github_service):
+    url = 'https://api.github.com/repos/testuser/testrepo/pulls?state=closed&per_page=1'
+    with aioresponses() as m:
+        m.get(
+            url,
+            payload=[{'number': 1}],
+            headers={'Link': '<https://api.github.com/repositories/1/pulls?state=closed&per_page=1&page=2>; rel="next", '
+                             '<https://api.github.com/repositories/1/pulls?state=closed&per_page=1&page=57>; rel="last"'},
+            status=200
+        )
+        m.get('https://api.github.com/repos/testuser/single/pulls?state=closed&per_page=1', payload=[{'number': 1}], status=200)
+        m.get('https://api.github.com/repos/testuser/empty/pulls?state=closed&per_page=1', payload=[], status=200)
+
+        assert await github_service.get_pull_request_count('testuser', 'testrepo', state='closed') == 57
+        assert await github_service.get_pull_request_count('testuser', 'single', state='closed') == 1
+        assert await github_service.get_pull_request_count('testuser', 'empty', state='closed') == 0
+
+
+@pytest.mark.asyncio
+async def test_last_page_is_read_from_a_lowercase_link_header(github_service):
+    url = 'https://api.github.com/repos/testuser/testrepo'
+    with aioresponses() as m:
+        m.get(f'{url}/pulls?state=open&per_page=1', payload=[{'number': 1}], status=200,
+              headers={'link': f'<{url}/pulls?state=open&per_page=1&page=42>; rel="last"'})
+        m.get(f'{url}/commits?per_page=1', payload=[{'sha': 'abc'}], status=200,
+              headers={'link': f'<{url}/commits?per_page=1&page=3000>; rel="last"'})
+
+        assert await github_service.get_pull_request_count('testuser', 'testrepo') == 42
+        assert await github_service.get_repo_commit_count('testuser', 'testrepo') == 3000
+
+
+@pytest.mark.asyncio
+async def test_requests_are_spread_over_tokens_and_rejected_tokens_quarantined():
+    service = GitHubService(['token-a', 'token-b'])
+    url = 'https://api.github.com/repos/testuser/testrepo/commits?page=1&per_page=100'
+    try:
+        with aioresponses() as m:
+            m.get(url, status=200, payload=[{'sha': 'abc123'}],
+                  headers={'X-RateLimit-Remaining': '100', 'X-RateLimit-Limit': '5000', 'X-RateLimit-Reset': '9999999999'})
+            m.get(url, status=401, payload={'message': 'Bad credentials'})
+            m.get(url, status=200, payload=[{'sha': 'def456'}])
+
+            first = await service._make_request(url.split('?')[0], params={'page': 1, 'per_page': 100})
+            second = await service._make_request(url.split('?')[0], params={'page': 1, 'per_page': 100})
+
+            tokens_used = [call.kwargs['headers']['Authorization'] for call in next(iter(m.requests.values()))]
+    finally:
+        await service.close()
+
+    assert first == [{'sha': 'abc123'}]
+    assert second == [{'sha': 'def456'}]
+    # token-a reported 100 left, so token-b got the next request, was rejected, and token-a retried it
+    assert tokens_used == ['token token-a', 'token token-b', 'token token-a']
+    assert [token['status'] for token in service.get_token_utilization()] == ['active', 'quarantined']
+
+
+@pytest.mark.asyncio
+async def test_forbidden_requests_raise_without_quarantining_the_token():
+    service = GitHubService(['token-a', 'token-b'])
+    url = 'https://api.github.com/repos/testuser/testrepo/commits'
+    try:
+        with aioresponses() as m:
+            m.get(f'{url}?page=1&per_page=100', status=403,
+                  payload={'message': 'Resource protected by organization SAML enforcement'})
+
+            with pytest.raises(aiohttp.ClientResponseError):
+                await service._make_request(url, params={'page': 1, 'per_page': 100})
+
+            assert sum(len(calls) for calls in m.requests.values()) == 1
+    finally:
+        await service.close()
+
+    assert [token['status'] for token in service.get_token_utilization()] == ['active', 'active']
+
+
+@pytest.mark.asyncio
+async def test_get_repo_commits_until_stops_at_accepted_page(github_service):
+    url = 'https://api.github.com/repos/testuser/fork/commits'
+    with aioresponses() as m:
+        m.get(f'{url}?page=1&per_page=100', payload=[{'sha': f'new{i}'} for i in range(100)], status=200)
+        m.get(f'{url}?page=2&per_page=100', payload=[{'sha': f'old{i}'} for i in range(100)], status=200)
+
+        commits, stopped = await github_service.get_repo_commits_until(
+            'testuser', 'fork', lambda page: all(commit['sha'].startswith('old') for commit in page))
+
+        assert len(m.requests) == 2  # Page 3 is never requested
+    assert stopped
+    assert [commit['sha'] for commit in commits] == [f'new{i}' for i in range(100)]
+    assert 'repo_commits_testuser/fork' not in github_service.cache
+
+
+@pytest.mark.asyncio
+async def test_get_repo_commit_count_and_sampled_pages(github_service):
+    url = 'https://api.github.com/repos/testuser/big/commits'
+    with aioresponses() as m:
+        m.get(f'{url}?per_page=1', payload=[{'sha': 'newest'}], status=200,
+              headers={'Link': f'<{url}?per_page=1&page=2>; rel="next", <{url}?per_page=1&page=2500>; rel="last"'})
+        m.get(f'{url}?page=1&per_page=100', payload=[{'sha': 'p1', 'extra': 'dropped'}], status=200)
+        m.get(f'{url}?page=13&per_page=100', status=500)
+        m.get(f'{url}?page=25&per_page=100', payload=[{'sha': 'p25'}], status=200)
+
+        assert await github_service.get_repo_commit_count('testuser', 'big') == 2500
+        pages = await github_service.get_repo_commit_pages('testuser', 'big', [1, 13, 25])
+
+    # The failed page is left out and the incomplete sample is not cached
+    assert pages == [[1, [{'sha': 'p1'}]], [25, [{'sha': 'p25'}]]]
+    assert 'repo_commit_pages_testuser/big_1,13,25' not in github_service.cache
+
 if __name__ == '__main__':
     pytest.main()
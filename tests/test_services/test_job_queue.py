@@ -0,0 +1,164 @@
+# tests/test_services/test_job_queue.py
+import asyncio
+import pytest
+from aioresponses import aioresponses
+from services.crawl_worker import QueuedGitHubService, run_worker
+from services.github_service import IncompleteFetch
+from services.job_queue import DONE, FAILED, PENDING, RUNNING, JobQueue
+
+COMMITS_URL = 'https://api.github.com/repos/testuser/{}/commits'
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / 'jobs.db')
+
+
+def test_enqueue_is_idempotent_and_claims_in_order(queue_path):
+    job_queue = JobQueue(queue_path)
+    first = job_queue.enqueue('commits', 'testuser', 'repo1')
+    second = job_queue.enqueue('pulls', 'testuser', 'repo1')
+    assert job_queue.enqueue('commits', 'testuser', 'repo1') == first
+
+    assert job_queue.claim('worker-1').id == first
+    assert job_queue.claim('worker-2').id == second
+    assert job_queue.claim('worker-3') is None
+    assert job_queue.count(RUNNING) == 2
+    job_queue.close()
+
+
+def test_results_are_shared_between_connections(queue_path):
+    coordinator, worker = JobQueue(queue_path), JobQueue(queue_path)
+    job_id = coordinator.enqueue('commits', 'testuser', 'repo1')
+    failing_id = coordinator.enqueue('commits', 'testuser', 'repo2')
+
+    worker.complete(worker.claim('worker-1').id, {'items': [{'sha': 'abc'}], 'cacheable': True})
+    worker.fail(worker.claim('worker-1').id, 'boom')
+
+    finished = {job.id: job for job in coordinator.finished([job_id, failing_id])}
+    assert finished[job_id].status == DONE
+    assert finished[job_id].result == {'items': [{'sha': 'abc'}], 'cacheable': True}
+    assert finished[failing_id].status == FAILED and finished[failing_id].error == 'boom'
+    coordinator.close()
+    worker.close()
+
+
+def test_failed_and_incomplete_jobs_are_retried_when_enqueued_again(queue_path):
+    job_queue = JobQueue(queue_path)
+    failed_id = job_queue.enqueue('commits', 'testuser', 'repo1')
+    partial_id = job_queue.enqueue('commits', 'testuser', 'repo2')
+    done_id = job_queue.enqueue('commits', 'testuser', 'repo3')
+    job_queue.fail(job_queue.claim('worker-1').id, 'boom')
+    job_queue.complete(job_queue.claim('worker-1').id, {'result': [], 'cacheable': False}, final=False)
+    job_queue.complete(job_queue.claim('worker-1').id, {'result': [], 'cacheable': True})
+
+    assert [job_queue.enqueue('commits', 'testuser', name) for name in ('repo1', 'repo2', 'repo3')] == \
+        [failed_id, partial_id, done_id]
+    assert job_queue.get(failed_id).status == PENDING and job_queue.get(failed_id).error is None
+    assert job_queue.get(partial_id).status == PENDING and job_queue.get(partial_id).result is None
+    assert job_queue.get(done_id).status == DONE
+    assert [job_queue.claim('worker-2').id, job_queue.claim('worker-2').id] == [failed_id, partial_id]
+    job_queue.close()
+
+
+def test_jobs_of_unresponsive_workers_are_handed_out_again(queue_path, clock):
+    job_queue = JobQueue(queue_path, job_timeout=60, timer=clock)
+    job_id = job_queue.enqueue('commits', 'testuser', 'repo1')
+    job_queue.claim('worker-1')
+
+    clock.now += 30
+    assert job_queue.claim('worker-2') is None
+    clock.now += 31
+    assert job_queue.claim('worker-2').id == job_id
+    job_queue.close()
+
+
+def test_close_and_reopen(queue_path):
+    job_queue = JobQueue(queue_path)
+    job_queue.close_queue()
+    assert job_queue.is_closed()
+    job_queue.open_queue()
+    assert not job_queue.is_closed()
+    job_queue.enqueue('commits', 'testuser', 'repo1')
+    job_queue.clear()
+    assert job_queue.count(PENDING) == 0
+    job_queue.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_results_are_merged_by_the_coordinator(queue_path, make_commit):
+    job_queue = JobQueue(queue_path)
+    service = QueuedGitHubService('fake_token', job_queue, poll_interval=0.01)
+
+    with aioresponses() as m:
+        m.get(f"{COMMITS_URL.format('repo1')}?page=1&per_page=100",
+              payload=[make_commit('abc123'), make_commit('def456')], status=200)
+        m.get('https://api.github.com/repos/testuser/repo1/contributors?page=1&per_page=100',
+              payload=[{'login': 'user1', 'contributions': 3}], status=200)
+
+        worker = asyncio.ensure_future(run_worker(queue_path, 'worker-1', 'fake_token', concurrency=2,
+                                                  idle_interval=0.01))
+        commits, contributors = await asyncio.gather(
+            service.get_repo_commits('testuser', 'repo1'),
+            service.get_repo_contributors('testuser', 'repo1'),
+        )
+        job_queue.close_queue()
+        assert await worker == 2
+
+    assert [commit['sha'] for commit in commits] == ['abc123', 'def456']
+    assert contributors[0]['login'] == 'user1'
+    assert 'repo_commits_testuser/repo1' in service.cache
+    await service.close()
+    job_queue.close()
+
+
+@pytest.mark.asyncio
+async def test_commits_cut_short_on_a_worker_reach_the_coordinator(queue_path, make_commit):
+    job_queue = JobQueue(queue_path)
+    service = QueuedGitHubService('fake_token', job_queue, poll_interval=0.01)
+    url = COMMITS_URL.format('repo1')
+
+    with aioresponses() as m:
+        m.get(f'{url}?page=1&per_page=100', payload=[make_commit(f'sha{i}') for i in range(100)], status=200)
+        m.get(f'{url}?page=2&per_page=100', status=500)
+
+        worker = asyncio.ensure_future(run_worker(queue_path, 'worker-1', 'fake_token', idle_interval=0.01))
+        with pytest.raises(IncompleteFetch) as error:
+            await service.get_repo_commits('testuser', 'repo1')
+        job_queue.close_queue()
+        await worker
+
+    assert len(error.value.partial) == 100
+    assert 'repo_commits_testuser/repo1' not in service.cache
+    await service.close()
+    job_queue.close()
+
+
+@pytest.mark.asyncio
+async def test_counts_samples_and_fork_crawls_run_on_workers(queue_path, make_commit):
+    job_queue = JobQueue(queue_path)
+    service = QueuedGitHubService('fake_token', job_queue, poll_interval=0.01)
+    big, fork = COMMITS_URL.format('big'), COMMITS_URL.format('fork')
+
+    with aioresponses() as m:
+        m.get(f'{big}?per_page=1', payload=[make_commit('newest')], status=200,
+              headers={'Link': f'<{big}?per_page=1&page=2500>; rel="last"'})
+        m.get(f'{big}?page=25&per_page=100', payload=[make_commit('p25')], status=200)
+        m.get(f'{fork}?page=1&per_page=100', payload=[make_commit(f'new{i}') for i in range(100)], status=200)
+        m.get(f'{fork}?page=2&per_page=100', payload=[make_commit(f'old{i}') for i in range(100)], status=200)
+        m.get(f'{fork}?page=3&per_page=100', payload=[make_commit('unreached')], status=200)
+
+        worker = asyncio.ensure_future(run_worker(queue_path, 'worker-1', 'fake_token', concurrency=2,
+                                                  idle_interval=0.01))
+        count = await service.get_repo_commit_count('testuser', 'big')
+        pages = await service.get_repo_commit_pages('testuser', 'big', [25])
+        commits, stopped = await service.get_repo_commits_until(
+            'testuser', 'fork', lambda page: page[0]['sha'].startswith('old'))
+        job_queue.close_queue()
+        await worker
+
+    assert count == 2500
+    assert [(page, [commit['sha'] for commit in commits]) for page, commits in pages] == [(25, ['p25'])]
+    assert stopped and [commit['sha'] for commit in commits] == [f'new{i}' for i in range(100)]
+    await service.close()
+    job_queue.close()
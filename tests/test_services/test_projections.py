@@ -0,0 +1,36 @@
+# tests/test_services/test_projections.py
+import random
+from benchmarks.synthetic import commit_payload, pull_request_payload, repo_payload
+from models.commit import Commit
+from models.pull_request import PullRequest
+from models.repo import Repo
+from services.projections import FIELD_PROJECTIONS, project
+
+
+def test_project_keeps_only_listed_fields():
+    data = {'a': 1, 'b': {'c': 2, 'd': 3}, 'e': 4}
+    assert project(data, {'a': None, 'b': {'c': None}}) == {'a': 1, 'b': {'c': 2}}
+
+
+def test_project_skips_missing_fields():
+    assert project({'sha': 'abc123'}, FIELD_PROJECTIONS['commits']) == {'sha': 'abc123'}
+
+
+def test_project_without_projection_returns_data():
+    data = {'a': 1}
+    assert project(data, None) is data
+
+
+def test_projected_payloads_still_parse():
+    rng = random.Random(0)
+    raw_commit = commit_payload('octocat', 'repo', 1, rng)
+    raw_pr = pull_request_payload('octocat', 'repo', 1, rng)
+    raw_repo = repo_payload('octocat', 1, rng)
+
+    assert Commit.from_dict(project(raw_commit, FIELD_PROJECTIONS['commits'])) == Commit.from_dict(raw_commit)
+    assert PullRequest.from_dict(project(raw_pr, FIELD_PROJECTIONS['pulls'])) == PullRequest.from_dict(raw_pr)
+    projected_repo, full_repo = Repo.from_dict(project(raw_repo, FIELD_PROJECTIONS['repos'])), Repo.from_dict(raw_repo)
+    for field in ('name', 'stars', 'forks', 'language', 'size', 'updated_at'):
+        assert getattr(projected_repo, field) == getattr(full_repo, field)
+    assert 'parents' not in project(raw_commit, FIELD_PROJECTIONS['commits'])
+    assert project(raw_repo, FIELD_PROJECTIONS['repos'])['fork'] == raw_repo['fork']  # Read by the commit controller
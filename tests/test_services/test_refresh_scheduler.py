@@ -0,0 +1,58 @@
+# tests/test_services/test_refresh_scheduler.py
+import pytest
+from unittest.mock import AsyncMock, Mock
+from services.refresh_scheduler import RefreshScheduler
+from services.swr_cache import StaleWhileRevalidateCache
+
+
+async def noop_refresh(items):
+    return None, True
+
+
+@pytest.fixture
+def clock():
+    return Mock(return_value=0.0)
+
+
+@pytest.fixture
+def github_service(clock):
+    service = Mock()
+    service.cache = StaleWhileRevalidateCache(maxsize=10, ttl=100, stale_ttl=100, timer=clock)
+    service.rate_limit_remaining = None
+    service.refresh = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_refreshes_hot_entries_close_to_expiry(github_service, clock):
+    github_service.cache.put('user_repos_test_user', [], refresh=noop_refresh)
+    github_service.cache.put('repo_commits_test_user/repo1', [], refresh=noop_refresh)
+    github_service.cache.put('repo_commits_test_user/repo2', [], refresh=noop_refresh)
+    github_service.cache.get_entry('repo_commits_test_user/repo1')
+    clock.return_value = 50.0
+    scheduler = RefreshScheduler(github_service, lead_time=60, top_keys=2)
+
+    assert await scheduler.refresh_once() == 2
+
+    refreshed = [call.args[0] for call in github_service.refresh.call_args_list]
+    assert refreshed == ['user_repos_test_user', 'repo_commits_test_user/repo1']
+
+
+@pytest.mark.asyncio
+async def test_skips_entries_not_close_to_expiry(github_service):
+    github_service.cache.put('user_repos_test_user', [], refresh=noop_refresh)
+    scheduler = RefreshScheduler(github_service, lead_time=60)
+
+    assert await scheduler.refresh_once() == 0
+    github_service.refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_respects_rate_limit_reserve(github_service, clock):
+    github_service.cache.put('user_repos_test_user', [], refresh=noop_refresh)
+    github_service.rate_limit_remaining = 100
+    clock.return_value = 90.0
+    scheduler = RefreshScheduler(github_service, lead_time=60, rate_limit_reserve=500)
+
+    assert await scheduler.refresh_once() == 0
+    github_service.refresh.assert_not_called()
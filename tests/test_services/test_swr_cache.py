@@ -0,0 +1,50 @@
+# tests/test_services/test_swr_cache.py
+import pytest
+from services.swr_cache import StaleWhileRevalidateCache
+
+
+@pytest.fixture
+def cache(clock):
+    return StaleWhileRevalidateCache(maxsize=3, ttl=10, stale_ttl=20, timer=clock)
+
+
+def test_fresh_then_stale_then_expired(cache, clock):
+    cache['key'] = 'value'
+    entry = cache.get_entry('key')
+    assert cache.is_fresh(entry)
+
+    clock.now += 15
+    entry = cache.get_entry('key')
+    assert entry.value == 'value'
+    assert not cache.is_fresh(entry)
+    assert 'key' in cache
+
+    clock.now += 16
+    assert cache.get_entry('key') is None
+    assert 'key' not in cache
+
+
+def test_evicts_least_recently_used(cache):
+    for key in ('a', 'b', 'c'):
+        cache[key] = key
+    cache.get_entry('a')
+    cache['d'] = 'd'
+    assert 'b' not in cache
+    assert all(key in cache for key in ('a', 'c', 'd'))
+
+
+def test_hottest_and_refresh_are_kept_on_update(cache):
+    async def refresh(items):
+        return 'new', True
+
+    cache.put('a', 1, refresh=refresh)
+    cache['b'] = 2
+    for _ in range(3):
+        cache.get_entry('a')
+    cache.put('a', 10)
+
+    key, entry = cache.hottest(1)[0]
+    assert key == 'a'
+    assert entry.hits == 3
+    assert entry.refresh is refresh
+    assert entry.value == 10
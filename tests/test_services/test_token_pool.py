@@ -0,0 +1,105 @@
+# tests/test_services/test_token_pool.py
+import pytest
+from services.token_pool import ACTIVE, QUARANTINED, NoTokensAvailable, TokenPool
+
+
+@pytest.fixture
+def pool(clock):
+    return TokenPool(['token-a', 'token-b'], min_remaining=10, timer=clock)
+
+
+def headers(remaining, reset=2000, limit=5000):
+    return {'X-RateLimit-Remaining': str(remaining), 'X-RateLimit-Limit': str(limit), 'X-RateLimit-Reset': str(reset)}
+
+
+def test_routes_to_token_with_most_headroom(pool):
+    first, second = pool.tokens
+    pool.update(first, headers(100))
+    pool.update(second, headers(4000))
+
+    assert pool.acquire() is second
+
+
+def test_counts_requests_in_flight_against_headroom(pool):
+    first, second = pool.tokens
+    pool.update(first, headers(100))
+    pool.update(second, headers(102))
+
+    assert pool.acquire() is second
+    assert pool.acquire() is second
+    assert pool.acquire() is first  # second has 100 left once its two requests land
+
+
+def test_budget_resets_after_reset_time(pool, clock):
+    first, _ = pool.tokens
+    pool.update(first, headers(0, reset=1500))
+    assert pool.remaining(first) == 0
+
+    clock.now = 1500
+    assert pool.remaining(first) == 5000
+
+
+def test_waits_only_when_best_token_is_spent(pool, clock):
+    first, second = pool.tokens
+    pool.update(first, headers(5, reset=1300))
+    pool.update(second, headers(500))
+    assert pool.wait_time(pool.acquire()) == 0
+
+    pool.update(second, headers(3, reset=1600))
+    token = pool.acquire()
+    assert token is first
+    assert pool.wait_time(token) == 300
+
+
+def test_quarantines_rejected_tokens(pool):
+    first, second = pool.tokens
+
+    assert pool.reject(first, 401, {}) is True
+    assert first.status == QUARANTINED
+    assert pool.acquire() is second
+
+    assert pool.reject(second, 403, {}, 'Bad credentials') is False
+    assert second.status == QUARANTINED
+    with pytest.raises(NoTokensAvailable):
+        pool.acquire()
+
+
+def test_other_403s_are_not_retried(pool):
+    first, _ = pool.tokens
+
+    assert pool.reject(first, 403, {}, 'Resource protected by organization SAML enforcement') is False
+    assert first.status == ACTIVE
+
+
+def test_retry_after_cools_the_token_down(pool, clock):
+    first, second = pool.tokens
+
+    assert pool.reject(first, 403, {'Retry-After': '60'}) is True
+    assert first.status == ACTIVE
+    assert pool.acquire() is second
+
+    pool.reject(second, 429, {'Retry-After': '30'})
+    assert pool.wait_time(pool.acquire()) == 30
+    clock.now += 30
+    assert pool.wait_time(second) == 0
+
+
+def test_rate_limited_403_is_not_quarantined(pool):
+    first, _ = pool.tokens
+
+    assert pool.reject(first, 403, headers(0)) is True
+    assert first.status == ACTIVE
+    assert first.remaining == 0
+
+
+def test_utilization_report(pool):
+    first, second = pool.tokens
+    pool.release(pool.acquire())
+    pool.update(first, headers(4000))
+    pool.reject(second, 401, {})
+
+    report = pool.utilization()
+    assert report[0] == {'token': '...en-a', 'status': ACTIVE, 'requests': 1, 'remaining': 4000, 'limit': 5000,
+                         'utilization': pytest.approx(0.2)}
+    assert report[1]['status'] == QUARANTINED
+    assert pool.total_remaining() == 4000
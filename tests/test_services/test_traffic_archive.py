@@ -0,0 +1,63 @@
+# tests/test_services/test_traffic_archive.py
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from services.github_service import GitHubService
+from services.traffic_archive import ReplayMissError, TrafficRecorder, TrafficReplay
+
+COMMITS_URL = 'https://api.github.com/repos/testuser/testrepo/commits'
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    return str(tmp_path / 'traffic.jsonl.gz')
+
+
+def test_replays_responses_in_recorded_order(archive_path):
+    recorder = TrafficRecorder(archive_path)
+    recorder.record('https://api.github.com/stats', {'page': 1}, 202, {}, None)
+    recorder.record('https://api.github.com/stats', {'page': 1}, 200, {'Content-Type': 'application/json'}, [1, 2])
+    recorder.record('https://api.github.com/zip', None, 200, {}, b'\x00\x01')
+    recorder.close()
+
+    replay = TrafficReplay(archive_path)
+    assert len(replay) == 3
+    assert replay.lookup('https://api.github.com/stats', {'page': 1})[0] == 202
+    assert replay.lookup('https://api.github.com/stats', {'page': '1'}) == (200, {'Content-Type': 'application/json'}, [1, 2])
+    assert replay.lookup('https://api.github.com/stats', {'page': 1})[0] == 200  # The last response repeats
+    assert replay.lookup('https://api.github.com/zip')[2] == b'\x00\x01'
+    with pytest.raises(ReplayMissError):
+        replay.lookup('https://api.github.com/unknown')
+
+
+def test_appending_runs_to_one_archive(archive_path):
+    for status in (200, 201):
+        recorder = TrafficRecorder(archive_path)
+        recorder.record(f'https://api.github.com/{status}', None, status, {}, None)
+        recorder.close()
+
+    assert len(TrafficReplay(archive_path)) == 2
+
+
+@pytest.mark.asyncio
+async def test_recorded_run_replays_without_network(archive_path):
+    service = GitHubService('fake_token', traffic_recorder=TrafficRecorder(archive_path))
+    with aioresponses() as m:
+        m.get(f'{COMMITS_URL}?page=1&per_page=100', payload=[{'sha': 'abc123'}], status=200)
+        m.get('https://api.github.com/repos/testuser/broken/commits?page=1&per_page=100', status=500)
+        recorded = await service.get_repo_commits('testuser', 'testrepo')
+        with pytest.raises(aiohttp.ClientResponseError):
+            await service._make_request('https://api.github.com/repos/testuser/broken/commits',
+                                        params={'page': 1, 'per_page': 100})
+    await service.close()
+    service.traffic_recorder.close()
+
+    service = GitHubService('replay', traffic_replay=TrafficReplay(archive_path))
+    with aioresponses() as m:
+        assert await service.get_repo_commits('testuser', 'testrepo') == recorded
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await service._make_request('https://api.github.com/repos/testuser/broken/commits',
+                                        params={'page': 1, 'per_page': 100})
+        assert error.value.status == 500
+        assert len(m.requests) == 0
+    await service.close()
@@ -0,0 +1,34 @@
+# tests/test_utils/test_bloom_filter.py
+import pytest
+from utils.bloom_filter import BloomFilter
+
+
+class TestBloomFilter:
+    def test_exact_mode_for_small_inputs(self):
+        seen = BloomFilter(capacity=1000, exact_threshold=100)
+        assert seen.add('a' * 40) is True
+        assert seen.add('a' * 40) is False
+        assert seen.add('not-a-sha') is True
+        assert 'a' * 40 in seen and 'b' * 40 not in seen
+        assert seen.is_exact
+        assert len(seen) == 2
+
+    def test_switches_to_bits_past_threshold(self):
+        seen = BloomFilter(capacity=1000, exact_threshold=10)
+        shas = [f'{i:040x}' for i in range(11)]
+        for sha in shas:
+            seen.add(sha)
+        assert not seen.is_exact
+        assert all(sha in seen for sha in shas)  # No false negatives
+
+    def test_false_positive_rate_within_bound(self):
+        seen = BloomFilter(capacity=20000, error_rate=0.01)
+        for i in range(20000):
+            seen.add(f'{i:040x}')
+        false_positives = sum(f'{i:040x}' in seen for i in range(20000, 40000))
+        assert false_positives / 20000 < 0.02
+
+    @pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (10, 0), (10, 1)])
+    def test_rejects_invalid_parameters(self, capacity, error_rate):
+        with pytest.raises(ValueError):
+            BloomFilter(capacity, error_rate)
@@ -0,0 +1,92 @@
+# tests/test_utils/test_chart_utils.py
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+import pytest
+from utils import chart_utils
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+@pytest.fixture
+def svg_backend():
+    previous = chart_utils._backend_name
+    chart_utils.set_backend('svg')
+    yield
+    chart_utils.set_backend(previous)
+
+
+def test_chart_filename_uses_backend_extension(svg_backend):
+    assert chart_utils.chart_filename('top_starred') == 'top_starred.svg'
+    chart_utils.set_backend('matplotlib')
+    assert chart_utils.chart_filename('top_starred') == 'top_starred.png'
+
+
+def test_set_backend_rejects_unknown_backends():
+    with pytest.raises(ValueError):
+        chart_utils.set_backend('ascii')
+
+
+def test_svg_bar_chart(svg_backend, tmp_path):
+    filename = tmp_path / 'bar.svg'
+    chart_utils.create_bar_chart([('repo1', 10), ('repo<2>', 5)], 'Top Starred Repositories', 'Repository', 'Stars',
+                                 str(filename))
+
+    root = ET.parse(filename).getroot()
+    bars = [rect for rect in root.iter(SVG + 'rect') if rect.get('fill') != 'white']
+    texts = [text.text for text in root.iter(SVG + 'text')]
+    assert len(bars) == 2
+    assert float(bars[0].get('height')) == pytest.approx(2 * float(bars[1].get('height')))
+    assert 'Top Starred Repositories' in texts
+    assert 'repo<2>' in texts
+
+
+def test_svg_pie_chart(svg_backend, tmp_path):
+    filename = tmp_path / 'pie.svg'
+    chart_utils.create_pie_chart(['Python', 'Go'], [3, 1], 'Repository Language Breakdown', str(filename))
+
+    root = ET.parse(filename).getroot()
+    texts = [text.text for text in root.iter(SVG + 'text')]
+    assert len(list(root.iter(SVG + 'path'))) == 2
+    assert '75.0%' in texts and '25.0%' in texts
+
+
+def test_svg_pie_chart_with_a_single_slice(svg_backend, tmp_path):
+    filename = tmp_path / 'pie.svg'
+    chart_utils.create_pie_chart(['Python'], [4], 'Repository Language Breakdown', str(filename))
+
+    assert len(list(ET.parse(filename).getroot().iter(SVG + 'circle'))) == 1
+
+
+def test_svg_histogram(svg_backend, tmp_path):
+    filename = tmp_path / 'hist.svg'
+    chart_utils.create_histogram([0, 1, 1, 9, 10], 10, 'Distribution of Repository Sizes', 'Size (KB)',
+                                 'Number of Repositories', str(filename))
+
+    bins = [rect for rect in ET.parse(filename).getroot().iter(SVG + 'rect') if rect.get('fill') != 'white']
+    heights = [float(rect.get('height')) for rect in bins]
+    assert len(bins) == 10
+    assert heights[1] == pytest.approx(2 * heights[0])
+    assert heights[-1] == pytest.approx(heights[1])  # The last bin includes the maximum
+    assert heights[4] == 0
+
+
+def test_svg_heatmap(svg_backend, tmp_path):
+    filename = tmp_path / 'heatmap.svg'
+    chart_utils.create_heatmap([[0, 1], [2, 4]], ['Monday', 'Tuesday'], ['0', '1'], 'Commit Activity', str(filename))
+
+    cells = [rect for rect in ET.parse(filename).getroot().iter(SVG + 'rect') if rect.get('fill') != 'white']
+    assert [cell.find(SVG + 'title').text for cell in cells] == ['0', '1', '2', '4']
+    assert cells[0].get('fill') == '#f7fcf5' and cells[-1].get('fill') == '#00441b'
+
+
+def test_svg_backend_does_not_import_matplotlib(tmp_path):
+    script = (
+        "import sys\n"
+        "from utils import chart_utils\n"
+        "from models.repo import Repo\n"
+        "chart_utils.set_backend('svg')\n"
+        f"chart_utils.create_bar_chart([('a', 1)], 't', 'x', 'y', {str(tmp_path / 'a.svg')!r})\n"
+        "assert 'matplotlib' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, '-c', script], check=True)
@@ -0,0 +1,24 @@
+# tests/test_utils/test_deadline.py
+from unittest.mock import Mock
+from utils.deadline import Deadline, DeadlineExceeded
+
+
+def test_remaining_and_expired():
+    timer = Mock(return_value=100.0)
+    deadline = Deadline(10, timer=timer)
+    assert deadline.remaining() == 10
+    assert not deadline.expired
+
+    timer.return_value = 111.0
+    assert deadline.remaining() == 0
+    assert deadline.expired
+
+
+def test_from_budget():
+    assert Deadline.from_budget(None) is None
+    assert Deadline.from_budget(5).remaining() > 0
+
+
+def test_deadline_exceeded_carries_partial_results():
+    assert DeadlineExceeded("late").partial == []
+    assert DeadlineExceeded("late", [1, 2]).partial == [1, 2]
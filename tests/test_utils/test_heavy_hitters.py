@@ -0,0 +1,57 @@
+# tests/test_utils/test_heavy_hitters.py
+import random
+from collections import Counter
+import pytest
+from utils.heavy_hitters import SpaceSaving
+
+
+def zipf_stream(n_items, n_events, seed):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(n_items)]
+    return rng.choices([f'author{i}' for i in range(n_items)], weights=weights, k=n_events)
+
+
+class TestSpaceSaving:
+    def test_exact_when_under_capacity(self):
+        sketch = SpaceSaving(capacity=10)
+        sketch.update(['a', 'b', 'a', 'c', 'a', 'b'])
+        assert sketch.top(2) == [('a', 3), ('b', 2)]
+        assert sketch.error('a') == 0
+
+    def test_top_k_matches_exact_counts(self):
+        stream = zipf_stream(2000, 50000, seed=1)
+        sketch = SpaceSaving(capacity=200)
+        sketch.update(stream)
+        exact = Counter(stream)
+
+        assert [author for author, _ in sketch.top(5)] == [author for author, _ in exact.most_common(5)]
+        for author, count in sketch.top(20):
+            assert exact[author] <= count <= exact[author] + sketch.error(author)
+        assert len(sketch.counts) <= 200
+
+    def test_guarantees_heavy_hitters(self):
+        stream = zipf_stream(5000, 40000, seed=2)
+        sketch = SpaceSaving(capacity=50)
+        sketch.update(stream)
+        threshold = sketch.total / sketch.capacity
+        for author, count in Counter(stream).items():
+            if count > threshold:
+                assert author in sketch.counts
+
+    def test_merge_matches_exact_counts(self):
+        streams = [zipf_stream(1000, 20000, seed=seed) for seed in range(4)]
+        merged = SpaceSaving(capacity=200)
+        for stream in streams:
+            sketch = SpaceSaving(capacity=200)
+            sketch.update(stream)
+            merged.merge(sketch)
+        exact = Counter(author for stream in streams for author in stream)
+
+        assert merged.total == sum(exact.values())
+        assert [author for author, _ in merged.top(5)] == [author for author, _ in exact.most_common(5)]
+        for author, count in merged.top(20):
+            assert exact[author] <= count <= exact[author] + merged.error(author)
+
+    def test_rejects_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            SpaceSaving(capacity=0)
@@ -0,0 +1,57 @@
+# tests/test_utils/test_hyperloglog.py
+import pytest
+from utils.hyperloglog import HyperLogLog
+
+
+class TestHyperLogLog:
+    def test_exact_mode_for_small_inputs(self):
+        sketch = HyperLogLog(exact_threshold=100)
+        sketch.update(['alice', 'bob', 'alice', 'carol'])
+        assert sketch.is_exact
+        assert sketch.registers is None
+        assert sketch.count() == 3
+
+    def test_switches_to_registers_past_threshold(self):
+        sketch = HyperLogLog(exact_threshold=10)
+        sketch.update(f'user{i}' for i in range(11))
+        assert not sketch.is_exact
+        assert sketch.count() == pytest.approx(11, abs=1)
+
+    @pytest.mark.parametrize("error_rate", [0.01, 0.02, 0.05])
+    def test_estimate_within_error_bound(self, error_rate):
+        sketch = HyperLogLog(error_rate=error_rate)
+        sketch.update(f'user{i}' for i in range(50000))
+        assert sketch.count() == pytest.approx(50000, rel=3 * sketch.error_rate)
+
+    def test_merge_counts_union(self):
+        first = HyperLogLog()
+        second = HyperLogLog()
+        first.update(f'user{i}' for i in range(0, 30000))
+        second.update(f'user{i}' for i in range(20000, 50000))
+
+        first.merge(second)
+        assert first.count() == pytest.approx(50000, rel=3 * first.error_rate)
+
+    def test_merge_exact_and_approximate(self):
+        exact = HyperLogLog(exact_threshold=100)
+        exact.update(['alice', 'bob'])
+        approximate = HyperLogLog(exact_threshold=100)
+        approximate.update(f'user{i}' for i in range(5000))
+
+        exact.merge(approximate)
+        assert not exact.is_exact
+        assert exact.count() == pytest.approx(5002, rel=3 * exact.error_rate)
+
+    def test_merge_rejects_different_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(error_rate=0.01).merge(HyperLogLog(error_rate=0.05))
+
+    def test_round_trip_bytes(self):
+        sketch = HyperLogLog(exact_threshold=10)
+        sketch.update(f'user{i}' for i in range(5000))
+        restored = HyperLogLog.from_bytes(sketch.to_bytes())
+        assert restored.count() == sketch.count()
+
+        small = HyperLogLog(exact_threshold=10)
+        small.update(['alice', 'bob'])
+        assert HyperLogLog.from_bytes(small.to_bytes()).count() == 2
@@ -0,0 +1,52 @@
+# tests/test_utils/test_memo_store.py
+from datetime import datetime
+from unittest.mock import Mock
+import pytest
+from models.commit import Commit
+from models.repo import Repo
+from utils.memo_store import MemoStore
+
+
+@pytest.fixture
+def memo_store(tmp_path):
+    return MemoStore(str(tmp_path / 'memo'))
+
+
+def test_fingerprint_is_stable_and_content_addressed(make_commit):
+    first, again, other = (Commit.from_dict(make_commit(sha)) for sha in ('a', 'a', 'b'))
+    assert MemoStore.fingerprint('analysis', [first]) == MemoStore.fingerprint('analysis', [again])
+    assert MemoStore.fingerprint('analysis', [first]) != MemoStore.fingerprint('analysis', [other])
+    assert MemoStore.fingerprint({'b': 1, 'a': 2}) == MemoStore.fingerprint({'a': 2, 'b': 1})
+
+
+def test_fingerprint_includes_repo_contributors():
+    first = Repo('repo1', 1, 1, 'Python', 10, datetime(2023, 1, 1))
+    second = Repo('repo1', 1, 1, 'Python', 10, datetime(2023, 1, 1))
+    second.add_contributors([{'login': 'user1'}])
+    assert MemoStore.fingerprint([first]) != MemoStore.fingerprint([second])
+
+
+def test_memoize_computes_once(memo_store):
+    compute = Mock(return_value={'result': 42})
+    assert memo_store.memoize('key', compute) == ({'result': 42}, False)
+    assert memo_store.memoize('key', compute) == ({'result': 42}, True)
+    compute.assert_called_once()
+
+
+def test_render_chart_skips_unchanged_charts(memo_store, tmp_path):
+    def render(path):
+        with open(path, 'wb') as f:
+            f.write(b'chart bytes')
+
+    render_mock = Mock(side_effect=render)
+    filename = str(tmp_path / 'chart.png')
+
+    assert memo_store.render_chart('key', filename, render_mock) is True
+    assert memo_store.render_chart('key', filename, render_mock) is False
+    render_mock.assert_called_once()
+
+    # A deleted output file is restored from the store without re-rendering
+    (tmp_path / 'chart.png').unlink()
+    assert memo_store.render_chart('key', filename, render_mock) is False
+    assert (tmp_path / 'chart.png').read_bytes() == b'chart bytes'
+    render_mock.assert_called_once()
@@ -0,0 +1,89 @@
+# tests/test_utils/test_profiler.py
+import asyncio
+import time
+import pytest
+from utils.profiler import LoopStallMonitor, PhaseProfiler
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeController:
+    def __init__(self, wall, cpu):
+        self.wall = wall
+        self.cpu = cpu
+
+    def fetch(self, progress_callback):
+        self.wall.now += 2.0
+        self.cpu.now += 0.5
+        progress_callback(1, 'fetch')
+        self.wall.now += 1.0
+        progress_callback(1, 'fetch')
+
+    def analyze(self, progress_callback):
+        self.wall.now += 0.2
+        self.cpu.now += 0.2
+        progress_callback(1, 'stats')
+        self.wall.now += 0.1
+        self.cpu.now += 0.1
+        progress_callback(1, 'streak')
+
+
+def test_phases_are_named_by_their_labels():
+    wall, cpu = FakeTimer(), FakeTimer()
+    profiler = PhaseProfiler(wall_timer=wall, cpu_timer=cpu)
+    steps = []
+    controller = FakeController(wall, cpu)
+
+    callback = profiler.track('FakeController', steps.append)
+    controller.fetch(callback)
+    controller.analyze(callback)
+    wall.now += 0.1
+    profiler.finish('FakeController')
+
+    report = {phase.phase: phase for phase in profiler.report()}
+    assert steps == [1, 1, 1, 1]
+    # Steps of one method are separate phases when they carry different labels
+    assert list(report) == ['fetch', 'stats', 'streak', '(after last step)']
+    assert report['fetch'].steps == 2
+    assert report['fetch'].wall == pytest.approx(3.0)
+    assert report['fetch'].cpu == pytest.approx(0.5)
+    assert report['stats'].cpu == pytest.approx(0.2)
+    assert report['streak'].cpu == pytest.approx(0.1)
+    assert report['(after last step)'].wall == pytest.approx(0.1)
+
+
+def test_stalls_are_charged_to_the_phase_they_happen_in():
+    monitor = LoopStallMonitor(threshold=0.1)
+    profiler = PhaseProfiler(monitor)
+    profiler.start('Controller')
+
+    monitor.record(0.05)
+    profiler.end_phase('Controller', 'fetch', 1)
+    monitor.record(0.5)
+    monitor.record(0.2)
+    profiler.end_phase('Controller', 'analyze', 1)
+
+    fetch, analyze = profiler.report()
+    assert fetch.stalls == 0
+    assert analyze.stalls == 2
+    assert analyze.stall_time == pytest.approx(0.7)
+    assert monitor.longest == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_stall_monitor_detects_blocking_code():
+    monitor = LoopStallMonitor(threshold=0.05, interval=0.005)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # Blocks the event loop
+    await asyncio.sleep(0.02)
+    monitor.stop()
+
+    assert monitor.stalls == 1
+    assert monitor.longest >= 0.05
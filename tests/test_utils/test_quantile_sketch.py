@@ -0,0 +1,56 @@
+# tests/test_utils/test_quantile_sketch.py
+import random
+import pytest
+from utils.quantile_sketch import QuantileSketch
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestQuantileSketch:
+    def test_empty_sketch(self):
+        sketch = QuantileSketch()
+        assert sketch.count == 0
+        assert sketch.quantile(0.5) is None
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(42)
+        values = [rng.lognormvariate(3, 1.5) for _ in range(10000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.99):
+            assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.01)
+
+    def test_zero_values(self):
+        sketch = QuantileSketch()
+        for value in (0, 0, 0, 5):
+            sketch.add(value)
+        assert sketch.quantile(0.5) == 0
+        assert sketch.quantile(1) == 5
+
+    def test_merge_matches_single_sketch(self):
+        rng = random.Random(7)
+        values = [rng.expovariate(0.1) for _ in range(5000)]
+        whole = QuantileSketch()
+        parts = [QuantileSketch() for _ in range(4)]
+        for i, value in enumerate(values):
+            whole.add(value)
+            parts[i % 4].add(value)
+
+        merged = QuantileSketch.merge_all(parts)
+        assert merged.count == whole.count
+        assert merged.bins == whole.bins
+        for q in (0.5, 0.9, 0.99):
+            assert merged.quantile(q) == whole.quantile(q)
+
+    def test_merge_rejects_different_accuracy(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.05))
+
+    def test_rejects_negative_values(self):
+        with pytest.raises(ValueError):
+            QuantileSketch().add(-1)
@@ -0,0 +1,33 @@
+# tests/test_utils/test_sampling.py
+import random
+import pytest
+from utils.sampling import confidence_interval, ratio_estimate, spread_pages
+
+
+def test_spread_pages_covers_first_and_last_page():
+    assert spread_pages(100, 5) == [1, 26, 51, 75, 100]
+    assert spread_pages(3, 10) == [1, 2, 3]
+    assert spread_pages(50, 2) == [1, 50]
+
+
+def test_ratio_estimate_is_exact_for_a_full_sample():
+    estimate, variance = ratio_estimate(300, 3, [10, 20, 30], [100, 100, 100])
+    assert estimate == pytest.approx(60)
+    assert variance == 0
+
+
+def test_ratio_estimate_interval_covers_true_count():
+    rng = random.Random(42)
+    pages = [[rng.random() < 0.3 for _ in range(100)] for _ in range(1000)]
+    true_count = sum(sum(page) for page in pages)
+    sample = [pages[i - 1] for i in spread_pages(len(pages), 20)]
+
+    estimate, variance = ratio_estimate(100_000, len(pages), [sum(page) for page in sample], [len(page) for page in sample])
+    low, high = confidence_interval(estimate, variance, 1.96)
+
+    assert low <= true_count <= high
+    assert high - low < 0.2 * true_count
+
+
+def test_confidence_interval_is_not_negative():
+    assert confidence_interval(1.0, 4.0, 1.96) == (0.0, pytest.approx(4.92))
@@ -0,0 +1,78 @@
+# tests/test_views/test_report_writer.py
+import csv
+import io
+import json
+from datetime import datetime
+import pytest
+from models.repo import Repo
+from views.report_writer import NDJSONReportWriter, ReportWriter, create_report_writer
+
+
+def make_analysis():
+    repo = Repo('repo1', 10, 2, 'Python', 100, datetime(2023, 1, 1))
+    return {
+        'top_starred': [repo],
+        'top_authors': {'overall': [('alice', 3)], 'per_repo': {'repo1': [('alice', 3)]}},
+        'coverage': {'repo1': 'complete'},
+    }
+
+
+def test_ndjson_writes_one_record_per_line():
+    stream = io.StringIO()
+    writer = NDJSONReportWriter(stream)
+    writer.write_rows('commits', [{'repo': 'repo1', 'sha': 'a', 'date': datetime(2023, 7, 1)}])
+    writer.write_analysis('repos', make_analysis())
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0] == {'record': 'commits', 'repo': 'repo1', 'sha': 'a', 'date': '2023-07-01T00:00:00'}
+    assert records[1]['section'] == 'repos'
+    assert records[1]['data']['top_starred'][0]['name'] == 'repo1'
+
+
+def test_json_streams_a_single_array(tmp_path):
+    path = tmp_path / 'report.json'
+    writer = create_report_writer('json', str(path))
+    writer.write_rows('pull_requests', [{'repo': 'repo1', 'number': 1}, {'repo': 'repo1', 'number': 2}])
+    writer.write_analysis('pull_requests', {'pr_stats': {'opened': 1, 'closed': 1}})
+    # Rows are in the file before the report is finished
+    assert '"number": 2' in path.read_text()
+    writer.close()
+
+    records = json.loads(path.read_text())
+    assert [record['record'] for record in records] == ['pull_requests', 'pull_requests', 'analysis']
+
+
+def test_json_empty_report_is_valid(tmp_path):
+    create_report_writer('json', str(tmp_path / 'report.json')).close()
+    assert json.loads((tmp_path / 'report.json').read_text()) == []
+
+
+def test_csv_writes_a_file_per_table(tmp_path):
+    writer = create_report_writer('csv', str(tmp_path / 'report.csv'))
+    writer.write_rows('commits', [{'repo': 'repo1', 'sha': 'a'}])
+    writer.write_rows('commits', [{'repo': 'repo2', 'sha': 'b'}])
+    writer.write_analysis('commits', make_analysis())
+    writer.close()
+
+    with open(tmp_path / 'report-commits.csv', newline='') as f:
+        assert list(csv.DictReader(f)) == [{'repo': 'repo1', 'sha': 'a'}, {'repo': 'repo2', 'sha': 'b'}]
+    with open(tmp_path / 'report-summary.csv', newline='') as f:
+        summary = {row['key']: row['value'] for row in csv.DictReader(f)}
+    assert summary['coverage.repo1'] == 'complete'
+    assert json.loads(summary['top_authors.per_repo.repo1']) == [['alice', 3]]
+
+
+def test_create_report_writer_rejects_csv_on_stdout():
+    with pytest.raises(ValueError):
+        create_report_writer('csv')
+    with pytest.raises(ValueError):
+        create_report_writer('xml')
+
+
+def test_report_writers_must_implement_both_writes():
+    class RowsOnly(ReportWriter):
+        def write_rows(self, table, rows):
+            pass
+
+    with pytest.raises(TypeError):
+        RowsOnly()
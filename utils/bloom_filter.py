@@ -0,0 +1,84 @@
+# utils/bloom_filter.py
+import hashlib
+import math
+from typing import Iterable, Optional, Set
+
+
+class BloomFilter:
+    """Set membership with no false negatives and a bounded false-positive rate.
+
+    While at most ``exact_threshold`` items have been added they are kept in a
+    set and membership is exact; past that they are folded into a bit array
+    sized for ``capacity`` items at ``error_rate`` false positives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, exact_threshold: int = 0):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.exact_threshold = exact_threshold
+        self.exact_items: Optional[Set[bytes]] = set()
+        self.bits: Optional[bytearray] = None
+        self.count = 0
+        if exact_threshold <= 0:
+            self._to_bits()
+
+    @property
+    def is_exact(self) -> bool:
+        return self.exact_items is not None
+
+    @staticmethod
+    def _key(item: str) -> bytes:
+        # Hex SHAs are stored as their 20 raw bytes
+        try:
+            return bytes.fromhex(item)
+        except ValueError:
+            return item.encode('utf-8')
+
+    def _positions(self, key: bytes) -> Iterable[int]:
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+    def _add_to_bits(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def _to_bits(self) -> None:
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        for key in self.exact_items or ():
+            self._add_to_bits(key)
+        self.exact_items = None
+
+    def add(self, item: str) -> bool:
+        """Adds ``item`` and returns whether it was (probably) new."""
+        key = self._key(item)
+        if self.exact_items is not None:
+            if key in self.exact_items:
+                return False
+            self.exact_items.add(key)
+            self.count += 1
+            if len(self.exact_items) > self.exact_threshold:
+                self._to_bits()
+            return True
+        if self._contains_key(key):
+            return False
+        self._add_to_bits(key)
+        self.count += 1
+        return True
+
+    def _contains_key(self, key: bytes) -> bool:
+        if self.exact_items is not None:
+            return key in self.exact_items
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __contains__(self, item: str) -> bool:
+        return self._contains_key(self._key(item))
+
+    def __len__(self) -> int:
+        return self.count
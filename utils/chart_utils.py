@@ -1,30 +1,56 @@
 # utils/chart_utils.py
-import matplotlib.pyplot as plt
+import importlib
+from config import CHART_BACKEND
+
+# Backends are imported on first use, so the SVG backend never pays for importing matplotlib
+CHART_BACKENDS = {
+    "matplotlib": "utils.matplotlib_charts",
+    "svg": "utils.svg_charts",
+}
+
+_backend_name = CHART_BACKEND
+
+
+def set_backend(name: str) -> None:
+    global _backend_name
+    if name not in CHART_BACKENDS:
+        raise ValueError(f"Unknown chart backend: {name}")
+    _backend_name = name
+
+
+def get_backend_name() -> str:
+    return _backend_name
+
+
+def get_backend():
+    return importlib.import_module(CHART_BACKENDS[_backend_name])
+
+
+def chart_filename(name: str) -> str:
+    return name + get_backend().FILE_EXTENSION
 
 
 def create_bar_chart(data, title, xlabel, ylabel, filename):
-    plt.figure(figsize=(10, 6))
-    plt.bar(range(len(data)), [item[1] for item in data], align='center')
-    plt.title(title)
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.xticks(range(len(data)), [item[0] for item in data], rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(filename)
-    plt.close()
+    get_backend().bar_chart(data, title, xlabel, ylabel, filename)
+
+
+def create_pie_chart(labels, values, title, filename):
+    get_backend().pie_chart(labels, values, title, filename)
+
+
+def create_histogram(values, bins, title, xlabel, ylabel, filename):
+    get_backend().histogram(values, bins, title, xlabel, ylabel, filename)
+
+
+def create_heatmap(matrix, row_labels, column_labels, title, filename):
+    get_backend().heatmap(matrix, row_labels, column_labels, title, filename)
 
 
 def create_pr_stats_chart(total_prs_opened, total_prs_closed):
-    plt.figure(figsize=(10, 6))
-    plt.bar(['Opened PRs', 'Closed PRs'], [total_prs_opened, total_prs_closed])
-    plt.title("Pull Request Statistics")
-    plt.savefig("pr_stats.png")
-    plt.close()
+    create_bar_chart([('Opened PRs', total_prs_opened), ('Closed PRs', total_prs_closed)],
+                     "Pull Request Statistics", "", "", chart_filename("pr_stats"))
 
 
 def create_commit_patterns_chart(avg_commit_frequency, longest_streak):
-    plt.figure(figsize=(10, 6))
-    plt.bar(['Avg. Daily Commits', 'Longest Streak (days)'], [avg_commit_frequency, longest_streak])
-    plt.title("Commit Patterns")
-    plt.savefig("commit_patterns.png")
-    plt.close()
+    create_bar_chart([('Avg. Daily Commits', avg_commit_frequency), ('Longest Streak (days)', longest_streak)],
+                     "Commit Patterns", "", "", chart_filename("commit_patterns"))
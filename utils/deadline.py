@@ -0,0 +1,33 @@
+# utils/deadline.py
+import time
+from typing import Any, Callable, List, Optional
+
+# Per-repo completeness of a deadline-bounded fetch
+COMPLETE = "complete"
+TRUNCATED = "truncated"
+SKIPPED = "skipped"
+# A fork whose crawl stopped where its history joins one already fetched
+SHARED_HISTORY = "shared_history"
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, message: str, partial: Optional[List[Any]] = None):
+        super().__init__(message)
+        self.partial: List[Any] = partial if partial is not None else []
+
+
+class Deadline:
+    def __init__(self, seconds: float, timer: Callable[[], float] = time.monotonic):
+        self.timer = timer
+        self.expires_at = timer() + seconds
+
+    @classmethod
+    def from_budget(cls, seconds: Optional[float]) -> Optional['Deadline']:
+        return cls(seconds) if seconds is not None else None
+
+    def remaining(self) -> float:
+        return max(self.expires_at - self.timer(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
@@ -0,0 +1,66 @@
+# utils/heavy_hitters.py
+from typing import Dict, Iterable, List, Tuple
+
+
+class SpaceSaving:
+    """Bounded-memory heavy-hitters sketch (Space-Saving).
+
+    At most ``capacity`` items are tracked. Any item whose true count exceeds
+    ``total / capacity`` is guaranteed to be tracked, and every reported count
+    overestimates the true count by at most ``error(item)``.
+    """
+
+    def __init__(self, capacity: int = 100):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+            return
+
+        # Replace the least frequent item; the newcomer inherits its count as error
+        evicted = min(self.counts, key=self.counts.get)
+        evicted_count = self.counts.pop(evicted)
+        del self.errors[evicted]
+        self.counts[item] = evicted_count + count
+        self.errors[item] = evicted_count
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    @property
+    def min_count(self) -> int:
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other: 'SpaceSaving') -> None:
+        self_floor, other_floor = self.min_count, other.min_count
+        counts: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        for item in self.counts.keys() | other.counts.keys():
+            # An item missing from a full summary may still have occurred up to its minimum count
+            counts[item] = self.counts.get(item, self_floor) + other.counts.get(item, other_floor)
+            errors[item] = self.errors.get(item, self_floor) + other.errors.get(item, other_floor)
+
+        kept = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+        self.total += other.total
+
+    def error(self, item: str) -> int:
+        return self.errors.get(item, self.min_count)
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda entry: (-entry[1], entry[0]))[:k]
@@ -0,0 +1,128 @@
+# utils/hyperloglog.py
+import hashlib
+import math
+from typing import Iterable, Optional, Set
+
+
+class HyperLogLog:
+    """Mergeable approximate distinct counter.
+
+    While at most ``exact_threshold`` distinct items have been seen the items
+    themselves are kept and ``count`` is exact; past that they are folded into
+    HyperLogLog registers. Hashing is deterministic, so sketches persisted with
+    ``to_bytes`` in one run can be merged with sketches from another.
+    """
+
+    MIN_PRECISION = 4
+    MAX_PRECISION = 16
+
+    def __init__(self, error_rate: float = 0.02, exact_threshold: int = 0):
+        self.precision = self._precision_for(error_rate)
+        self.exact_threshold = exact_threshold
+        self.exact_items: Optional[Set[str]] = set()
+        self.registers: Optional[bytearray] = None
+        if exact_threshold <= 0:
+            self._to_registers()
+
+    @classmethod
+    def _precision_for(cls, error_rate: float) -> int:
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        # Standard error of HyperLogLog is ~1.04 / sqrt(m)
+        precision = math.ceil(math.log2((1.04 / error_rate) ** 2))
+        return min(max(precision, cls.MIN_PRECISION), cls.MAX_PRECISION)
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[str], error_rate: float = 0.02, exact_threshold: int = 0) -> 'HyperLogLog':
+        sketch = cls(error_rate, exact_threshold)
+        sketch.update(items)
+        return sketch
+
+    @property
+    def num_registers(self) -> int:
+        return 1 << self.precision
+
+    @property
+    def error_rate(self) -> float:
+        return 1.04 / math.sqrt(self.num_registers)
+
+    @property
+    def is_exact(self) -> bool:
+        return self.exact_items is not None
+
+    @staticmethod
+    def _hash(item: str) -> int:
+        return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def _add_to_registers(self, item: str) -> None:
+        hashed = self._hash(item)
+        index = hashed >> (64 - self.precision)
+        remaining = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def _to_registers(self) -> None:
+        if self.registers is None:
+            self.registers = bytearray(self.num_registers)
+        for item in self.exact_items or ():
+            self._add_to_registers(item)
+        self.exact_items = None
+
+    def add(self, item: str) -> None:
+        if self.exact_items is None:
+            self._add_to_registers(item)
+            return
+        self.exact_items.add(item)
+        if len(self.exact_items) > self.exact_threshold:
+            self._to_registers()
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+
+        if other.exact_items is not None:
+            self.update(other.exact_items)
+            return
+
+        self._to_registers()
+        for i, value in enumerate(other.registers):
+            if value > self.registers[i]:
+                self.registers[i] = value
+
+    def count(self) -> int:
+        if self.exact_items is not None:
+            return len(self.exact_items)
+
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -value for value in self.registers)
+        zero_registers = self.registers.count(0)
+        if estimate <= 2.5 * m and zero_registers:
+            # Small-range correction: linear counting is more accurate here
+            estimate = m * math.log(m / zero_registers)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        registers = self.registers
+        if self.exact_items is not None:
+            # Exact items are persisted as registers; a restored sketch is approximate
+            snapshot = HyperLogLog.from_bytes(bytes([self.precision]) + bytes(self.num_registers))
+            snapshot.update(self.exact_items)
+            registers = snapshot.registers
+        return bytes([self.precision]) + bytes(registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        sketch = cls.__new__(cls)
+        sketch.precision = data[0]
+        sketch.exact_threshold = 0
+        sketch.exact_items = None
+        sketch.registers = bytearray(data[1:])
+        if len(sketch.registers) != sketch.num_registers:
+            raise ValueError("Serialized HyperLogLog has the wrong number of registers")
+        return sketch
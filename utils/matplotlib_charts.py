@@ -0,0 +1,48 @@
+# utils/matplotlib_charts.py
+from typing import List, Sequence, Tuple
+import matplotlib.pyplot as plt
+
+FILE_EXTENSION = ".png"
+
+
+def bar_chart(data: List[Tuple[str, float]], title: str, xlabel: str, ylabel: str, filename: str) -> None:
+    plt.figure(figsize=(10, 6))
+    plt.bar(range(len(data)), [item[1] for item in data], align='center')
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.xticks(range(len(data)), [item[0] for item in data], rotation=45, ha='right')
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
+
+
+def pie_chart(labels: Sequence[str], values: Sequence[float], title: str, filename: str) -> None:
+    plt.figure(figsize=(10, 6))
+    plt.pie(values, labels=labels, autopct='%1.1f%%')
+    plt.title(title)
+    plt.savefig(filename)
+    plt.close()
+
+
+def histogram(values: Sequence[float], bins: int, title: str, xlabel: str, ylabel: str, filename: str) -> None:
+    plt.figure(figsize=(10, 6))
+    plt.hist(values, bins=bins)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.savefig(filename)
+    plt.close()
+
+
+def heatmap(matrix: Sequence[Sequence[float]], row_labels: Sequence[str], column_labels: Sequence[str],
+            title: str, filename: str) -> None:
+    plt.figure(figsize=(12, 5))
+    plt.imshow(matrix, aspect='auto', cmap='Greens')
+    plt.colorbar()
+    plt.title(title)
+    plt.yticks(range(len(row_labels)), row_labels)
+    plt.xticks(range(len(column_labels)), column_labels)
+    plt.tight_layout()
+    plt.savefig(filename)
+    plt.close()
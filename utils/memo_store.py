@@ -0,0 +1,99 @@
+# utils/memo_store.py
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from dataclasses import is_dataclass
+from typing import Any, Callable, Optional, Tuple
+from models.repo import Repo
+from utils.heavy_hitters import SpaceSaving
+from utils.quantile_sketch import QuantileSketch
+from utils.serialization import to_serializable
+
+# Bump when an analysis or chart changes shape so stale entries stop matching
+MEMO_VERSION = 3
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, Repo):
+        return {**value.to_dict(), 'contributors': sorted(contributor['login'] for contributor in value.contributors)}
+    if isinstance(value, SpaceSaving):
+        return {'capacity': value.capacity, 'counts': value.counts, 'errors': value.errors, 'total': value.total}
+    if isinstance(value, QuantileSketch):
+        return {'gamma': value.gamma, 'bins': value.bins, 'zero_count': value.zero_count,
+                'min': value.min, 'max': value.max}
+    if is_dataclass(value) and not isinstance(value, type):
+        return {key: _canonical(item) for key, item in vars(value).items()}
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return to_serializable(value)
+
+
+class MemoStore:
+    """On-disk store of analysis results and rendered charts, addressed by a fingerprint of their inputs."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, 'analyses'), exist_ok=True)
+        os.makedirs(os.path.join(directory, 'charts'), exist_ok=True)
+
+    @staticmethod
+    def fingerprint(*parts: Any) -> str:
+        encoded = json.dumps(_canonical([MEMO_VERSION, *parts]), sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def _analysis_path(self, key: str) -> str:
+        return os.path.join(self.directory, 'analyses', f"{key}.pkl")
+
+    def _chart_path(self, key: str, filename: str) -> str:
+        return os.path.join(self.directory, 'charts', key + os.path.splitext(filename)[1])
+
+    def _atomic_write(self, path: str, write: Callable[[Any], None]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._analysis_path(key), 'rb') as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        self._atomic_write(self._analysis_path(key), lambda f: pickle.dump(value, f))
+
+    def memoize(self, key: str, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def render_chart(self, key: str, filename: str, render: Callable[[str], None]) -> bool:
+        # Returns True if the chart had to be rendered, False if it came from the store
+        stored = self._chart_path(key, filename)
+        if os.path.exists(stored):
+            if not (os.path.exists(filename) and _file_digest(filename) == _file_digest(stored)):
+                shutil.copyfile(stored, filename)
+            return False
+
+        render(filename)
+        with open(filename, 'rb') as source:
+            self._atomic_write(stored, lambda f: shutil.copyfileobj(source, f))
+        return True
+
+
+def _file_digest(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
@@ -0,0 +1,108 @@
+# utils/profiler.py
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class PhaseTiming:
+    controller: str
+    phase: str
+    steps: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    stalls: int = 0
+    stall_time: float = 0.0
+
+
+class LoopStallMonitor:
+    """Detects blocking code by measuring how late a short sleep wakes up.
+
+    A wake-up more than ``threshold`` seconds late means something held the
+    event loop (JSON decoding, model building, chart rendering...) that long.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.01, timer: Callable[[], float] = time.perf_counter):
+        self.threshold = threshold
+        self.interval = interval
+        self.timer = timer
+        self.stalls = 0
+        self.stall_time = 0.0
+        self.longest = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, lag: float) -> None:
+        if lag >= self.threshold:
+            self.stalls += 1
+            self.stall_time += lag
+            self.longest = max(self.longest, lag)
+
+    async def _run(self) -> None:
+        while True:
+            started = self.timer()
+            await asyncio.sleep(self.interval)
+            self.record(self.timer() - started - self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class PhaseProfiler:
+    """Wall time, CPU time and loop stalls per controller phase.
+
+    A phase is the work between two progress_callback calls, attributed to the
+    phase label passed with the later call. CPU time and stalls are
+    process-wide, so they are only meaningful per phase when controllers run
+    one at a time.
+    """
+
+    def __init__(self, stall_monitor: Optional[LoopStallMonitor] = None,
+                 wall_timer: Callable[[], float] = time.perf_counter,
+                 cpu_timer: Callable[[], float] = time.process_time):
+        self.stall_monitor = stall_monitor
+        self.wall_timer = wall_timer
+        self.cpu_timer = cpu_timer
+        self.phases: Dict[Tuple[str, str], PhaseTiming] = {}
+        self._marks: Dict[str, Tuple[float, float, int, float]] = {}
+
+    def _mark(self) -> Tuple[float, float, int, float]:
+        if self.stall_monitor is None:
+            return self.wall_timer(), self.cpu_timer(), 0, 0.0
+        return self.wall_timer(), self.cpu_timer(), self.stall_monitor.stalls, self.stall_monitor.stall_time
+
+    def start(self, controller: str) -> None:
+        self._marks[controller] = self._mark()
+
+    def end_phase(self, controller: str, phase: str, steps: int = 0) -> None:
+        mark = self._mark()
+        wall, cpu, stalls, stall_time = (now - before for now, before in zip(mark, self._marks[controller]))
+        self._marks[controller] = mark
+        timing = self.phases.setdefault((controller, phase), PhaseTiming(controller, phase))
+        timing.steps += steps
+        timing.wall += wall
+        timing.cpu += cpu
+        timing.stalls += stalls
+        timing.stall_time += stall_time
+
+    def track(self, controller: str, progress_callback: Callable[[int], None]) -> Callable[[int, str], None]:
+        self.start(controller)
+
+        def callback(steps: int, phase: str) -> None:
+            self.end_phase(controller, phase, steps)
+            progress_callback(steps)
+
+        return callback
+
+    def finish(self, controller: str) -> None:
+        # Whatever ran after the last progress step, e.g. assembling or memoizing results
+        self.end_phase(controller, "(after last step)")
+
+    def report(self) -> List[PhaseTiming]:
+        return list(self.phases.values())
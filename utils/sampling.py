@@ -0,0 +1,39 @@
+# utils/sampling.py
+import math
+from typing import List, Sequence, Tuple
+
+
+def spread_pages(page_count: int, sample_size: int) -> List[int]:
+    # Evenly spaced 1-based page numbers, always including the first and last page
+    if sample_size >= page_count:
+        return list(range(1, page_count + 1))
+    if sample_size < 2:
+        return [1, page_count][:max(sample_size, 0)]
+    step = (page_count - 1) / (sample_size - 1)
+    return sorted({1 + int(i * step + 0.5) for i in range(sample_size)})
+
+
+def ratio_estimate(total: int, cluster_count: int, counts: Sequence[int],
+                   sizes: Sequence[int]) -> Tuple[float, float]:
+    """Estimate how many of `total` items have some property from a sample of whole clusters (pages).
+
+    counts[i] is how many of the sizes[i] items in sampled cluster i have it. Returns the estimate and its
+    variance; items on one page are neighbours in history, so the variance is taken between pages, not items.
+    """
+    sampled = sum(sizes)
+    if not sampled:
+        return 0.0, 0.0
+    ratio = sum(counts) / sampled
+    estimate = total * ratio
+    k = len(sizes)
+    if k < 2 or k >= cluster_count:
+        return estimate, 0.0
+    mean_size = sampled / k
+    residual_variance = sum((count - ratio * size) ** 2 for count, size in zip(counts, sizes)) / (k - 1)
+    finite_population_correction = 1 - k / cluster_count
+    return estimate, total ** 2 * finite_population_correction * residual_variance / (k * mean_size ** 2)
+
+
+def confidence_interval(estimate: float, variance: float, z: float) -> Tuple[float, float]:
+    margin = z * math.sqrt(variance)
+    return max(estimate - margin, 0.0), estimate + margin
@@ -0,0 +1,24 @@
+# utils/serialization.py
+import base64
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from typing import Any
+from models.repo import Repo
+from utils.hyperloglog import HyperLogLog
+
+
+def to_serializable(value: Any) -> Any:
+    if isinstance(value, Repo):
+        return value.to_dict()
+    if isinstance(value, HyperLogLog):
+        # Sketches are exported in their mergeable binary form
+        return base64.b64encode(value.to_bytes()).decode('ascii')
+    if is_dataclass(value) and not isinstance(value, type):
+        return to_serializable(asdict(value))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(key): to_serializable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_serializable(item) for item in value]
+    return value
@@ -0,0 +1,158 @@
+# utils/svg_charts.py
+# Dependency-free SVG renderer for the simple charts this project draws.
+import math
+from typing import List, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+FILE_EXTENSION = ".svg"
+
+WIDTH, HEIGHT = 1000, 600
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 80, 30, 60, 140
+BAR_COLOR = "#1f77b4"
+HEATMAP_LOW, HEATMAP_HIGH = (247, 252, 245), (0, 68, 27)
+PIE_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+              "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
+
+
+def _text(x: float, y: float, content: str, size: int = 12, anchor: str = "middle", transform: str = "") -> str:
+    transform_attr = f' transform="{transform}"' if transform else ""
+    return (f'<text x="{x:.1f}" y="{y:.1f}" font-size="{size}" font-family="sans-serif" '
+            f'text-anchor="{anchor}"{transform_attr}>{escape(str(content))}</text>')
+
+
+def _document(elements: List[str]) -> str:
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+            f'viewBox="0 0 {WIDTH} {HEIGHT}">\n'
+            f'<rect width="{WIDTH}" height="{HEIGHT}" fill="white"/>\n'
+            + "\n".join(elements) + "\n</svg>\n")
+
+
+def _write(filename: str, elements: List[str]) -> None:
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(_document(elements))
+
+
+def _nice_step(max_value: float, ticks: int = 5) -> float:
+    if max_value <= 0:
+        return 1
+    raw_step = max_value / ticks
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    for multiplier in (1, 2, 5, 10):
+        if raw_step <= multiplier * magnitude:
+            return multiplier * magnitude
+    return 10 * magnitude
+
+
+def _axes(title: str, xlabel: str, ylabel: str, max_value: float) -> Tuple[List[str], float]:
+    plot_width = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_height = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    step = _nice_step(max_value)
+    top = max(step * math.ceil(max_value / step), step)
+    elements = [
+        _text(WIDTH / 2, MARGIN_TOP / 2, title, size=18),
+        _text(WIDTH / 2, HEIGHT - 10, xlabel, size=14),
+        _text(20, MARGIN_TOP + plot_height / 2, ylabel, size=14, transform=f"rotate(-90 20 {MARGIN_TOP + plot_height / 2:.1f})"),
+        f'<line x1="{MARGIN_LEFT}" y1="{MARGIN_TOP + plot_height}" x2="{MARGIN_LEFT + plot_width}" '
+        f'y2="{MARGIN_TOP + plot_height}" stroke="black"/>',
+        f'<line x1="{MARGIN_LEFT}" y1="{MARGIN_TOP}" x2="{MARGIN_LEFT}" y2="{MARGIN_TOP + plot_height}" stroke="black"/>',
+    ]
+    tick = 0.0
+    while tick <= top + step / 2:
+        y = MARGIN_TOP + plot_height - tick / top * plot_height
+        label = f"{tick:g}"
+        elements.append(f'<line x1="{MARGIN_LEFT - 5}" y1="{y:.1f}" x2="{MARGIN_LEFT}" y2="{y:.1f}" stroke="black"/>')
+        elements.append(_text(MARGIN_LEFT - 8, y + 4, label, anchor="end"))
+        tick += step
+    return elements, top
+
+
+def bar_chart(data: List[Tuple[str, float]], title: str, xlabel: str, ylabel: str, filename: str) -> None:
+    plot_width = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_height = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    elements, top = _axes(title, xlabel, ylabel, max((value for _, value in data), default=0))
+    slot = plot_width / max(len(data), 1)
+    for i, (label, value) in enumerate(data):
+        bar_height = value / top * plot_height
+        x = MARGIN_LEFT + i * slot + slot * 0.1
+        y = MARGIN_TOP + plot_height - bar_height
+        elements.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{slot * 0.8:.1f}" height="{bar_height:.1f}" fill="{BAR_COLOR}"/>')
+        label_x = MARGIN_LEFT + (i + 0.5) * slot
+        label_y = MARGIN_TOP + plot_height + 15
+        elements.append(_text(label_x, label_y, label, anchor="end", transform=f"rotate(-45 {label_x:.1f} {label_y:.1f})"))
+    _write(filename, elements)
+
+
+def pie_chart(labels: Sequence[str], values: Sequence[float], title: str, filename: str) -> None:
+    elements = [_text(WIDTH / 2, MARGIN_TOP / 2, title, size=18)]
+    total = sum(values)
+    cx, cy, radius = WIDTH / 2, (HEIGHT + MARGIN_TOP) / 2, min(WIDTH, HEIGHT - MARGIN_TOP) / 2 - 60
+    # Start at 12 o'clock and go counter-clockwise, like matplotlib's default pie
+    angle = math.pi / 2
+    for i, (label, value) in enumerate(zip(labels, values)):
+        if total <= 0 or value <= 0:
+            continue
+        sweep = 2 * math.pi * value / total
+        color = PIE_COLORS[i % len(PIE_COLORS)]
+        if sweep >= 2 * math.pi - 1e-9:
+            elements.append(f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{radius:.1f}" fill="{color}"/>')
+        else:
+            x1, y1 = cx + radius * math.cos(angle), cy - radius * math.sin(angle)
+            x2, y2 = cx + radius * math.cos(angle + sweep), cy - radius * math.sin(angle + sweep)
+            large_arc = 1 if sweep > math.pi else 0
+            elements.append(f'<path d="M {cx:.1f} {cy:.1f} L {x1:.1f} {y1:.1f} '
+                            f'A {radius:.1f} {radius:.1f} 0 {large_arc} 0 {x2:.1f} {y2:.1f} Z" fill="{color}"/>')
+        middle = angle + sweep / 2
+        elements.append(_text(cx + radius * 1.15 * math.cos(middle), cy - radius * 1.15 * math.sin(middle), label))
+        elements.append(_text(cx + radius * 0.6 * math.cos(middle), cy - radius * 0.6 * math.sin(middle) + 4,
+                              f"{value / total * 100:.1f}%"))
+        angle += sweep
+    _write(filename, elements)
+
+
+def histogram(values: Sequence[float], bins: int, title: str, xlabel: str, ylabel: str, filename: str) -> None:
+    plot_width = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_height = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    low, high = (min(values), max(values)) if values else (0, 1)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+
+    elements, top = _axes(title, xlabel, ylabel, max(counts, default=0))
+    bin_width = plot_width / bins
+    for i, count in enumerate(counts):
+        bar_height = count / top * plot_height
+        x = MARGIN_LEFT + i * bin_width
+        elements.append(f'<rect x="{x:.1f}" y="{MARGIN_TOP + plot_height - bar_height:.1f}" width="{bin_width:.1f}" '
+                        f'height="{bar_height:.1f}" fill="{BAR_COLOR}" stroke="white"/>')
+    for i in range(0, bins + 1, max(bins // 5, 1)):
+        x = MARGIN_LEFT + i * bin_width
+        elements.append(_text(x, MARGIN_TOP + plot_height + 18, f"{low + i * width:g}"))
+    _write(filename, elements)
+
+
+def _heat_color(fraction: float) -> str:
+    red, green, blue = (round(low + (high - low) * fraction) for low, high in zip(HEATMAP_LOW, HEATMAP_HIGH))
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def heatmap(matrix: Sequence[Sequence[float]], row_labels: Sequence[str], column_labels: Sequence[str],
+            title: str, filename: str) -> None:
+    plot_width = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    plot_height = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+    highest = max((value for row in matrix for value in row), default=0) or 1
+    cell_width = plot_width / max(len(column_labels), 1)
+    cell_height = plot_height / max(len(row_labels), 1)
+    elements = [_text(WIDTH / 2, MARGIN_TOP / 2, title, size=18)]
+    for i, row in enumerate(matrix):
+        y = MARGIN_TOP + i * cell_height
+        elements.append(_text(MARGIN_LEFT - 8, y + cell_height / 2 + 4, row_labels[i], anchor="end"))
+        for j, value in enumerate(row):
+            x = MARGIN_LEFT + j * cell_width
+            elements.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{cell_width:.1f}" height="{cell_height:.1f}" '
+                            f'fill="{_heat_color(value / highest)}"><title>{escape(str(value))}</title></rect>')
+    for j, label in enumerate(column_labels):
+        elements.append(_text(MARGIN_LEFT + (j + 0.5) * cell_width, MARGIN_TOP + plot_height + 18, label))
+    _write(filename, elements)
@@ -1,4 +1,6 @@
 from typing import Dict, Any
+from models.commit import WEEKDAYS
+from views.coverage_view import CoverageView
 
 
 class CommitView:
@@ -7,9 +9,68 @@ class CommitView:
         print("\nCommit Analysis Results:")
         print("========================")
 
-        print("\nCommit Time Distribution:")
+        estimates = analysis.get('estimates')
+        if estimates:
+            sampled_repos = estimates['sampled_repos']
+            print(f"\nESTIMATES: {len(sampled_repos)} repositories were sampled rather than crawled:")
+            for repo_name, sample in sampled_repos.items():
+                print(f"- {repo_name}: {sample['sampled_commits']} of {sample['total_commits']} commits "
+                      f"({sample['sampled_pages']} of {sample['page_count']} pages)")
+
+        # In stats mode, figures from statistics endpoints cover different time windows
+        windows = analysis.get('windows') or {}
+        if windows:
+            print("\nStatistics endpoints give weekdays and hours for all time but daily counts for the last 52 weeks "
+                  "only; use --exact-history for one window")
+
+        print("\nCommit Time Distribution" + (" (estimated):" if estimates else
+                                              f" ({windows['time_distribution']}):" if windows else ":"))
         for day, count in analysis['time_distribution'].items():
-            print(f"{day}: {count}")
+            if estimates:
+                low, high = estimates['time_distribution'][day]
+                print(f"{day}: ~{count} (z={estimates['confidence_z']} interval: {low}-{high})")
+            else:
+                print(f"{day}: {count}")
+
+        activity_heatmap = analysis.get('activity_heatmap')
+        if activity_heatmap and any(any(row) for row in activity_heatmap):
+            busiest = sorted(((count, day, hour) for day, row in enumerate(activity_heatmap)
+                              for hour, count in enumerate(row) if count), reverse=True)[:5]
+            window = ', estimated' if estimates else f", {windows['activity_heatmap']}" if windows else ''
+            print(f"\nBusiest Hours ({analysis['timezone']}{window}):")
+            for count, day, hour in busiest:
+                print(f"{WEEKDAYS[day]} {hour:02d}:00-{hour:02d}:59: {count}")
+
+        print(f"\nAverage Commit Frequency: {analysis['avg_frequency']:.2f} commits per day"
+              + (" (from exact commit totals)" if estimates else f" ({windows['avg_frequency']})" if windows else ""))
+        if estimates:
+            print(f"Longest Commit Streak: at least {analysis['longest_streak']} days (sampled pages leave gaps)")
+        else:
+            print(f"Longest Commit Streak: {analysis['longest_streak']} days"
+                  + (f" ({windows['longest_streak']})" if windows else ""))
+
+        if analysis.get('duplicate_commits'):
+            print(f"Commits shared between forks and mirrors, counted once: {analysis['duplicate_commits']}")
+
+        data_sources = analysis.get('data_sources')
+        if data_sources:
+            from_stats = sum(1 for source in data_sources.values() if source == 'stats')
+            print(f"\nData Sources: {from_stats} repositories from GitHub statistics endpoints, "
+                  f"{len(data_sources) - from_stats} crawled commit by commit")
+
+        CoverageView.display_coverage(analysis.get('coverage', {}))
+
+        top_authors = analysis.get('top_authors')
+        if top_authors and top_authors['overall']:
+            print("\nMost Active Authors:")
+            for author, count in top_authors['overall']:
+                print(f"- {author}: {count} commits")
+
+            print("\nMost Active Authors per Repository:")
+            for repo_name, authors in top_authors['per_repo'].items():
+                print(f"- {repo_name}: " + ", ".join(f"{author} ({count})" for author, count in authors))
 
-        print(f"\nAverage Commit Frequency: {analysis['avg_frequency']:.2f} commits per day")
-        print(f"Longest Commit Streak: {analysis['longest_streak']} days")
+        if analysis.get('chart_files'):
+            print("\nCharts generated:")
+            for chart_file in analysis['chart_files']:
+                print(f"- {chart_file}")
@@ -0,0 +1,20 @@
+# views/coverage_view.py
+from collections import Counter
+from typing import Dict
+from utils.deadline import COMPLETE, TRUNCATED, SKIPPED, SHARED_HISTORY
+
+
+class CoverageView:
+    @staticmethod
+    def display_coverage(coverage: Dict[str, str]):
+        statuses = Counter(coverage.values())
+        if not coverage or statuses[COMPLETE] == len(coverage):
+            return
+
+        print(f"\nCoverage: {statuses[COMPLETE]} of {len(coverage)} repositories fully fetched, "
+              f"{statuses[TRUNCATED]} truncated (time budget reached or a request failed), "
+              f"{statuses[SKIPPED]} skipped (time budget reached), "
+              f"{statuses[SHARED_HISTORY]} forks stopped at history shared with another repository")
+        for repo_name, status in coverage.items():
+            if status != COMPLETE:
+                print(f"- {repo_name}: {status}")
@@ -1,5 +1,6 @@
 # views/pr_view.py
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from views.coverage_view import CoverageView
 
 
 class PRView:
@@ -17,3 +18,23 @@ class PRView:
             closed_percentage = (analysis['pr_stats']['closed'] / analysis['total_prs']) * 100
             print(f"\nOpen PR Percentage: {open_percentage:.2f}%")
             print(f"Closed PR Percentage: {closed_percentage:.2f}%")
+
+        CoverageView.display_coverage(analysis.get('coverage', {}))
+
+        per_repo_counts = analysis.get('per_repo_counts')
+        if per_repo_counts:
+            print("\nPull Requests per Repository:")
+            for repo_name, counts in per_repo_counts.items():
+                print(f"- {repo_name}: {counts['opened']} open, {counts['closed']} closed")
+
+        time_to_close = analysis.get('time_to_close')
+        if time_to_close and time_to_close['overall']['count'] > 0:
+            print("\nTime to Close (hours):")
+            print(f"Overall: {PRView._format_latency(time_to_close['overall'])}")
+            for repo_name, summary in time_to_close['per_repo'].items():
+                print(f"- {repo_name}: {PRView._format_latency(summary)}")
+
+    @staticmethod
+    def _format_latency(summary: Dict[str, Optional[float]]) -> str:
+        return (f"p50 {summary['p50']:.1f}, p90 {summary['p90']:.1f}, p99 {summary['p99']:.1f} "
+                f"({summary['count']} closed)")
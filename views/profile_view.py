@@ -0,0 +1,27 @@
+# views/profile_view.py
+from typing import IO, List, Optional
+from utils.profiler import LoopStallMonitor, PhaseTiming
+
+
+class ProfileView:
+    @staticmethod
+    def display_profile(phases: List[PhaseTiming], stall_monitor: Optional[LoopStallMonitor] = None,
+                        cprofile_output: Optional[str] = None, stream: Optional[IO[str]] = None):
+        # stream defaults to stdout; runs that write their report to stdout pass stderr.
+        # Wall time well above CPU time means the phase mostly waited on the network.
+        print("\nProfile:", file=stream)
+        print(f"{'Controller':<18}{'Phase':<34}{'Steps':>7}{'Wall s':>10}{'CPU s':>10}{'Stalls':>8}{'Stalled s':>11}",
+              file=stream)
+        for phase in phases:
+            print(f"{phase.controller:<18}{phase.phase:<34}{phase.steps:>7}{phase.wall:>10.3f}{phase.cpu:>10.3f}"
+                  f"{phase.stalls:>8}{phase.stall_time:>11.3f}", file=stream)
+        print(f"{'Total':<52}{sum(phase.wall for phase in phases):>10.3f}{sum(phase.cpu for phase in phases):>10.3f}"
+              f"{sum(phase.stalls for phase in phases):>8}{sum(phase.stall_time for phase in phases):>11.3f}",
+              file=stream)
+
+        if stall_monitor is not None and stall_monitor.stalls:
+            print(f"Longest event-loop stall: {stall_monitor.longest:.3f}s "
+                  f"(stalls are blocks of at least {stall_monitor.threshold:.3f}s)", file=stream)
+        if cprofile_output:
+            print(f"cProfile statistics written to {cprofile_output} (inspect with: python -m pstats {cprofile_output})",
+                  file=stream)
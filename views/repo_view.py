@@ -1,5 +1,6 @@
 # views/repo_view.py
 from typing import Dict, Any
+from views.coverage_view import CoverageView
 
 
 class RepoView:
@@ -24,8 +25,10 @@ class RepoView:
         for language, count in analysis['language_breakdown'].items():
             print(f"- {language}: {count}")
 
+        CoverageView.display_coverage(analysis.get('coverage', {}))
+
         print("\nCharts generated:")
         for chart_file in analysis['chart_files']:
             print(f"- {chart_file}")
 
-        print("\nPlease check the generated PNG files for visual representations of the data.")
+        print("\nPlease check the generated chart files for visual representations of the data.")
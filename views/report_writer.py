@@ -0,0 +1,121 @@
+# views/report_writer.py
+import csv
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+from utils.serialization import to_serializable
+
+REPORT_FORMATS = ('json', 'ndjson', 'csv')
+STDOUT = '-'
+
+
+class ReportWriter(ABC):
+    """Streams analyses and raw rows out as they are produced instead of collecting a whole report."""
+
+    @abstractmethod
+    def write_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    def write_analysis(self, section: str, analysis: Dict[str, Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class NDJSONReportWriter(ReportWriter):
+    # Every record is one line tagged with its table, so rows from concurrent controllers can interleave
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+
+    def write_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._write({'record': table, **to_serializable(row)})
+
+    def write_analysis(self, section: str, analysis: Dict[str, Any]) -> None:
+        self._write({'record': 'analysis', 'section': section, 'data': to_serializable(analysis)})
+        self.stream.flush()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(record) + "\n")
+
+    def close(self) -> None:
+        self.stream.flush()
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+class JSONReportWriter(NDJSONReportWriter):
+    # The same records as NDJSON, written one element at a time into a single JSON array
+    def __init__(self, stream: IO[str]):
+        super().__init__(stream)
+        self.stream.write("[")
+        self.empty = True
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self.stream.write(("\n" if self.empty else ",\n") + json.dumps(record))
+        self.empty = False
+
+    def close(self) -> None:
+        self.stream.write("]\n" if self.empty else "\n]\n")
+        super().close()
+
+
+class CSVReportWriter(ReportWriter):
+    # One file per table (report-summary.csv, report-commits.csv, ...); analyses are flattened into summary rows
+    SUMMARY_FIELDS = ['section', 'key', 'value']
+
+    def __init__(self, path: str):
+        self.base = os.path.splitext(path)[0]
+        self.files: Dict[str, IO[str]] = {}
+        self.writers: Dict[str, csv.DictWriter] = {}
+
+    def path_for(self, table: str) -> str:
+        return f"{self.base}-{table}.csv"
+
+    def write_rows(self, table: str, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            row = to_serializable(row)
+            self._writer(table, list(row)).writerow(row)
+
+    def write_analysis(self, section: str, analysis: Dict[str, Any]) -> None:
+        writer = self._writer('summary', self.SUMMARY_FIELDS)
+        for key, value in self.flatten(to_serializable(analysis)):
+            writer.writerow({'section': section, 'key': key, 'value': value})
+        self.files['summary'].flush()
+
+    def _writer(self, table: str, fieldnames: List[str]) -> csv.DictWriter:
+        if table not in self.writers:
+            self.files[table] = open(self.path_for(table), 'w', newline='', encoding='utf-8')
+            self.writers[table] = csv.DictWriter(self.files[table], fieldnames=fieldnames, extrasaction='ignore')
+            self.writers[table].writeheader()
+        return self.writers[table]
+
+    @staticmethod
+    def flatten(value: Any, prefix: str = '') -> Iterable[Tuple[str, Any]]:
+        # Nested dicts become dotted keys (top_authors.per_repo.<repo>); lists stay as JSON in one cell
+        if isinstance(value, dict):
+            for key, item in value.items():
+                yield from CSVReportWriter.flatten(item, f"{prefix}.{key}" if prefix else key)
+        elif isinstance(value, list):
+            yield prefix, json.dumps(value)
+        else:
+            yield prefix, value
+
+    def close(self) -> None:
+        for stream in self.files.values():
+            stream.close()
+
+
+def create_report_writer(report_format: str, output: Optional[str] = STDOUT) -> ReportWriter:
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format '{report_format}'. Available: {', '.join(REPORT_FORMATS)}")
+    if report_format == 'csv':
+        if output in (None, STDOUT):
+            raise ValueError("CSV reports are written as one file per table and need an output path")
+        return CSVReportWriter(output)
+    stream = sys.stdout if output in (None, STDOUT) else open(output, 'w', encoding='utf-8')
+    return NDJSONReportWriter(stream) if report_format == 'ndjson' else JSONReportWriter(stream)
@@ -0,0 +1,15 @@
+# views/token_view.py
+from typing import Any, Dict, List
+
+
+class TokenView:
+    @staticmethod
+    def display_utilization(utilization: List[Dict[str, Any]]):
+        # A single token's budget is already summarized by the rate-limit warnings
+        if len(utilization) < 2:
+            return
+
+        print("\nToken Utilization:")
+        for token in utilization:
+            print(f"- {token['token']}: {token['requests']} requests, {token['remaining']}/{token['limit']} remaining "
+                  f"({token['utilization']:.0%} used){' - quarantined' if token['status'] != 'active' else ''}")